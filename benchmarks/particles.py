@@ -0,0 +1,84 @@
+"""
+Compare the per-frame cost of effects made of an entity per particle with the cost of a `ParticleSystem`.
+
+The entity effect is 200 entities which each move on their own and are drawn by a `SquareRenderer`.
+The particle system emits 20000 particles a second, which live for a second, so it keeps about 20000 of them alive.
+Frames aren't presented, and the cost of an empty frame is subtracted from both.
+
+Usage: python benchmarks/particles.py
+"""
+
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+
+import pigeonote as pn
+from pigeonote.components import ParticleSystem, SquareRenderer
+from pigeonote.presenters import NullPresenter
+
+ENTITY_COUNT = 200
+PARTICLE_COUNT = 20000
+FRAMES = 300
+
+
+class _Mover(pn.Component):
+    velocity: pg.Vector2 = pg.Vector2(0, 0)
+
+    def update(self):
+        self.velocity.y += 30 * self.dt
+        self.position += self.velocity * self.dt
+
+
+def _measure(game: pn.Game) -> float:
+    # Warm up for longer than particles live, so the particle count has settled.
+    warm_up_end = time.perf_counter() + 1.5
+    while time.perf_counter() < warm_up_end:
+        game.process()
+
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        game.process()
+
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    random.seed(0)
+    game = pn.Game(target_fps=0, presenter=NullPresenter())
+
+    empty = _measure(game)
+
+    entities = list[pn.Entity]()
+    for _ in range(ENTITY_COUNT):
+        entity = game.create_entity((random.uniform(-50, 50), random.uniform(-50, 50)))
+        entity.create_component(_Mover).velocity = pg.Vector2(random.uniform(-60, 60), random.uniform(-60, 60))
+
+        square = entity.create_component(SquareRenderer)
+        square.size = 2
+        square.color = (255, 160, 40)
+        entities.append(entity)
+
+    per_entity = _measure(game)
+
+    for entity in entities:
+        entity.destroy()
+
+    particle_system = game.create_entity((0, 0)).create_component(ParticleSystem)
+    particle_system.emission_rate = PARTICLE_COUNT
+    particle_system.speed = (10, 120)
+    particle_system.gravity = pg.Vector2(0, 30)
+    particle_system.start_color = (255, 160, 40)
+
+    batched = _measure(game)
+
+    print(f"{'empty frame':>28} {empty * 1000:>8.2f} ms")
+    print(f"{f'{ENTITY_COUNT} entities':>28} {(per_entity - empty) * 1000:>8.2f} ms")
+    print(f"{f'{particle_system.particle_count} particles':>28} {(batched - empty) * 1000:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
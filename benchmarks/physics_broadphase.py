@@ -0,0 +1,84 @@
+"""
+Measure how `Physics` collision queries scale with the amount of colliders in the scene.
+
+Every frame each collider is moved a little and queried against the physics, which is what
+`Collider.update` does. The spatial hash is compared against a naive all-pairs scan.
+
+Usage: python benchmarks/physics_broadphase.py
+"""
+
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pigeonote as pn
+from pigeonote.components import RectCollider
+
+COLLIDER_COUNTS = (100, 500, 1000, 2000, 5000, 10000)
+FRAMES = 5
+
+# The all-pairs scan is quadratic, measuring it past this point only takes minutes to confirm what's known.
+MAX_NAIVE_COUNT = 2000
+
+# Keep the density constant, so adding colliders grows the arena instead of crowding it.
+AREA_PER_COLLIDER = 64 * 64
+
+
+def _create_scene(game: pn.Game, count: int):
+    world_size = int((count * AREA_PER_COLLIDER) ** 0.5)
+    colliders = list[RectCollider]()
+
+    for i in range(count):
+        entity = game.create_entity((random.uniform(0, world_size), random.uniform(0, world_size)), name=f"{count}_{i}")
+        collider = entity.create_component(RectCollider)
+        collider.size = (16, 16)
+        collider.component_update()
+        colliders.append(collider)
+
+    return colliders
+
+
+def _naive_check_collisions(colliders: list[RectCollider], collider: RectCollider):
+    rect = collider.get_collider_rect()
+    return [other for other in colliders if other is not collider and other.check_rect_overlap(rect)]
+
+
+def _run_frames(colliders: list[RectCollider], query):
+    start = time.perf_counter()
+
+    for _ in range(FRAMES):
+        for collider in colliders:
+            collider.position += (random.uniform(-1, 1), random.uniform(-1, 1))
+
+        for collider in colliders:
+            query(collider)
+
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    random.seed(0)
+    game = pn.Game()
+    physics = pn.Physics.get_instance()
+
+    print(f"{'colliders':>10} {'spatial hash':>16} {'all pairs':>16} {'speedup':>8}")
+
+    for count in COLLIDER_COUNTS:
+        colliders = _create_scene(game, count)
+
+        hashed = _run_frames(colliders, physics.internal_check_collisions)
+
+        if count <= MAX_NAIVE_COUNT:
+            naive = _run_frames(colliders, lambda c: _naive_check_collisions(colliders, c))
+            print(f"{count:>10} {hashed * 1000:>13.2f} ms {naive * 1000:>13.2f} ms {naive / hashed:>7.1f}x")
+        else:
+            print(f"{count:>10} {hashed * 1000:>13.2f} ms {'-':>16} {'-':>8}")
+
+        for collider in colliders:
+            collider.entity.destroy()
+
+
+if __name__ == "__main__":
+    main()
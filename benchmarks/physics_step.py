@@ -0,0 +1,83 @@
+"""
+Measure the cost of a full `Physics` step (contact generation and events) in a crowded scene,
+with the spatial hash and with the vectorized (numpy) backend.
+
+Every collider moves every frame and listens to collisions, like a screen full of bullets.
+
+Usage: python benchmarks/physics_step.py
+"""
+
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pigeonote as pn
+from pigeonote.components import RectCollider
+
+COLLIDER_COUNTS = (1000, 2000, 5000, 10000)
+FRAMES = 5
+
+# Keep the density constant, so adding colliders grows the arena instead of crowding it.
+AREA_PER_COLLIDER = 48 * 48
+
+
+class _Listener(pn.Component):
+    def on_collision_enter(self, other: pn.Collider):
+        pass
+
+
+def _create_scene(game: pn.Game, count: int):
+    world_size = int((count * AREA_PER_COLLIDER) ** 0.5)
+    colliders = list[RectCollider]()
+
+    for i in range(count):
+        entity = game.create_entity((random.uniform(0, world_size), random.uniform(0, world_size)), name=f"{count}_{i}")
+        collider = entity.create_component(RectCollider)
+        collider.size = (8, 8)
+        collider.component_update()
+        entity.create_component(_Listener)
+        colliders.append(collider)
+
+    return colliders
+
+
+def _run_frames(physics: pn.Physics, colliders: list[RectCollider]):
+    elapsed = 0.0
+
+    for _ in range(FRAMES):
+        for collider in colliders:
+            collider.position += (random.uniform(-2, 2), random.uniform(-2, 2))
+
+        start = time.perf_counter()
+        physics.update()
+        elapsed += time.perf_counter() - start
+
+    return elapsed / FRAMES
+
+
+def main():
+    random.seed(0)
+    game = pn.Game()
+    physics = pn.Physics.get_instance()
+
+    print(f"{'colliders':>10} {'spatial hash':>16} {'vectorized':>16} {'speedup':>8}")
+
+    for count in COLLIDER_COUNTS:
+        colliders = _create_scene(game, count)
+
+        physics.vectorized = False
+        hashed = _run_frames(physics, colliders)
+
+        physics.vectorized = True
+        vectorized = _run_frames(physics, colliders)
+
+        print(f"{count:>10} {hashed * 1000:>13.2f} ms {vectorized * 1000:>13.2f} ms {hashed / vectorized:>7.1f}x")
+
+        for collider in colliders:
+            collider.entity.destroy()
+
+
+if __name__ == "__main__":
+    main()
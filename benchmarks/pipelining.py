@@ -0,0 +1,71 @@
+"""
+Compare the frame time of a game rendering its frames serially with the frame time of a pipelined game,
+which renders each frame on a render thread while the next one is simulated.
+
+The scene is 1500 sprites at the default 400x225 camera resolution, scaled onto a 1600x900 display.
+The render thread can only hide the cost of rendering on a machine with more than one core.
+Set SDL_VIDEODRIVER to a real driver (e.g `x11` or `windows`) to include the cost of updating an actual window.
+
+Usage: python benchmarks/pipelining.py
+"""
+
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+
+import pigeonote as pn
+from pigeonote.components import SpriteRenderer
+
+SPRITE_COUNT = 1500
+FRAMES = 300
+
+
+def _create_scene(game: pn.Game):
+    surfaces = list[pg.Surface]()
+
+    for _ in range(8):
+        surface = pg.Surface((16, 16))
+        surface.fill((random.randrange(256), random.randrange(256), random.randrange(256)))
+        surfaces.append(surface)
+
+    for _ in range(SPRITE_COUNT):
+        entity = game.create_entity((random.uniform(-200, 200), random.uniform(-112, 112)))
+        sprite = entity.create_component(SpriteRenderer)
+        sprite.sprite_surface = random.choice(surfaces)
+
+
+def _measure(game: pn.Game, pipelined: bool) -> float:
+    game.pipelined = pipelined
+
+    for _ in range(20):
+        game.process()
+
+    start = time.perf_counter()
+
+    for _ in range(FRAMES):
+        game.process()
+
+    # Stopping the render thread waits for the last frame to be presented.
+    game.pipelined = False
+
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    random.seed(0)
+    game = pn.Game(target_fps=0)
+    _create_scene(game)
+
+    print(f"{os.cpu_count()} cores")
+
+    for pipelined in (False, True):
+        frame = _measure(game, pipelined)
+        print(f"{'pipelined' if pipelined else 'serial':>12} {frame * 1000:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
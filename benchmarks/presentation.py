@@ -0,0 +1,108 @@
+"""
+Measure the per-frame cost of presenting frames with each presenter: putting the rendered camera surface
+on the display, and then updating the window.
+
+The scene is a camera full of sprites, drawn at the default 400x225 camera resolution on a 1600x900 display.
+Set SDL_VIDEODRIVER to a real driver (e.g `x11` or `windows`) to include the cost of updating an actual window.
+
+Usage: python benchmarks/presentation.py
+"""
+
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+
+import pigeonote as pn
+from pigeonote.components import SpriteRenderer
+from pigeonote.presenters import (
+    IntegerScalePresenter,
+    NativePresenter,
+    NullPresenter,
+    Presenter,
+    ScaledDisplayPresenter,
+    ScalePresenter,
+)
+
+SPRITE_COUNT = 500
+FRAMES = 200
+
+
+def _create_scene(game: pn.Game):
+    surfaces = list[pg.Surface]()
+
+    for _ in range(8):
+        surface = pg.Surface((16, 16))
+        surface.fill((random.randrange(256), random.randrange(256), random.randrange(256)))
+        surfaces.append(surface)
+
+    for _ in range(SPRITE_COUNT):
+        entity = game.create_entity((random.uniform(-200, 200), random.uniform(-112, 112)))
+        sprite = entity.create_component(SpriteRenderer)
+        sprite.sprite_surface = random.choice(surfaces)
+
+
+def _measure(game: pn.Game, presenter: Presenter):
+    game.presenter = presenter
+
+    # Time `Game._present` and the window update apart from the rest of the frame.
+    present = game._present
+    present_elapsed = 0.0
+
+    def timed_present():
+        nonlocal present_elapsed
+        start = time.perf_counter()
+
+        present()
+        if game._updated_display_rects is None:
+            pg.display.flip()
+        else:
+            pg.display.update(game._updated_display_rects)
+
+        present_elapsed += time.perf_counter() - start
+
+    game._present = timed_present
+
+    for _ in range(5):
+        game.process()
+
+    present_elapsed = 0.0
+    start = time.perf_counter()
+
+    for _ in range(FRAMES):
+        game.process()
+
+    frame_elapsed = time.perf_counter() - start
+    game._present = present
+
+    return frame_elapsed / FRAMES, present_elapsed / FRAMES
+
+
+def main():
+    random.seed(0)
+    game = pn.Game(target_fps=0)
+    _create_scene(game)
+
+    print(f"{'presenter':>24} {'frame':>11} {'presenting':>11} {'camera size':>12}")
+
+    for presenter in (
+        ScalePresenter(),
+        IntegerScalePresenter(),
+        NativePresenter(),
+        ScaledDisplayPresenter(),
+        NullPresenter(),
+    ):
+        frame, present = _measure(game, presenter)
+        camera_width, camera_height = game.camera.area.size
+
+        name = type(presenter).__name__
+        print(f"{name:>24} {frame * 1000:>8.2f} ms {present * 1000:>8.2f} ms {camera_width:>7}x{camera_height}")
+
+    game.presenter = ScalePresenter()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ from .types import Coordinate, Color, get_coords_as_vector2, get_coords_as_tuple
 from .input import *
 from .core import *
 from .camera import Camera2D
+from .rotation_cache import RotationCache
+from .primitive_cache import PrimitiveCache
+from .frame_cache import FrameCache
 from .game import Game
 
 
@@ -1,24 +1,144 @@
-from collections import defaultdict
-from typing import Optional, Callable
+from dataclasses import dataclass, field
+from typing import Hashable, Optional
 
 import pygame as pg
 from pygame import Rect, FRect, Vector2, Surface
 
+from pigeonote.command_buffer import CommandBuffer
+from pigeonote.dirty_rects import DirtyRectTracker
 from pigeonote.draw import draw_rectangle_outline
-from pigeonote.types import Color, Coordinate, get_coords_as_vector2
+from pigeonote.draw_kind import DrawKind
+from pigeonote.primitive_cache import PrimitiveCache
+from pigeonote.static_layer import StaticLayer, StaticLayerFrame
+from pigeonote.types import AnyRect, Color, Coordinate, get_color_as_hashable, get_coords_as_vector2, is_color_opaque
+
+# Rounded rectangles with a bigger side are drawn directly, rather than keeping a big surface around for them.
+MAX_CACHED_RECT_SIDE = 256
+
+
+@dataclass
+class _QueuedFrame:
+    """
+    Everything needed to render a frame once its draws were queued, captured so the camera can move on to the next one.
+
+    Rendering a frame only uses what the frame holds, and stores its results in it, so a pipelined game can render it
+    on another thread. The camera only takes the results once the frame is shown (see `Camera2D.internal_show_frame`).
+    """
+
+    # Every layer with its buffer, and for static layers, how their cache is drawn in this frame.
+    layers: list[tuple[int, CommandBuffer, Optional[StaticLayerFrame]]]
+    surface: Surface
+    area: Rect
+    dirty_rect_tracker: Optional[DirtyRectTracker]
+
+    # Changes made outside of the command buffers, for the dirty rect tracker.
+    draws: list[tuple[Hashable, Rect]] = field(default_factory=list)
+    marked_rects: list[Rect] = field(default_factory=list)
+    is_all_dirty: bool = False
+
+    # The areas which changed since the previous frame, once the frame is rendered (when dirty rects are tracked).
+    dirty_rects: Optional[list[Rect]] = None
 
 
 class Camera2D:
     def __init__(self, area: Optional[Rect | FRect] = None) -> None:
         self._area = area or Rect((0, 0), pg.display.get_surface().get_size())
         self._surface = Surface(self._area.size)
+        self._rendered_surface = self._surface
+
+        # Draw commands are queued per layer, and drawn from the lowest layer up in `render_frame`.
+        # Layers keep their buffers across frames, so the render order is only sorted when a new layer shows up.
+        self._layers = dict[int, CommandBuffer]()
+        self._render_order = list[tuple[int, CommandBuffer, Optional[StaticLayer]]]()
+
+        # Layers marked as static are drawn into a cached surface, which is only redrawn when they change.
+        self._static_layers = dict[int, StaticLayer]()
+
+        # Draws which are entirely outside of the camera area are dropped as soon as they're queued.
+        self._drawn_count = 0
+        self._culled_count = 0
+        self._last_drawn_count = 0
+        self._last_culled_count = 0
+
+        # When tracked, the areas which changed in each frame are found by comparing its draws with the previous frame.
+        self._dirty_rect_tracker: Optional[DirtyRectTracker] = None
+        self._dirty_rects = list[Rect]()
+
+        # The frame whose draws are being queued.
+        self._queued_frame = self._create_queued_frame()
 
-        self._layering: dict[int, list[Callable[[], None]]] = defaultdict(list)
+        # When double buffered, frames alternate between two surfaces and sets of command buffers,
+        # so one frame can be queued while the previous one is still being rendered.
+        self._spare_surface: Optional[Surface] = None
+        self._spare_layers = dict[int, CommandBuffer]()
+
+        # Opaque circles and rounded rectangles are rasterized once, and then blitted like any other surface.
+        self._primitive_cache = PrimitiveCache()
 
     @property
     def area(self):
         return self._area.copy()
 
+    @property
+    def drawn_count(self):
+        """
+        How many draws were rendered in the last frame.
+        """
+        return self._last_drawn_count
+
+    @property
+    def culled_count(self):
+        """
+        How many draws were skipped in the last frame, since they were entirely outside of the camera area.
+        """
+        return self._last_culled_count
+
+    @property
+    def primitive_cache(self):
+        return self._primitive_cache
+
+    @property
+    def track_dirty_rects(self):
+        return self._dirty_rect_tracker is not None
+
+    @track_dirty_rects.setter
+    def track_dirty_rects(self, track: bool):
+        if track and self._dirty_rect_tracker is None:
+            self._dirty_rect_tracker = DirtyRectTracker(self._area.size)
+
+        elif not track:
+            self._dirty_rect_tracker = None
+
+    @property
+    def dirty_rects(self):
+        """
+        The areas of the rendered surface which changed in the last frame, when `track_dirty_rects` is on.
+        Otherwise, the whole surface.
+        """
+        if self._dirty_rect_tracker is None:
+            return [Rect((0, 0), self._area.size)]
+
+        return list(self._dirty_rects)
+
+    def mark_dirty(self, world_rect: Optional[AnyRect] = None):
+        """
+        Consider an area (or the whole frame) changed in the current frame, e.g after modifying a surface in place.
+        """
+        if self._dirty_rect_tracker is None:
+            return
+
+        if world_rect is None:
+            self._queued_frame.is_all_dirty = True
+        else:
+            self._queued_frame.marked_rects.append(Rect(self.world_rect_to_screen_rect(world_rect)))
+
+    def invalidate_texture(self, surface: Surface):
+        """
+        Tell the camera that `surface` was modified in place. Only cameras which upload surfaces to textures
+        (like `RendererCamera2D`) keep anything about surfaces between frames, so there's nothing to do here.
+        """
+        pass
+
     @property
     def center(self):
         return Vector2(self._area.center)
@@ -27,21 +147,244 @@ class Camera2D:
     def center(self, position: Coordinate):
         self._area.center = position
 
+    def resize(self, size: tuple[int, int], surface: Optional[Surface] = None):
+        """
+        Resize the camera area around its center. Frames are rendered onto `surface` when given (e.g the display),
+        otherwise onto a new surface of the camera.
+        """
+        if surface is not None and surface.get_size() != tuple(size):
+            raise ValueError(f"Can't render a camera of size {tuple(size)} onto a surface of size {surface.get_size()}.")
+
+        center = self._area.center
+        self._area.size = size
+        self._area.center = center
+
+        self._surface = self._rendered_surface = surface if surface is not None else Surface(size)
+        self._spare_surface = None
+
+        if self._dirty_rect_tracker is not None:
+            self._dirty_rect_tracker = DirtyRectTracker(self._area.size)
+
     def clean_surface(self):
         self._surface.fill("black")
 
     def get_rendered_surface(self):
-        return self._surface
+        return self._rendered_surface
+
+    def _update_render_order(self):
+        self._render_order = [
+            (index, self._layers[index], self._static_layers.get(index, None)) for index in sorted(self._layers)
+        ]
+
+    def _get_layer(self, layer: int) -> CommandBuffer:
+        command_buffer = self._layers.get(layer, None)
+
+        if command_buffer is None:
+            command_buffer = self._layers[layer] = CommandBuffer()
+            self._update_render_order()
+
+        return command_buffer
+
+    def _get_layer_view(self, layer: int) -> tuple[float, float, float, float]:
+        """
+        Return the world space topleft and the size of the surface `layer` is drawn onto.
+        """
+        static_layer = self._static_layers.get(layer, None)
+        if static_layer is not None:
+            return static_layer.anchor(self._area)
+
+        area = self._area
+        return area.left, area.top, area.width, area.height
+
+    def set_layer_static(self, layer: int, is_static: bool = True, margin: int = 128):
+        """
+        Mark a layer whose contents rarely change (like background art) as static. Its draws are then rendered
+        into a cached surface, which is only redrawn when different draws are queued on the layer or the camera
+        moves further than `margin` pixels from where the cache was drawn.
+
+        Draws on the layer must still be queued every frame, as they're compared against the cached ones.
+        """
+        if is_static:
+            if layer not in self._static_layers:
+                self._static_layers[layer] = StaticLayer(margin)
+
+            self._static_layers[layer].margin = margin
+
+        else:
+            self._static_layers.pop(layer, None)
+
+        self._update_render_order()
+
+    def is_layer_static(self, layer: int) -> bool:
+        return layer in self._static_layers
+
+    def invalidate_layer(self, layer: int):
+        """
+        Redraw a static layer on the next frame, which is needed after modifying a surface drawn on it.
+        """
+        static_layer = self._static_layers.get(layer, None)
+        if static_layer is not None:
+            static_layer.invalidate()
+
+    def _create_queued_frame(self) -> _QueuedFrame:
+        return _QueuedFrame([], self._surface, self._area.copy(), self._dirty_rect_tracker)
 
     def render_frame(self):
-        render_order = sorted(self._layering)
+        frame = self.internal_take_frame()
+        self.internal_render_frame(frame)
+        self.internal_show_frame(frame)
+
+        return frame.surface
+
+    def internal_take_frame(self, double_buffered: bool = False) -> _QueuedFrame:
+        """
+        Finish queueing the current frame, and return it, to be rendered with `internal_render_frame`.
+
+        When `double_buffered`, the next frame is queued onto the spare surface and command buffers,
+        so the frame can be rendered on another thread while the next one is queued.
+        """
+        frame = self._queued_frame
+        frame.surface, frame.area, frame.dirty_rect_tracker = self._surface, self._area.copy(), self._dirty_rect_tracker
+
+        # The caches of static layers may move in the next frame, so how they're drawn in this one is kept.
+        frame.layers = [
+            (layer, command_buffer, static_layer and static_layer.capture(frame.area))
+            for layer, command_buffer, static_layer in self._render_order
+        ]
+
+        for static_layer in self._static_layers.values():
+            static_layer.release()
+
+        self._last_drawn_count, self._last_culled_count = self._drawn_count, self._culled_count
+        self._drawn_count = self._culled_count = 0
+
+        if double_buffered:
+            if self._spare_surface is None or self._spare_surface.get_size() != self._surface.get_size():
+                self._spare_surface = Surface(self._surface.get_size())
+
+            self._surface, self._spare_surface = self._spare_surface, self._surface
+            self._layers, self._spare_layers = self._spare_layers, self._layers
+            self._update_render_order()
+
+        self._queued_frame = self._create_queued_frame()
+
+        return frame
+
+    def internal_render_frame(self, frame: _QueuedFrame):
+        """
+        Draw a frame taken with `internal_take_frame` onto its surface. Only the frame itself is used,
+        so this can run on another thread while the next frame is queued.
+        """
+        tracker = frame.dirty_rect_tracker
+
+        for layer, command_buffer, static_frame in frame.layers:
+            self._draw_layer(command_buffer, static_frame, frame)
+
+            if tracker is not None:
+                self._track_draws(tracker, layer, command_buffer, static_frame, frame.area)
+
+            command_buffer.clear()
+
+        if tracker is not None:
+            for index, (key, bounds) in enumerate(frame.draws):
+                tracker.add_draw((index, key), bounds)
+
+            for rect in frame.marked_rects:
+                tracker.mark(rect)
+
+            if frame.is_all_dirty:
+                tracker.mark_all()
+
+            frame.dirty_rects = tracker.finish_frame()
+
+    def internal_show_frame(self, frame: _QueuedFrame):
+        """
+        Make a rendered frame the one returned by `get_rendered_surface`, along with its dirty rects.
+        """
+        self._rendered_surface = frame.surface
+
+        if frame.dirty_rects is not None:
+            self._dirty_rects = frame.dirty_rects
+
+    def _draw_layer(self, command_buffer: CommandBuffer, static_frame: Optional[StaticLayerFrame], frame: _QueuedFrame):
+        if static_frame is not None:
+            cache = static_frame.cache.update(command_buffer, static_frame)
+            if cache is not None:
+                frame.surface.blit(cache, static_frame.screen_position)
+
+        elif len(command_buffer):
+            command_buffer.execute(frame.surface)
 
-        for layer_index in render_order:
-            for draw_task in self._layering[layer_index]:
-                draw_task()
+    def internal_copy_settings(self, camera: "Camera2D"):
+        """
+        Take the position, static layers, dirty rects tracking and primitive cache of another camera, when replacing it.
+        """
+        self.center = camera.center
+        self.track_dirty_rects = camera.track_dirty_rects
+        self._primitive_cache = camera._primitive_cache
 
-        self._layering.clear()
-        return self._surface
+        for layer, static_layer in camera._static_layers.items():
+            self.set_layer_static(layer, margin=static_layer.margin)
+
+    def _track_draws(
+        self,
+        tracker: DirtyRectTracker,
+        layer: int,
+        command_buffer: CommandBuffer,
+        static_frame: Optional[StaticLayerFrame],
+        area: Rect,
+    ):
+        if static_frame is None:
+            # Where a draw is in the order of its layer is part of its key, so overlapping draws which swapped places
+            # are found too.
+            for index, (key, bounds) in enumerate(command_buffer.iter_draws()):
+                tracker.add_draw((layer, index, key), bounds)
+
+        # A static layer is drawn as a whole, so it only changes when its cache is redrawn or moved.
+        elif len(command_buffer):
+            key = layer, static_frame.cache.build_count, static_frame.screen_position
+            tracker.add_draw(key, Rect((0, 0), area.size))
+
+    def get_layer_area(self, layer: int = 0) -> Rect:
+        """
+        The world space area drawn on `layer`: the camera area, or the area of its cache for a static layer.
+        """
+        return Rect(self._get_layer_view(layer))
+
+    def is_visible(self, rect: AnyRect, layer: int = 0) -> bool:
+        """
+        Whether any part of the world space `rect` is inside the area drawn on `layer`.
+        Renderers can check this before doing any work to draw something off screen.
+        """
+        if layer in self._static_layers:
+            return self.get_layer_area(layer).colliderect(rect)
+
+        return self._area.colliderect(rect)
+
+    def is_visible_around(self, center: Coordinate, radius: float, layer: int = 0) -> bool:
+        """
+        Whether any part of the square around the world space `center` whose half side is `radius` is inside the area
+        drawn on `layer`.
+        """
+        x, y = center[0], center[1]
+
+        if layer in self._static_layers:
+            left, top, width, height = self._get_layer_view(layer)
+            return x + radius > left and x - radius < left + width and y + radius > top and y - radius < top + height
+
+        area = self._area
+        return x + radius > area.left and x - radius < area.right and y + radius > area.top and y - radius < area.bottom
+
+    def _cull(self, left: float, top: float, right: float, bottom: float, width: float, height: float) -> bool:
+        """
+        Count a draw whose bounds on its layer's surface are given, and return whether it's entirely outside of it.
+        """
+        if right <= 0 or bottom <= 0 or left >= width or top >= height:
+            self._culled_count += 1
+            return True
+
+        self._drawn_count += 1
+        return False
 
     def world_position_to_screen_position(self, world_pos: Coordinate) -> Vector2:
         return get_coords_as_vector2(world_pos) - Vector2(self._area.topleft)
@@ -64,42 +407,95 @@ class Camera2D:
         if isinstance(screen_pos, FRect):
             return FRect(self.screen_position_to_world_position(screen_pos.topleft), screen_pos.size)
 
+    # Queued draws are placed relative to where the camera is when they're queued
+    # (or to where the cache of their layer is, for static layers).
+
     def blit(self, surface: Surface, world_position: Coordinate, layer: int = 0):
-        def _perform_blit():
-            self._surface.blit(surface, self.world_position_to_screen_position(world_position))
+        left, top, view_width, view_height = self._get_layer_view(layer)
+        x, y = world_position[0] - left, world_position[1] - top
+        width, height = surface.get_size()
+
+        if self._cull(x, y, x + width, y + height, view_width, view_height):
+            return
 
-        self._layering[layer].append(_perform_blit)
+        self._get_layer(layer).add_blit(surface, (x, y))
 
     def fill(self, color: Color, area: Rect | FRect):
-        self._surface.fill(color, self.world_rect_to_screen_rect(area))
+        screen_rect = self.world_rect_to_screen_rect(area)
+        self._surface.fill(color, screen_rect)
+
+        if self._dirty_rect_tracker is not None:
+            key = "fill", get_color_as_hashable(color), tuple(screen_rect)
+            self._queued_frame.draws.append((key, Rect(screen_rect)))
 
     def draw_line(self, point1: Coordinate, point2: Coordinate, color: Color, layer: int = 0):
-        def _perform_draw_line():
-            p1_screen_pos = self.world_position_to_screen_position(point1)
-            p2_screen_pos = self.world_position_to_screen_position(point2)
-            pg.draw.line(self._surface, color, p1_screen_pos, p2_screen_pos)
+        left, top, view_width, view_height = self._get_layer_view(layer)
+        p1_screen_pos = get_coords_as_vector2(point1) - Vector2(left, top)
+        p2_screen_pos = get_coords_as_vector2(point2) - Vector2(left, top)
 
-        self._layering[layer].append(_perform_draw_line)
+        if self._cull(
+            min(p1_screen_pos.x, p2_screen_pos.x),
+            min(p1_screen_pos.y, p2_screen_pos.y),
+            max(p1_screen_pos.x, p2_screen_pos.x) + 1,
+            max(p1_screen_pos.y, p2_screen_pos.y) + 1,
+            view_width,
+            view_height,
+        ):
+            return
+
+        self._get_layer(layer).add(DrawKind.LINE, (color, p1_screen_pos, p2_screen_pos))
 
     def draw_rect_outline(self, rect: Rect | FRect, color: Color = "green", outline_width: int = 1):
         rect = rect.copy()
         screen_rectangle = self.world_rect_to_screen_rect(rect)
         draw_rectangle_outline(self._surface, screen_rectangle, outline_width, color)
 
+        if self._dirty_rect_tracker is not None:
+            key = "outline", get_color_as_hashable(color), tuple(screen_rectangle), outline_width
+            self._queued_frame.draws.append((key, Rect(screen_rectangle)))
+
     def draw_rect(
         self, rect: Rect | FRect, color: Color = "green", width: float = 0, border_radius: float = -1, layer: int = 0
     ):
-        rect = rect.copy()
+        left, top, view_width, view_height = self._get_layer_view(layer)
+        screen_rect = rect.move(-left, -top)
 
-        def _perform_draw_rect():
-            screen_rect = self.world_rect_to_screen_rect(rect)
-            pg.draw.rect(self._surface, color, screen_rect, width=round(width), border_radius=round(border_radius))
+        if self._cull(screen_rect.left, screen_rect.top, screen_rect.right, screen_rect.bottom, view_width, view_height):
+            return
 
-        self._layering[layer].append(_perform_draw_rect)
+        width, border_radius = round(width), round(border_radius)
+
+        # A cached rect is blended when blitted, so only opaque rects look the same as when drawn with `pg.draw.rect`.
+        if (
+            border_radius > 0
+            and screen_rect.width <= MAX_CACHED_RECT_SIDE
+            and screen_rect.height <= MAX_CACHED_RECT_SIDE
+            and is_color_opaque(color)
+        ):
+            # `pg.draw.rect` truncates the rect, so the cached rect is blitted at the truncated position.
+            screen_rect = Rect(screen_rect)
+            surface = self._primitive_cache.get_rect(screen_rect.size, color, width, border_radius)
+            self._get_layer(layer).add_blit(surface, screen_rect.topleft)
+            return
+
+        self._get_layer(layer).add(DrawKind.RECT, (color, screen_rect, width, border_radius))
 
     def draw_circle(self, center: Coordinate, radius: float, color: Color, width: float = 0, layer: int = 0):
-        def _perform_draw_circle():
-            center_screen_pos = self.world_position_to_screen_position(center)
-            pg.draw.circle(self._surface, color, center_screen_pos, radius, width=round(width))
+        left, top, view_width, view_height = self._get_layer_view(layer)
+        center_screen_pos = get_coords_as_vector2(center) - Vector2(left, top)
+        x, y = center_screen_pos
+
+        if self._cull(x - radius, y - radius, x + radius + 1, y + radius + 1, view_width, view_height):
+            return
+
+        width = round(width)
+
+        # A cached circle is blended when blitted, so translucent circles are drawn with `pg.draw.circle` instead.
+        if not is_color_opaque(color):
+            self._get_layer(layer).add(DrawKind.CIRCLE, (color, center_screen_pos, radius, width))
+            return
 
-        self._layering[layer].append(_perform_draw_circle)
+        # `pg.draw.circle` truncates the center, so the cached circle is centered on the truncated center.
+        surface = self._primitive_cache.get_circle(radius, color, width)
+        offset = surface.width // 2
+        self._get_layer(layer).add_blit(surface, (int(x) - offset, int(y) - offset))
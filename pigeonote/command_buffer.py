@@ -0,0 +1,154 @@
+from typing import Any, Hashable, Iterator, Optional
+
+import pygame as pg
+from pygame import Rect, Surface
+
+from pigeonote.draw_kind import DrawKind
+from pigeonote.types import get_color_as_hashable
+
+BlitRun = list[tuple[Surface, tuple[float, float]]]
+
+
+class CommandBuffer:
+    """
+    The draw commands queued on a single layer of the camera during a frame, in order.
+
+    Consecutive blits are gathered into a single run, which is drawn with one `Surface.fblits` call.
+    The buffer is reused from frame to frame, so its slots and blit runs are only allocated once.
+    """
+
+    def __init__(self) -> None:
+        self._kinds = list[DrawKind]()
+        self._args = list[Any]()
+        self._size = 0
+
+        self._blit_runs = list[BlitRun]()
+        self._used_blit_runs = 0
+        self._current_blit_run: Optional[BlitRun] = None
+
+    def __len__(self):
+        return self._size
+
+    def _push(self, kind: DrawKind, args: Any):
+        index = self._size
+
+        if index < len(self._kinds):
+            self._kinds[index] = kind
+            self._args[index] = args
+        else:
+            self._kinds.append(kind)
+            self._args.append(args)
+
+        self._size += 1
+
+    def add_blit(self, surface: Surface, screen_position: tuple[float, float]):
+        blit_run = self._current_blit_run
+
+        if blit_run is None:
+            if self._used_blit_runs < len(self._blit_runs):
+                blit_run = self._blit_runs[self._used_blit_runs]
+            else:
+                blit_run = BlitRun()
+                self._blit_runs.append(blit_run)
+
+            self._used_blit_runs += 1
+            self._current_blit_run = blit_run
+            self._push(DrawKind.BLITS, blit_run)
+
+        blit_run.append((surface, screen_position))
+
+    def add(self, kind: DrawKind, args: tuple):
+        """
+        Queue a draw command of `kind`. The arguments are the ones `execute` passes to the matching `pygame.draw` function.
+        """
+        self._push(kind, args)
+        self._current_blit_run = None
+
+    def execute(self, surface: Surface):
+        kinds, args = self._kinds, self._args
+
+        for index in range(self._size):
+            kind = kinds[index]
+
+            if kind is DrawKind.BLITS:
+                surface.fblits(args[index])
+
+            elif kind is DrawKind.LINE:
+                color, start, end = args[index]
+                pg.draw.line(surface, color, start, end)
+
+            elif kind is DrawKind.RECT:
+                color, rect, width, border_radius = args[index]
+                pg.draw.rect(surface, color, rect, width=width, border_radius=border_radius)
+
+            elif kind is DrawKind.CIRCLE:
+                color, center, radius, width = args[index]
+                pg.draw.circle(surface, color, center, radius, width=width)
+
+    def iter_commands(self) -> Iterator[tuple[DrawKind, Any]]:
+        """
+        Yield the kind and arguments of every queued command, for drawing them somewhere other than a surface.
+        The arguments of blits are a run of `(surface, screen_position)` pairs.
+        """
+        kinds, args = self._kinds, self._args
+
+        for index in range(self._size):
+            yield kinds[index], args[index]
+
+    def iter_draws(self) -> Iterator[tuple[Hashable, Rect]]:
+        """
+        Yield a key and the bounds of every queued draw. Draws with equal keys draw the same pixels,
+        as long as the surfaces they blit weren't modified.
+        """
+        kinds, args = self._kinds, self._args
+
+        for index in range(self._size):
+            kind = kinds[index]
+
+            if kind is DrawKind.BLITS:
+                for surface, position in args[index]:
+                    yield (surface, position), Rect(position, surface.get_size())
+
+            elif kind is DrawKind.LINE:
+                color, start, end = args[index]
+                left, top = min(start[0], end[0]), min(start[1], end[1])
+
+                yield (
+                    (kind, get_color_as_hashable(color), tuple(start), tuple(end)),
+                    Rect(left, top, max(start[0], end[0]) - left + 1, max(start[1], end[1]) - top + 1),
+                )
+
+            elif kind is DrawKind.RECT:
+                color, rect, width, border_radius = args[index]
+                yield (kind, get_color_as_hashable(color), tuple(rect), width, border_radius), Rect(rect)
+
+            elif kind is DrawKind.CIRCLE:
+                color, center, radius, width = args[index]
+
+                yield (
+                    (kind, get_color_as_hashable(color), tuple(center), radius, width),
+                    Rect(center[0] - radius, center[1] - radius, radius * 2 + 1, radius * 2 + 1),
+                )
+
+    def snapshot(self) -> list[tuple[DrawKind, Any]]:
+        """
+        Return the queued commands, which compare equal to the snapshot of another buffer with the same draws.
+        """
+        kinds, args = self._kinds, self._args
+
+        return [
+            (kinds[index], tuple(args[index]) if kinds[index] is DrawKind.BLITS else args[index])
+            for index in range(self._size)
+        ]
+
+    def clear(self):
+        for blit_run in self._blit_runs[: self._used_blit_runs]:
+            blit_run.clear()
+
+        # Drop the arguments, so nothing drawn this frame is kept alive by the buffer.
+        for index in range(self._size):
+            self._args[index] = None
+
+        self._size = 0
+        self._used_blit_runs = 0
+        self._current_blit_run = None
@@ -4,3 +4,5 @@ from .circle_renderer import CircleRenderer
 from .rect_collider import RectCollider
 from .tilemap_renderer import TilemapRenderer
 from .tilemap_collider import TilemapCollider
+from .particle_system import ParticleSystem
+from .animated_sprite_renderer import AnimatedSpriteRenderer
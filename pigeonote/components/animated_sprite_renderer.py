@@ -0,0 +1,122 @@
+from typing import Optional
+
+import pygame as pg
+
+from pigeonote.components.sprite_renderer import SpriteRenderer
+from pigeonote.core.entity import Entity
+from pigeonote.frame_cache import get_grid_frame_rects
+
+
+class AnimatedSpriteRenderer(SpriteRenderer):
+    """
+    Plays an animation from a sprite sheet. Its frames are `frame_rects` on `sheet`, or when there are none,
+    every whole frame of `frame_size` on the sheet, from left to right and then from top to bottom.
+
+    Frames come from the frame cache of the game, so every renderer animating the same sheet shares its frames
+    (and their rotations) instead of slicing its own. `sprite_surface` is set to the current frame on every update.
+    """
+
+    sheet: Optional[pg.Surface] = None
+    frame_size: Optional[tuple[int, int]] = None
+    frame_rects: list[pg.Rect] = list()
+
+    fps: float = 10
+    loop: bool = True
+    playing: bool = True
+
+    def __init__(self, component_id: int, parent: Entity) -> None:
+        super().__init__(component_id, parent)
+
+        self._frames = list[pg.Surface]()
+        self._elapsed = 0.0
+
+        # The animation settings the frames were acquired for, and their rects.
+        self._animation: Optional[tuple[pg.Surface, Optional[tuple[int, int]], list[pg.Rect]]] = None
+        self._acquired_rects = list[pg.Rect]()
+
+    @property
+    def frame_count(self):
+        self._update_frames()
+        return len(self._frames)
+
+    @property
+    def frame_index(self):
+        if not self._frames or self.fps <= 0:
+            return 0
+
+        return min(int(self._elapsed * self.fps), len(self._frames) - 1)
+
+    @frame_index.setter
+    def frame_index(self, frame_index: int):
+        self._elapsed = frame_index / self.fps if self.fps > 0 else 0.0
+
+    @property
+    def is_finished(self):
+        """
+        Whether an animation which doesn't loop reached its last frame.
+        """
+        return not self.loop and bool(self._frames) and self.frame_index == len(self._frames) - 1
+
+    def restart(self):
+        self._elapsed = 0.0
+        self.playing = True
+
+    def _update_frames(self):
+        """
+        Acquire the frames of the current animation, releasing the previous ones if it changed.
+        """
+        if self.sheet is None:
+            animation = None
+        else:
+            animation = self.sheet, self.frame_size, self.frame_rects
+
+        if animation == self._animation:
+            return
+
+        frame_cache = self.game.frame_cache
+
+        if self._animation is not None:
+            frame_cache.release(self._animation[0], self._acquired_rects)
+            self._frames, self._acquired_rects = list[pg.Surface](), list[pg.Rect]()
+
+        if self.sheet is None:
+            self._animation = None
+            return
+
+        # The settings are copied, so changing them in place is noticed as well.
+        self._animation = self.sheet, self.frame_size, [pg.Rect(rect) for rect in self.frame_rects]
+
+        if self.frame_rects:
+            rects = [pg.Rect(rect) for rect in self.frame_rects]
+        elif self.frame_size is not None:
+            rects = get_grid_frame_rects(self.sheet.get_size(), self.frame_size)
+        else:
+            rects = [self.sheet.get_rect()]
+
+        self._frames = frame_cache.acquire(self.sheet, rects)
+        self._acquired_rects = rects
+
+    def update(self):
+        self._update_frames()
+
+        frame_count = len(self._frames)
+        if not frame_count:
+            self.sprite_surface = None
+            return
+
+        if self.playing and self.fps > 0:
+            self._elapsed += self.dt
+
+            duration = frame_count / self.fps
+            if self.loop:
+                self._elapsed %= duration
+            else:
+                self._elapsed = min(self._elapsed, duration)
+
+        self.sprite_surface = self._frames[self.frame_index]
+
+    def on_destroy(self):
+        if self._animation is not None:
+            self.game.frame_cache.release(self._animation[0], self._acquired_rects)
+            self._animation = None
+            self._frames, self._acquired_rects = list[pg.Surface](), list[pg.Rect]()
@@ -10,5 +10,8 @@ class CircleRenderer(Component):
     layer: int = 0
 
     def render(self):
+        if not self.camera.is_visible_around(self.position, self.radius + 1, self.layer):
+            return
+
         self.width = self.width if self.width >= 0 else 0
         self.camera.draw_circle(self.position, self.radius, self.color, width=self.width, layer=self.layer)
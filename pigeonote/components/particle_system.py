@@ -0,0 +1,242 @@
+from typing import Optional
+
+import pygame as pg
+
+from pigeonote import Color, Component, Coordinate, get_coords_as_tuple
+from pigeonote.core.entity import Entity
+from pigeonote.utils import np, require_numpy
+
+# How many colors particles go through between `start_color` and `end_color`.
+_GRADIENT_STEPS = 64
+
+
+class ParticleSystem(Component):
+    """
+    Emits and draws many small square particles, without an entity per particle.
+
+    The position, velocity, age and lifetime of every particle are kept in numpy arrays, and all particles are moved
+    at once every frame. Particles fade from `start_color` to `end_color` (by default, a transparent `start_color`)
+    over their lifetime, through a table of precomputed colors looked up by age.
+
+    Particles are drawn together: their pixels are written into a single surface, which is blitted once.
+    Where particles overlap, one of them is drawn over the others instead of blending with them.
+
+    Angles are in degrees, clockwise from the right, like the rotation of entities.
+    """
+
+    emission_rate: float = 0
+    max_particles: int = 20000
+
+    lifetime: tuple[float, float] = (1, 1)
+    speed: tuple[float, float] = (20, 50)
+    direction: float = 0
+    spread: float = 360
+    gravity: pg.Vector2 = pg.Vector2(0, 0)
+    drag: float = 0
+
+    size: int = 2
+    start_color: Color = "white"
+    end_color: Optional[Color] = None
+    layer: int = 0
+
+    def __init__(self, component_id: int, parent: Entity) -> None:
+        require_numpy("particle systems")
+
+        super().__init__(component_id, parent)
+
+        self._rng = np.random.default_rng()
+        self._count = 0
+        self._capacity = 0
+        self._emission_debt = 0.0
+
+        self._positions = np.zeros((0, 2), dtype=np.float32)
+        self._velocities = np.zeros((0, 2), dtype=np.float32)
+        self._ages = np.zeros(0, dtype=np.float32)
+        self._lifetimes = np.zeros(0, dtype=np.float32)
+
+        self._surfaces = list[Optional[pg.Surface]]([None, None])
+        self._surface_index = 0
+        self._gradient = np.zeros(0, dtype=np.uint32)
+        self._gradient_colors: Optional[tuple[tuple[int, ...], tuple[int, ...]]] = None
+        self._drawn_bounds: Optional[pg.Rect] = None
+
+    @property
+    def particle_count(self):
+        return self._count
+
+    def _reserve(self):
+        """
+        Resize the particle arrays to `max_particles`, dropping the particles which no longer fit when it shrank.
+        """
+        capacity = max(0, self.max_particles)
+        if capacity == self._capacity:
+            return
+
+        self._count = min(self._count, capacity)
+        count = self._count
+
+        for name in ("_positions", "_velocities", "_ages", "_lifetimes"):
+            array = getattr(self, name)
+            resized = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            resized[:count] = array[:count]
+            setattr(self, name, resized)
+
+        self._capacity = capacity
+
+    def emit(self, count: int, position: Optional[Coordinate] = None):
+        """
+        Emit `count` particles at `position` (by default, the position of the entity) at once.
+        Particles which don't fit within `max_particles` are dropped.
+        """
+        self._reserve()
+
+        start = self._count
+        count = min(count, self._capacity - start)
+        if count <= 0:
+            return
+
+        end = start + count
+        rng = self._rng
+
+        self._positions[start:end] = get_coords_as_tuple(position if position is not None else self.position)
+
+        angles = np.radians(self.direction + rng.uniform(-self.spread / 2, self.spread / 2, count))
+        speeds = rng.uniform(self.speed[0], self.speed[1], count)
+        self._velocities[start:end, 0] = np.cos(angles) * speeds
+        self._velocities[start:end, 1] = np.sin(angles) * speeds
+
+        self._ages[start:end] = 0
+        self._lifetimes[start:end] = rng.uniform(self.lifetime[0], self.lifetime[1], count)
+
+        self._count = end
+
+    def clear(self):
+        self._count = 0
+        self._emission_debt = 0.0
+
+    def update(self):
+        self._reserve()
+        dt = self.dt
+        count = self._count
+
+        if count:
+            self._ages[:count] += dt
+
+            alive = self._ages[:count] < self._lifetimes[:count]
+            if not alive.all():
+                count = self._count = int(np.count_nonzero(alive))
+
+                # Fill the slots of dead particles with the living particles past the new end, so only those move.
+                holes = np.flatnonzero(~alive[:count])
+                movers = count + np.flatnonzero(alive[count:])
+                for array in (self._positions, self._velocities, self._ages, self._lifetimes):
+                    array[holes] = array[movers]
+
+            velocities, positions = self._velocities[:count], self._positions[:count]
+            velocities += (self.gravity.x * dt, self.gravity.y * dt)
+            if self.drag > 0:
+                velocities *= max(0.0, 1 - self.drag * dt)
+
+            positions += velocities * dt
+
+        self._emission_debt += self.emission_rate * dt
+        if self._emission_debt >= 1:
+            emitted = int(self._emission_debt)
+            self._emission_debt -= emitted
+            self.emit(emitted)
+
+    def _get_surface(self, size: tuple[int, int]) -> pg.Surface:
+        """
+        Return a surface of `size` to draw the particles of this frame onto.
+        It's a part of a bigger surface, which only grows, so it isn't created again every time the particles spread.
+        """
+        # A pipelined game may still be drawing the previous frame, so frames alternate between two surfaces.
+        if self.game.pipelined:
+            self._surface_index ^= 1
+
+        surface = self._surfaces[self._surface_index]
+        if surface is None or surface.width < size[0] or surface.height < size[1]:
+            grown_size = max(size[0], surface.width if surface else 0), max(size[1], surface.height if surface else 0)
+            surface = self._surfaces[self._surface_index] = pg.Surface(grown_size, pg.SRCALPHA)
+            self._gradient_colors = None
+
+        return surface.subsurface((0, 0), size)
+
+    def _get_gradient(self, surface: pg.Surface) -> "np.ndarray":
+        """
+        Return the pixel values of the colors particles go through over their lifetime, in the format of `surface`.
+        """
+        start_color = pg.Color(self.start_color)
+        end_color = pg.Color(start_color.r, start_color.g, start_color.b, 0)
+        if self.end_color is not None:
+            end_color = pg.Color(self.end_color)
+
+        colors = tuple(start_color), tuple(end_color)
+
+        if colors != self._gradient_colors:
+            self._gradient_colors = colors
+            self._gradient = np.array(
+                [
+                    # `map_rgb` returns a signed integer, so opaque pixel values come out negative.
+                    surface.map_rgb(start_color.lerp(end_color, step / (_GRADIENT_STEPS - 1))) & 0xFFFFFFFF
+                    for step in range(_GRADIENT_STEPS)
+                ],
+                dtype=np.uint32,
+            )
+
+        return self._gradient
+
+    def render(self):
+        camera = self.camera
+        count, size = self._count, max(1, self.size)
+
+        # Particles are placed relative to the layer, overhanging it by the size of a particle,
+        # so particles on the edges don't need clipping.
+        view = camera.get_layer_area(self.layer)
+        left, top = view.left - size, view.top - size
+        lefts = np.floor(self._positions[:count, 0] - (left + size / 2)).astype(np.int32)
+        tops = np.floor(self._positions[:count, 1] - (top + size / 2)).astype(np.int32)
+        visible = (lefts > 0) & (tops > 0) & (lefts < view.width + size) & (tops < view.height + size)
+
+        drawn_bounds = None
+        if visible.any():
+            lefts, tops = lefts[visible], tops[visible]
+            min_left, min_top = int(lefts.min()), int(tops.min())
+            drawn_bounds = pg.Rect(
+                left + min_left, top + min_top, int(lefts.max()) - min_left + size, int(tops.max()) - min_top + size
+            )
+
+            # Only the area the particles are in is cleared and blitted.
+            surface = self._get_surface(drawn_bounds.size)
+            surface.fill((0, 0, 0, 0))
+
+            fractions = self._ages[:count][visible] / np.maximum(self._lifetimes[:count][visible], 1e-6)
+            steps = np.minimum(fractions * _GRADIENT_STEPS, _GRADIENT_STEPS - 1).astype(np.intp)
+            colors = self._get_gradient(surface)[steps]
+
+            # Index the pixels as one flat array, so each pixel of a particle is a single offset from its topleft.
+            parent = surface.get_parent()
+            row_length = parent.get_pitch() // 4
+            topleft_indices = (tops - min_top) * row_length + (lefts - min_left)
+
+            pixels = np.frombuffer(parent.get_view("1"), dtype=np.uint32)
+            for offset_y in range(size):
+                for offset_x in range(size):
+                    pixels[topleft_indices + (offset_y * row_length + offset_x)] = colors
+            del pixels
+
+            camera.blit(surface, drawn_bounds.topleft, layer=self.layer)
+
+            # The surface is redrawn in place, so the camera can't tell what changed by itself.
+            camera.invalidate_texture(surface)
+
+        if self._drawn_bounds is not None and drawn_bounds is not None:
+            camera.mark_dirty(self._drawn_bounds.union(drawn_bounds))
+        elif self._drawn_bounds is not None or drawn_bounds is not None:
+            camera.mark_dirty(self._drawn_bounds or drawn_bounds)
+
+        self._drawn_bounds = drawn_bounds
+
+    def on_destroy(self):
+        if self._drawn_bounds is not None:
+            self.camera.mark_dirty(self._drawn_bounds)
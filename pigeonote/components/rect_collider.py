@@ -3,11 +3,22 @@ from pigeonote.core.physics import Collider
 
 
 class RectCollider(Collider):
+    is_aabb = True
+
     auto_detect: bool = False
-    size: tuple[int, int] = (32, 32)
+    _size: tuple[int, int] = (32, 32)
 
     _draw_debug_outline: bool = False
 
+    @property
+    def size(self):
+        return self._size
+
+    @size.setter
+    def size(self, new_size: tuple[int, int]):
+        self._size = new_size
+        self.mark_bounds_dirty()
+
     @property
     def width(self):
         return self.size[0]
@@ -24,11 +35,16 @@ class RectCollider(Collider):
     def height(self, h: int):
         self.size = (self.size[0], h)
 
-    def get_collider_rect(self):
-        rect = Rect((0, 0), self.size)
-        rect.center = self.position + self.offset
+    def _compute_bounds(self):
+        position, offset = self.position, self._offset
+
+        rect = Rect((0, 0), self._size)
+        rect.center = (position.x + offset.x, position.y + offset.y)
         return rect
 
+    def get_collider_rect(self):
+        return self.get_bounds().copy()
+
     def init(self):
         super().init()
 
@@ -50,4 +66,4 @@ class RectCollider(Collider):
             self.camera.draw_rect(self.get_collider_rect(), width=2, layer=999)
 
     def check_rect_overlap(self, rect: Rect):
-        return self.get_collider_rect().colliderect(rect)
+        return self.get_bounds().colliderect(rect)
@@ -9,30 +9,15 @@ class SpriteRenderer(Component):
     sprite_surface: Optional[pg.Surface] = None
     layer: int = 0
 
-    def init(self):
-        self._mutated_surface: pg.Surface | None = None
-        self._previous_mutated_rotation: int = 0
-
     def render(self):
-        if not self._is_init:
-            self.init()
-            self._is_init = True
-        
         if self.sprite_surface:
-            if round(self.rotation) == 0:
-                surface_to_blit = self.sprite_surface
-
-            elif round(self.rotation) == self._previous_mutated_rotation and self._mutated_surface is not None:
-                surface_to_blit = self._mutated_surface
-
-            else:
-                # PyGame rotates COUNTER CLOCKWISE. We need to provide negative value for clockwise rotation.
-                pygame_dumb_rotation = self.rotation * (-1)
-                rotated = pg.transform.rotate(self.sprite_surface, pygame_dumb_rotation)
-                surface_to_blit = rotated
+            # Whatever the rotation, the sprite stays within half its diagonal from its center.
+            width, height = self.sprite_surface.get_size()
+            if not self.camera.is_visible_around(self.position, (width * width + height * height) ** 0.5 / 2, self.layer):
+                return
 
-                self._mutated_surface = rotated
-                self._previous_mutated_rotation = round(self.rotation)
+            # PyGame rotates COUNTER CLOCKWISE. We need to provide negative value for clockwise rotation.
+            surface_to_blit = self.game.rotation_cache.get(self.sprite_surface, -self.rotation)
 
             # Using the Rect below because it can easily calculate for us what the "topleft"
             # coordinate should be for `pixel_position` as the center.
@@ -1,5 +1,9 @@
-from pigeonote import Component, Rect, Surface
-import pygame as pg
+import math
+
+from pigeonote import Component, Rect
+
+# Whatever the rotation, a square stays within half its diagonal from its center.
+HALF_DIAGONAL = math.sqrt(2) / 2
 
 
 class SquareRenderer(Component):
@@ -8,24 +12,22 @@ class SquareRenderer(Component):
     layer: int = 0
 
     def init(self):
-        self._surface = Surface((self.size, self.size))
-        self._surface.fill(self.color)
+        # Squares of the same size and color share a surface from the primitive cache of the camera,
+        # and so its rotations as well.
+        self._surface = self.camera.primitive_cache.get_filled((self.size, self.size), self.color)
 
     def render(self):
         if not self._is_init:
             self.init()
             self._is_init = True
 
-        # Using the Rect below because it can easily calculate for us what the "topleft"
-        # coordinate should be for `pixel_position` as the center.
+        if not self.camera.is_visible_around(self.position, self.size * HALF_DIAGONAL, self.layer):
+            return
 
-        if self.rotation == 0:
-            rect = Rect((0, 0), self._surface.size)
-            rect.center = self.pixel_position
-            self.camera.blit(self._surface, rect.topleft, layer=self.layer)
+        surface = self.game.rotation_cache.get(self._surface, self.rotation)
 
-        else:
-            rotated = pg.transform.rotate(self._surface, self.rotation)
-            rect = Rect((0, 0), rotated.size)
-            rect.center = self.pixel_position
-            self.camera.blit(rotated, rect.topleft, layer=self.layer)
+        # Using the Rect below because it can easily calculate for us what the "topleft"
+        # coordinate should be for `pixel_position` as the center.
+        rect = Rect((0, 0), surface.size)
+        rect.center = self.pixel_position
+        self.camera.blit(surface, rect.topleft, layer=self.layer)
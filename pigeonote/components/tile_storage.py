@@ -0,0 +1,361 @@
+from abc import ABC, abstractmethod
+from typing import Any, Iterator, Optional
+
+from pygame import Rect
+
+from pigeonote.utils import np, require_numpy
+
+TilenameType = str | tuple[int, int]
+TileCoords = tuple[int, int]
+
+
+class TileStorage(ABC):
+    """
+    Stores the name of the tile at every coordinate of a tilemap.
+
+    Tile names are also given small indices through a palette, so bulk operations can work on integer arrays.
+    Index 0 always stands for "no tile".
+    """
+
+    def __init__(self) -> None:
+        self._palette = list[Optional[TilenameType]]([None])
+        self._palette_indices = dict[TilenameType, int]()
+
+    def get_palette_index(self, tile_name: Optional[TilenameType]) -> int:
+        """
+        Return the palette index of `tile_name`, adding it to the palette if needed.
+        """
+        if tile_name is None:
+            return 0
+
+        index = self._palette_indices.get(tile_name, None)
+        if index is None:
+            index = len(self._palette)
+            if index > 0xFFFF:
+                raise ValueError(f"A tilemap can't have more than {0xFFFF} different tiles.")
+
+            self._palette.append(tile_name)
+            self._palette_indices[tile_name] = index
+
+        return index
+
+    def get_palette_name(self, index: int) -> Optional[TilenameType]:
+        return self._palette[index]
+
+    @property
+    def palette(self) -> list[TilenameType]:
+        """
+        The tile names in the palette, where the name at position `i` has index `i + 1`.
+        """
+        return self._palette[1:]
+
+    @abstractmethod
+    def get(self, coords: TileCoords) -> Optional[TilenameType]:
+        pass
+
+    @abstractmethod
+    def set(self, coords: TileCoords, tile_name: Optional[TilenameType]) -> bool:
+        """
+        Set (or clear, when `tile_name` is `None`) the tile at `coords`. Return whether anything changed.
+        """
+
+    @abstractmethod
+    def fill_region(self, region: Rect, tile_name: Optional[TilenameType]):
+        pass
+
+    @abstractmethod
+    def set_tiles(self, topleft: TileCoords, indices: Any):
+        """
+        Set the tiles of a whole region at once, from a 2D array (rows first) of palette indices.
+        """
+
+    @abstractmethod
+    def iter_region(self, region: Rect) -> Iterator[tuple[TileCoords, TilenameType]]:
+        """
+        Yield the coordinates and names of the tiles in `region`, row by row.
+        """
+
+    @abstractmethod
+    def iter_tiles(self) -> Iterator[tuple[TileCoords, TilenameType]]:
+        pass
+
+    @abstractmethod
+    def count_region(self, region: Rect) -> int:
+        """
+        Return how many tiles are set in `region`.
+        """
+
+    def iter_occupied_chunks(self, chunk_size: int) -> Iterator[TileCoords]:
+        """
+        Yield the coordinates of every chunk of `chunk_size`x`chunk_size` tiles with any tile in it.
+        """
+        yield from {(x // chunk_size, y // chunk_size) for (x, y), _ in self.iter_tiles()}
+
+    def iter_chunk_indices(self, chunk_size: int) -> Iterator[tuple[TileCoords, "np.ndarray"]]:
+        """
+        Yield every chunk of `chunk_size`x`chunk_size` tiles with any tile in it, as a 2D array of palette indices.
+        """
+        for chunk_x, chunk_y in self.iter_occupied_chunks(chunk_size):
+            region = Rect(chunk_x * chunk_size, chunk_y * chunk_size, chunk_size, chunk_size)
+            indices = np.zeros((chunk_size, chunk_size), dtype=np.uint16)
+
+            for (x, y), tile_name in self.iter_region(region):
+                indices[y - region.top, x - region.left] = self._palette_indices[tile_name]
+
+            yield (chunk_x, chunk_y), indices
+
+    # Tiles are always available, unless the storage streams them (see `StreamedTileStorage`).
+
+    def request_region(self, region: Rect):
+        """
+        Ask for the tiles in `region` to be loaded, without waiting for them.
+        """
+
+    def poll(self) -> list[Rect]:
+        """
+        Return the regions whose tiles were loaded or unloaded since the last call.
+        """
+        return []
+
+    def close(self):
+        pass
+
+
+class DictTileStorage(TileStorage):
+    """
+    Keeps every tile in a dictionary. Fine for small and sparse tilemaps, and doesn't need numpy.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._tiles = dict[TileCoords, TilenameType]()
+
+    def get(self, coords: TileCoords) -> Optional[TilenameType]:
+        return self._tiles.get(coords, None)
+
+    def set(self, coords: TileCoords, tile_name: Optional[TilenameType]) -> bool:
+        if tile_name is None:
+            return self._tiles.pop(coords, None) is not None
+
+        if self._tiles.get(coords, None) == tile_name:
+            return False
+
+        self.get_palette_index(tile_name)
+        self._tiles[coords] = tile_name
+        return True
+
+    def fill_region(self, region: Rect, tile_name: Optional[TilenameType]):
+        for y in range(region.top, region.bottom):
+            for x in range(region.left, region.right):
+                self.set((x, y), tile_name)
+
+    def set_tiles(self, topleft: TileCoords, indices: Any):
+        left, top = topleft
+
+        for y, row in enumerate(indices):
+            for x, index in enumerate(row):
+                self.set((left + x, top + y), self._palette[index])
+
+    def iter_region(self, region: Rect) -> Iterator[tuple[TileCoords, TilenameType]]:
+        # A region bigger than the tilemap is cheaper to find by going over the tiles.
+        if region.width * region.height > len(self._tiles):
+            in_region = [(coords, name) for coords, name in self._tiles.items() if region.collidepoint(coords)]
+            yield from sorted(in_region, key=lambda tile: (tile[0][1], tile[0][0]))
+            return
+
+        for y in range(region.top, region.bottom):
+            for x in range(region.left, region.right):
+                if (tile_name := self._tiles.get((x, y), None)) is not None:
+                    yield (x, y), tile_name
+
+    def iter_tiles(self) -> Iterator[tuple[TileCoords, TilenameType]]:
+        yield from self._tiles.items()
+
+    def count_region(self, region: Rect) -> int:
+        return sum(1 for _ in self.iter_region(region))
+
+
+class ChunkedTileStorage(TileStorage):
+    """
+    Keeps tiles as palette indices, in square `uint16` numpy arrays of `chunk_size`x`chunk_size` tiles.
+    Only chunks with tiles in them are allocated, so huge tilemaps take about 2 bytes per tile of their populated area.
+    """
+
+    def __init__(self, chunk_size: int = 64) -> None:
+        require_numpy("the chunked tile storage")
+        super().__init__()
+
+        self._chunk_size = chunk_size
+        self._chunks = dict[TileCoords, "np.ndarray"]()
+
+    @property
+    def chunk_size(self):
+        return self._chunk_size
+
+    def get(self, coords: TileCoords) -> Optional[TilenameType]:
+        size = self._chunk_size
+        chunk = self._chunks.get((coords[0] // size, coords[1] // size), None)
+
+        if chunk is None:
+            return None
+
+        return self._palette[chunk[coords[1] % size, coords[0] % size]]
+
+    def set(self, coords: TileCoords, tile_name: Optional[TilenameType]) -> bool:
+        size = self._chunk_size
+        chunk_coords = coords[0] // size, coords[1] // size
+        local = coords[1] % size, coords[0] % size
+
+        index = self.get_palette_index(tile_name)
+        chunk = self._chunks.get(chunk_coords, None)
+
+        if chunk is None:
+            if index == 0:
+                return False
+
+            chunk = self._chunks[chunk_coords] = np.zeros((size, size), dtype=np.uint16)
+
+        if chunk[local] == index:
+            return False
+
+        chunk[local] = index
+
+        if index == 0 and not chunk.any():
+            self._remove_empty_chunk(chunk_coords)
+
+        return True
+
+    def _remove_empty_chunk(self, chunk_coords: TileCoords):
+        del self._chunks[chunk_coords]
+
+    def _iter_chunk_slices(self, region: Rect) -> Iterator[tuple[TileCoords, tuple[slice, slice], tuple[slice, slice]]]:
+        """
+        Yield every chunk overlapping `region`, along with the slices of the chunk and of the region which overlap.
+        """
+        size = self._chunk_size
+
+        for chunk_y in range(region.top // size, (region.bottom - 1) // size + 1):
+            for chunk_x in range(region.left // size, (region.right - 1) // size + 1):
+                left, top = max(region.left, chunk_x * size), max(region.top, chunk_y * size)
+                right, bottom = min(region.right, (chunk_x + 1) * size), min(region.bottom, (chunk_y + 1) * size)
+
+                chunk_slices = (
+                    slice(top - chunk_y * size, bottom - chunk_y * size),
+                    slice(left - chunk_x * size, right - chunk_x * size),
+                )
+                region_slices = (
+                    slice(top - region.top, bottom - region.top),
+                    slice(left - region.left, right - region.left),
+                )
+
+                yield (chunk_x, chunk_y), chunk_slices, region_slices
+
+    def _write_region(self, region: Rect, indices: "np.ndarray | int"):
+        """
+        Write `indices` (an array the size of `region`, or a single index) into every chunk overlapping `region`.
+        """
+        is_single_index = isinstance(indices, int)
+
+        for chunk_coords, chunk_slices, region_slices in self._iter_chunk_slices(region):
+            values = indices if is_single_index else indices[region_slices]
+            chunk = self._chunks.get(chunk_coords, None)
+
+            if chunk is None:
+                if not np.any(values):
+                    continue
+
+                chunk = self._chunks[chunk_coords] = np.zeros((self._chunk_size, self._chunk_size), dtype=np.uint16)
+
+            chunk[chunk_slices] = values
+
+            if not chunk.any():
+                self._remove_empty_chunk(chunk_coords)
+
+    def fill_region(self, region: Rect, tile_name: Optional[TilenameType]):
+        if region.width > 0 and region.height > 0:
+            self._write_region(region, self.get_palette_index(tile_name))
+
+    def set_tiles(self, topleft: TileCoords, indices: Any):
+        indices = np.asarray(indices)
+
+        if indices.ndim != 2:
+            raise ValueError(f"Tiles must be set from a 2D array, got {indices.ndim} dimensions.")
+
+        if indices.size == 0:
+            return
+
+        if indices.min() < 0 or indices.max() >= len(self._palette):
+            raise ValueError(f"Tile indices must be between 0 and {len(self._palette) - 1} (the size of the palette).")
+
+        height, width = indices.shape
+        self._write_region(Rect(topleft, (width, height)), indices.astype(np.uint16, copy=False))
+
+    def get_region(self, region: Rect) -> "np.ndarray":
+        """
+        Return the palette indices of the tiles in `region`, as a new 2D array (rows first).
+        """
+        indices = np.zeros((max(region.height, 0), max(region.width, 0)), dtype=np.uint16)
+        if indices.size == 0:
+            return indices
+
+        for chunk_coords, chunk_slices, region_slices in self._iter_chunk_slices(region):
+            chunk = self._chunks.get(chunk_coords, None)
+
+            if chunk is not None:
+                indices[region_slices] = chunk[chunk_slices]
+
+        return indices
+
+    def iter_region(self, region: Rect) -> Iterator[tuple[TileCoords, TilenameType]]:
+        indices = self.get_region(region)
+        palette = self._palette
+
+        ys, xs = np.nonzero(indices)
+        for y, x, index in zip(ys.tolist(), xs.tolist(), indices[ys, xs].tolist()):
+            yield (region.left + x, region.top + y), palette[index]
+
+    def count_region(self, region: Rect) -> int:
+        return sum(
+            int(np.count_nonzero(chunk[chunk_slices]))
+            for chunk_coords, chunk_slices, _ in self._iter_chunk_slices(region)
+            if (chunk := self._chunks.get(chunk_coords, None)) is not None
+        )
+
+    def iter_tiles(self) -> Iterator[tuple[TileCoords, TilenameType]]:
+        size, palette = self._chunk_size, self._palette
+
+        for (chunk_x, chunk_y), chunk in list(self._chunks.items()):
+            ys, xs = np.nonzero(chunk)
+
+            for y, x, index in zip(ys.tolist(), xs.tolist(), chunk[ys, xs].tolist()):
+                yield (chunk_x * size + x, chunk_y * size + y), palette[index]
+
+    def iter_chunk_indices(self, chunk_size: int) -> Iterator[tuple[TileCoords, "np.ndarray"]]:
+        if chunk_size != self._chunk_size:
+            yield from super().iter_chunk_indices(chunk_size)
+            return
+
+        yield from list(self._chunks.items())
+
+    def iter_occupied_chunks(self, chunk_size: int) -> Iterator[TileCoords]:
+        size = self._chunk_size
+
+        # When the storage chunks split evenly into the requested chunks, no tile has to be looked at.
+        if size % chunk_size != 0:
+            yield from super().iter_occupied_chunks(chunk_size)
+            return
+
+        blocks = size // chunk_size
+
+        for (chunk_x, chunk_y), chunk in self._chunks.items():
+            occupied = chunk.reshape(blocks, chunk_size, blocks, chunk_size).any(axis=(1, 3))
+
+            for y, x in zip(*(axis.tolist() for axis in np.nonzero(occupied))):
+                yield chunk_x * blocks + x, chunk_y * blocks + y
+
+
+def create_tile_storage() -> TileStorage:
+    """
+    Return the chunked storage when numpy is installed, and the dictionary storage otherwise.
+    """
+    return ChunkedTileStorage() if np is not None else DictTileStorage()
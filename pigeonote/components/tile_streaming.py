@@ -0,0 +1,340 @@
+import json
+import os
+import struct
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterator, Optional
+
+from pygame import Rect
+
+from pigeonote.components.tile_storage import ChunkedTileStorage, TileCoords, TileStorage, TilenameType
+from pigeonote.utils import np, require_numpy
+
+# magic, version, chunk size, first chunk x, first chunk y, chunks wide, chunks high, palette length (in bytes).
+_HEADER = struct.Struct("<4sHHiiIII")
+_MAGIC = b"PNTM"
+_VERSION = 1
+
+
+def _align(offset: int, alignment: int = 8):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def write_tilemap_file(path: Path | str, storage: TileStorage, chunk_size: Optional[int] = None):
+    """
+    Write the tiles of `storage` into a tilemap file, which can later be streamed with `StreamedTileStorage`.
+
+    The file holds a palette of tile names, a grid with the slot of every chunk (or -1 for empty chunks),
+    and then the palette indices of every non empty chunk. The file is written next to `path` and then moved
+    over it, so a failed write never leaves a partial file behind.
+
+    A `StreamedTileStorage` written this way streams from the new file afterwards (see `StreamedTileStorage`).
+    """
+    require_numpy("tilemap files")
+
+    if chunk_size is None:
+        chunk_size = storage.chunk_size if isinstance(storage, ChunkedTileStorage) else 64
+
+    chunks = dict(storage.iter_chunk_indices(chunk_size))
+
+    if chunks:
+        first_x, first_y = min(x for x, _ in chunks), min(y for _, y in chunks)
+        chunks_wide, chunks_high = max(x for x, _ in chunks) - first_x + 1, max(y for _, y in chunks) - first_y + 1
+    else:
+        first_x = first_y = chunks_wide = chunks_high = 0
+
+    palette = json.dumps(storage.palette).encode("utf-8")
+
+    slots = np.full((chunks_high, chunks_wide), -1, dtype=np.int64)
+    for slot, (chunk_x, chunk_y) in enumerate(chunks):
+        slots[chunk_y - first_y, chunk_x - first_x] = slot
+
+    temporary_path = Path(f"{path}.tmp")
+
+    with open(temporary_path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, chunk_size, first_x, first_y, chunks_wide, chunks_high, len(palette)))
+        file.write(palette)
+        file.write(b"\0" * (_align(file.tell()) - file.tell()))
+        file.write(slots.astype("<i8").tobytes())
+
+        for indices in chunks.values():
+            file.write(np.ascontiguousarray(indices, dtype="<u2").tobytes())
+
+    if isinstance(storage, StreamedTileStorage):
+        storage.internal_replace_file(temporary_path, path)
+    else:
+        os.replace(temporary_path, path)
+
+
+class TilemapFile:
+    """
+    A memory-mapped tilemap file (see `write_tilemap_file`). Chunks are only read from disk when they're accessed.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        require_numpy("tilemap files")
+
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"`{path}` is too short to be a tilemap file.")
+
+            magic, version, chunk_size, first_x, first_y, chunks_wide, chunks_high, palette_length = _HEADER.unpack(
+                header
+            )
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"`{path}` isn't a tilemap file of version {_VERSION}.")
+
+            palette = json.loads(file.read(palette_length).decode("utf-8"))
+
+        self._chunk_size = chunk_size
+        self._first_chunk = first_x, first_y
+        self._chunks_area = Rect(first_x, first_y, chunks_wide, chunks_high)
+
+        # JSON has no tuples, so tile names given as coordinates come back as lists.
+        self.palette = [tuple(name) if isinstance(name, list) else name for name in palette]
+
+        slots_offset = _align(_HEADER.size + palette_length)
+        slot_count = chunks_wide * chunks_high
+
+        if slot_count:
+            self._slots = np.memmap(path, dtype="<i8", mode="r", offset=slots_offset, shape=(chunks_high, chunks_wide))
+        else:
+            self._slots = np.zeros((0, 0), dtype=np.int64)
+
+        data_offset = slots_offset + slot_count * 8
+        chunk_count = (os.path.getsize(path) - data_offset) // (chunk_size * chunk_size * 2)
+
+        if chunk_count:
+            self._data = np.memmap(
+                path, dtype="<u2", mode="r", offset=data_offset, shape=(chunk_count, chunk_size, chunk_size)
+            )
+        else:
+            self._data = np.zeros((0, chunk_size, chunk_size), dtype=np.uint16)
+
+    @property
+    def chunk_size(self):
+        return self._chunk_size
+
+    @property
+    def chunks_area(self):
+        """
+        The area of the chunk grid, in chunk coordinates.
+        """
+        return self._chunks_area.copy()
+
+    def _get_slot(self, chunk_coords: TileCoords) -> int:
+        if not self._chunks_area.collidepoint(chunk_coords):
+            return -1
+
+        return int(self._slots[chunk_coords[1] - self._first_chunk[1], chunk_coords[0] - self._first_chunk[0]])
+
+    def has_chunk(self, chunk_coords: TileCoords) -> bool:
+        return self._get_slot(chunk_coords) >= 0
+
+    def read_chunk(self, chunk_coords: TileCoords) -> Optional["np.ndarray"]:
+        """
+        Return a copy of the palette indices of a chunk, or `None` if the chunk is empty.
+        """
+        slot = self._get_slot(chunk_coords)
+        if slot < 0:
+            return None
+
+        return np.array(self._data[slot], dtype=np.uint16)
+
+    def iter_chunks(self) -> Iterator[TileCoords]:
+        ys, xs = np.nonzero(np.asarray(self._slots) >= 0)
+
+        for y, x in zip(ys.tolist(), xs.tolist()):
+            yield x + self._first_chunk[0], y + self._first_chunk[1]
+
+    def close(self):
+        """
+        Unmap the file, so it can be replaced or deleted. The file reads as empty afterwards.
+        """
+        # Chunks are only ever handed out as copies, so dropping the memory maps closes them.
+        self._chunks_area = Rect(0, 0, 0, 0)
+        self._slots = np.zeros((0, 0), dtype=np.int64)
+        self._data = np.zeros((0, self._chunk_size, self._chunk_size), dtype=np.uint16)
+
+
+class StreamedTileStorage(ChunkedTileStorage):
+    """
+    Streams the chunks of a tilemap file, keeping at most `max_loaded_chunks` of them in memory.
+
+    Chunks are loaded on a background thread after being requested with `request_region`, and only become
+    visible once `poll` picks them up, so reading tiles never waits for the disk. Until then, and after they're
+    evicted (least recently requested first), their tiles read as empty.
+
+    Chunks which were modified are kept in memory until the storage is written with `write_tilemap_file`.
+    The storage then streams from the written file, so those chunks can be evicted like any other.
+    """
+
+    def __init__(self, path: Path | str, max_loaded_chunks: int = 1024) -> None:
+        self._path = path
+        self._file = TilemapFile(path)
+        super().__init__(self._file.chunk_size)
+
+        for tile_name in self._file.palette:
+            self.get_palette_index(tile_name)
+
+        self.max_loaded_chunks = max_loaded_chunks
+
+        # Loaded chunks, from the least to the most recently requested.
+        self._chunks = OrderedDict[TileCoords, "np.ndarray"]()
+        self._modified_chunks = set[TileCoords]()
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tilemap-streaming")
+        self._pending = dict[TileCoords, Future]()
+
+    def _iter_region_chunks(self, region: Rect) -> Iterator[TileCoords]:
+        size = self._chunk_size
+
+        for chunk_y in range(region.top // size, (region.bottom - 1) // size + 1):
+            for chunk_x in range(region.left // size, (region.right - 1) // size + 1):
+                yield chunk_x, chunk_y
+
+    def _get_chunk_region(self, chunk_coords: TileCoords):
+        size = self._chunk_size
+        return Rect(chunk_coords[0] * size, chunk_coords[1] * size, size, size)
+
+    def request_region(self, region: Rect):
+        if region.width <= 0 or region.height <= 0:
+            return
+
+        for chunk_coords in self._iter_region_chunks(region):
+            if chunk_coords in self._chunks:
+                self._chunks.move_to_end(chunk_coords)
+
+            elif chunk_coords not in self._pending and self._file.has_chunk(chunk_coords):
+                self._pending[chunk_coords] = self._executor.submit(self._file.read_chunk, chunk_coords)
+
+    def load_region(self, region: Rect) -> list[Rect]:
+        """
+        Load the chunks in `region` right away, and return the regions which were loaded.
+        """
+        loaded = list[Rect]()
+
+        for chunk_coords in self._iter_region_chunks(region):
+            if self._load_now(chunk_coords):
+                loaded.append(self._get_chunk_region(chunk_coords))
+
+        return loaded
+
+    def _load_now(self, chunk_coords: TileCoords) -> bool:
+        if chunk_coords in self._chunks:
+            return False
+
+        pending = self._pending.pop(chunk_coords, None)
+        chunk = pending.result() if pending is not None else self._file.read_chunk(chunk_coords)
+
+        if chunk is None:
+            return False
+
+        self._chunks[chunk_coords] = chunk
+        return True
+
+    def poll(self) -> list[Rect]:
+        changed = list[Rect]()
+
+        for chunk_coords, pending in list(self._pending.items()):
+            if not pending.done():
+                continue
+
+            del self._pending[chunk_coords]
+            chunk = pending.result()
+
+            # A chunk loaded in the meantime (e.g to be modified) is already more up to date.
+            if chunk is not None and chunk_coords not in self._chunks:
+                self._chunks[chunk_coords] = chunk
+                changed.append(self._get_chunk_region(chunk_coords))
+
+        evictable = len(self._chunks) - len(self._modified_chunks)
+        if evictable > self.max_loaded_chunks:
+            to_evict = evictable - self.max_loaded_chunks
+
+            for chunk_coords in list(self._chunks):
+                if to_evict == 0:
+                    break
+
+                if chunk_coords not in self._modified_chunks:
+                    del self._chunks[chunk_coords]
+                    changed.append(self._get_chunk_region(chunk_coords))
+                    to_evict -= 1
+
+        return changed
+
+    # Modifying tiles first loads their chunks, and keeps them loaded.
+
+    def set(self, coords: TileCoords, tile_name: Optional[TilenameType]) -> bool:
+        chunk_coords = coords[0] // self._chunk_size, coords[1] // self._chunk_size
+        self._load_now(chunk_coords)
+
+        changed = super().set(coords, tile_name)
+        if changed:
+            self._modified_chunks.add(chunk_coords)
+
+        return changed
+
+    def _write_region(self, region: Rect, indices: "np.ndarray | int"):
+        for chunk_coords in self._iter_region_chunks(region):
+            self._load_now(chunk_coords)
+            self._modified_chunks.add(chunk_coords)
+
+        super()._write_region(region, indices)
+
+    def _remove_empty_chunk(self, chunk_coords: TileCoords):
+        # An empty chunk is kept, otherwise the chunk would be read back from the file.
+        pass
+
+    def iter_chunk_indices(self, chunk_size: int) -> Iterator[tuple[TileCoords, "np.ndarray"]]:
+        """
+        Yield every non empty chunk of the tilemap, including the ones which aren't loaded.
+        """
+        if chunk_size != self._chunk_size:
+            raise ValueError(f"A streamed tilemap can only be written in chunks of {self._chunk_size} tiles.")
+
+        for chunk_coords in self._file.iter_chunks():
+            if chunk_coords not in self._chunks:
+                yield chunk_coords, self._file.read_chunk(chunk_coords)
+
+        for chunk_coords, chunk in list(self._chunks.items()):
+            if chunk.any():
+                yield chunk_coords, chunk
+
+    def _cancel_pending(self):
+        """
+        Drop the chunks being loaded, waiting for the one currently being read (if any).
+        """
+        for pending in self._pending.values():
+            pending.cancel()
+
+        wait(self._pending.values())
+        self._pending.clear()
+
+    def internal_replace_file(self, written_path: Path | str, path: Path | str):
+        """
+        Move a tilemap file written from this storage to `path`, and stream from it from now on.
+        """
+        # The file being streamed may be the one which is replaced, which can't be done while it's mapped on Windows.
+        # Chunks requested in the meantime are requested again on the next `request_region`.
+        self._cancel_pending()
+        self._file.close()
+
+        try:
+            os.replace(written_path, path)
+        except OSError:
+            self._file = TilemapFile(self._path)
+            raise
+
+        self._path = path
+        self._file = TilemapFile(path)
+
+        # Every chunk is in the new file now, so the modified ones no longer need to stay loaded.
+        self._modified_chunks.clear()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+        self._file.close()
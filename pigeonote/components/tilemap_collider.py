@@ -1,55 +1,234 @@
-from pygame import Rect
+import math
+from typing import Iterator, Optional
+
+from pygame import FRect, Rect, Vector2
 
 from pigeonote.components import TilemapRenderer
-from pigeonote.core import Collider
+from pigeonote.core import BodyType, Collider, Entity
+from pigeonote.core.physics.queries import RaycastHit, circle_overlaps_rect, expand_rect, intersect_ray_rect
+from pigeonote.types import AnyRect
 
 
 class TilemapCollider(Collider):
-    def init(self):
-        super().init()
+    """
+    Collider for the solid tiles of the `TilemapRenderer` on the same entity.
+
+    The tilemap is split into chunks of `chunk_size`x`chunk_size` tiles. The solid tiles of each chunk are merged
+    into as few rectangles as possible (greedy meshing), and every chunk is placed in the physics broadphase as
+    a separate part. Setting or clearing a tile only re-merges its own chunk.
+    """
+
+    is_compound = True
+
+    chunk_size: int = 16
+
+    _body_type: BodyType = BodyType.STATIC
+
+    def __init__(self, component_id: int, parent: Entity) -> None:
+        super().__init__(component_id, parent)
 
+        self._tilemap: Optional[TilemapRenderer] = None
+
+        self._chunk_rects = dict[tuple[int, int], list[Rect]]()
+        self._chunk_bounds = dict[tuple[int, int], Rect]()
+        self._dirty_chunks = set[tuple[int, int]]()
+        self._changed_parts = dict[tuple[int, int], Optional[Rect]]()
+
+    def init(self):
         self._tilemap = self.entity.get_component_by_type(TilemapRenderer)
 
         if self._tilemap is None:
             self.log(f"No {TilemapRenderer.__name__} was assigned to {self.entity.name}.")
+        else:
+            self._tilemap.add_tile_listener(self._on_tiles_changed)
+            self._dirty_chunks.update(self._tilemap.iter_occupied_chunks(self.chunk_size))
+
+        super().init()
+
+    def on_destroy(self):
+        super().on_destroy()
+
+        if self._tilemap is not None:
+            self._tilemap.remove_tile_listener(self._on_tiles_changed)
+
+    def _on_tiles_changed(self, region: Rect):
+        chunk_size = self.chunk_size
+
+        for chunk_y in range(region.top // chunk_size, (region.bottom - 1) // chunk_size + 1):
+            for chunk_x in range(region.left // chunk_size, (region.right - 1) // chunk_size + 1):
+                self._dirty_chunks.add((chunk_x, chunk_y))
+
+        self.mark_bounds_dirty()
+
+    def _merge_chunk(self, chunk: tuple[int, int]) -> list[Rect]:
+        """
+        Cover the solid tiles of `chunk` with rectangles, each grown as wide and then as tall as possible.
+        """
+        chunk_size, tilesize = self.chunk_size, self._tilemap.tile_size
+        first_x, first_y = chunk[0] * chunk_size, chunk[1] * chunk_size
+        region = Rect(first_x, first_y, chunk_size, chunk_size)
+
+        # Chunks which are entirely empty or solid are common in big maps, and need no merging.
+        tile_count = self._tilemap.count_tiles_in_region(region)
+        if tile_count == 0:
+            return []
+
+        if tile_count == chunk_size * chunk_size:
+            return [Rect(first_x * tilesize, first_y * tilesize, chunk_size * tilesize, chunk_size * tilesize)]
+
+        solid = [[False] * chunk_size for _ in range(chunk_size)]
+        for (x, y), _ in self._tilemap.iter_tiles_in_region(region):
+            solid[y - first_y][x - first_x] = True
+
+        rects = list[Rect]()
+
+        for y in range(chunk_size):
+            row = solid[y]
+
+            for x in range(chunk_size):
+                if not row[x]:
+                    continue
+
+                width = 1
+                while x + width < chunk_size and row[x + width]:
+                    width += 1
+
+                height = 1
+                while y + height < chunk_size and all(solid[y + height][x : x + width]):
+                    height += 1
+
+                # Tiles covered by this rect shouldn't start another one.
+                for covered_row in solid[y : y + height]:
+                    covered_row[x : x + width] = [False] * width
+
+                rects.append(
+                    Rect((first_x + x) * tilesize, (first_y + y) * tilesize, width * tilesize, height * tilesize)
+                )
+
+        return rects
+
+    def _flush_dirty_chunks(self):
+        for chunk in self._dirty_chunks:
+            rects = self._merge_chunk(chunk)
 
-    def update(self):
-        # TODO: Weird stuff happens in the super() update.
-        # I can't think of the correct architecture to generally find a collision between
-        # 2 colliders. So meanwhile objects that have this component won't receive collision events.
-        # but who the hell is gonna place this on a player or something that moves lol.
-        pass
+            if rects:
+                self._chunk_rects[chunk] = rects
+                self._chunk_bounds[chunk] = rects[0].unionall(rects[1:])
+            else:
+                self._chunk_rects.pop(chunk, None)
+                self._chunk_bounds.pop(chunk, None)
+
+            self._changed_parts[chunk] = self._chunk_bounds.get(chunk, None)
+
+        self._dirty_chunks.clear()
+
+    def get_broadphase_parts(self):
+        self._flush_dirty_chunks()
+        return dict(self._chunk_bounds)
+
+    def internal_pop_changed_parts(self):
+        self._flush_dirty_chunks()
+
+        changed_parts = self._changed_parts
+        self._changed_parts = {}
+        return changed_parts
+
+    def _iter_solid_rects(self, area: AnyRect) -> Iterator[Rect]:
+        """
+        Yield the merged rects of the chunks touching `area`.
+        """
+        if self._dirty_chunks:
+            self._flush_dirty_chunks()
+
+        chunk_pixels = self.chunk_size * self._tilemap.tile_size
+        first_x, last_x = int(area.left // chunk_pixels), int(math.ceil(area.right / chunk_pixels))
+        first_y, last_y = int(area.top // chunk_pixels), int(math.ceil(area.bottom / chunk_pixels))
+
+        # A huge area is cheaper to handle by going over the chunks which actually have tiles.
+        if (last_x - first_x) * (last_y - first_y) > len(self._chunk_rects):
+            chunks = [c for c in self._chunk_rects if first_x <= c[0] < last_x and first_y <= c[1] < last_y]
+        else:
+            chunks = [(x, y) for y in range(first_y, last_y) for x in range(first_x, last_x)]
+
+        for chunk in chunks:
+            yield from self._chunk_rects.get(chunk, ())
 
     def check_rect_overlap(self, rect: Rect):
         if self._tilemap is None:
-            return
+            return False
+
+        return any(solid_rect.colliderect(rect) for solid_rect in self._iter_solid_rects(rect))
+
+    def check_point_overlap(self, point: Vector2):
+        if self._tilemap is None:
+            return False
 
-        # TODO: what the fuck? Why do I only check the range visible on camera?
+        return self._tilemap.has_tile_at(self._tilemap.get_tile_coords_from_world_position(point))
 
+    def check_circle_overlap(self, center: Vector2, radius: float):
+        if self._tilemap is None:
+            return False
+
+        circle_bounds = FRect(center.x - radius, center.y - radius, radius * 2, radius * 2)
+        return any(circle_overlaps_rect(center, radius, r) for r in self._iter_solid_rects(circle_bounds))
+
+    def raycast(self, origin: Vector2, direction: Vector2, max_distance: float) -> Optional[RaycastHit]:
+        if self._tilemap is None:
+            return None
+
+        # Walk through the tiles the ray passes through, in order, until a solid one is found (Amanatides & Woo DDA).
         tilesize = self._tilemap.tile_size
-        topleft, bottomright = (
-            rect.topleft,
-            rect.bottomright,
-        )
-
-        topleft_tile_x, topleft_tile_y = (
-            int((topleft[0] + tilesize - 1) // tilesize),
-            int((topleft[1] + tilesize - 1) // tilesize),
-        )
-        bottomright_tile_x, bottomright_tile_y = (
-            int((bottomright[0] + tilesize - 1) // tilesize),
-            int((bottomright[1] + tilesize - 1) // tilesize),
-        )
-
-        for y in range(topleft_tile_y, bottomright_tile_y):
-            for x in range(topleft_tile_x, bottomright_tile_x):
-                if self._tilemap.has_tile_at((x, y)):
-                    tile_rect = Rect(
-                        self._tilemap.world_coords_of_tile((x, y)),
-                        (tilesize, tilesize),
-                    )
-
-                    if tile_rect.colliderect(rect):
-                        return True
-
-        return False
+        tile_x, tile_y = int(origin.x // tilesize), int(origin.y // tilesize)
+
+        step_x = 1 if direction.x > 0 else -1
+        step_y = 1 if direction.y > 0 else -1
+
+        # Distance along the ray to the next vertical/horizontal tile edge, and between two such edges.
+        if direction.x != 0:
+            next_x = (tile_x + 1) * tilesize if step_x > 0 else tile_x * tilesize
+            t_max_x, t_delta_x = (next_x - origin.x) / direction.x, tilesize / abs(direction.x)
+        else:
+            t_max_x = t_delta_x = math.inf
+
+        if direction.y != 0:
+            next_y = (tile_y + 1) * tilesize if step_y > 0 else tile_y * tilesize
+            t_max_y, t_delta_y = (next_y - origin.y) / direction.y, tilesize / abs(direction.y)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        distance = 0.0
+        normal = Vector2(0, 0)
+
+        while distance <= max_distance:
+            if self._tilemap.has_tile_at((tile_x, tile_y)):
+                return RaycastHit(collider=self, point=origin + direction * distance, normal=normal, distance=distance)
+
+            if t_max_x < t_max_y:
+                distance = t_max_x
+                t_max_x += t_delta_x
+                tile_x += step_x
+                normal = Vector2(-step_x, 0)
+            else:
+                distance = t_max_y
+                t_max_y += t_delta_y
+                tile_y += step_y
+                normal = Vector2(0, -step_y)
+
+        return None
+
+    def sweep_rect(self, rect: AnyRect, direction: Vector2, max_distance: float) -> Optional[RaycastHit]:
+        if self._tilemap is None:
+            return None
+
+        origin = Vector2(rect.center)
+        swept_area = FRect(rect).union(FRect(rect).move(direction * max_distance))
+
+        closest_hit: Optional[RaycastHit] = None
+
+        for solid_rect in self._iter_solid_rects(swept_area):
+            hit = self._raycast_rect(origin, direction, expand_rect(solid_rect, rect.size), max_distance)
+
+            if hit is not None and (closest_hit is None or hit.distance < closest_hit.distance):
+                closest_hit = hit
+
+        return closest_hit
@@ -1,65 +1,193 @@
+from collections import OrderedDict
 from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
 from pigeonote import Component, Coordinate, get_coords_as_tuple
 
 import pygame as pg
 
+from pigeonote.components.tile_storage import TilenameType, create_tile_storage
+from pigeonote.components.tile_streaming import StreamedTileStorage, write_tilemap_file
+from pigeonote.components.tileset import load_tileset
 from pigeonote.core.entity import Entity
 
 
-TilenameType = str | tuple[int, int]
-
-
 def _coords_as_int_tuple(coords: Coordinate):
     coords_tup = get_coords_as_tuple(coords)
     return int(coords_tup[0]), int(coords_tup[1])
 
 
 class TilemapRenderer(Component):
+    """
+    Renders a grid of tiles, named after the surfaces of the tileset.
+
+    Tiles are kept in chunked numpy arrays of palette indices when numpy is installed (see `ChunkedTileStorage`),
+    so huge tilemaps stay compact, and whole regions can be set at once with `fill_region` and `set_tiles`.
+
+    The tilemap is drawn in chunks of `chunk_size`x`chunk_size` tiles, each baked once into its own surface.
+    Setting or clearing a tile drops the baked surface of its own chunk, which is baked again the next time
+    the chunk is visible. Unloading streamed tiles drops the baked surfaces of their chunks the same way.
+    At most `max_baked_chunks` surfaces are kept, and the chunks which were drawn the longest ago are dropped first.
+
+    Tilemaps too big to keep in memory can be saved with `save_tiles` and then streamed with `stream_tiles_from`.
+    Tiles within `stream_radius` tiles of the camera or of the entities in `stream_interests` are then loaded
+    in the background, and tiles far from all of them are eventually unloaded.
+    """
+
     tileset: dict[TilenameType, pg.Surface] = dict()
     tile_size: int = 10
+    chunk_size: int = 16
     layer: int = 0
     draw_grid: bool = False
+    max_baked_chunks: int = 256
+
+    stream_radius: int = 32
+    stream_interests: list[Entity] = list()
 
     def __init__(self, component_id: int, parent: Entity) -> None:
         super().__init__(component_id, parent)
-        self._tiles = dict[tuple[int, int], TilenameType]()
+        self._tiles = create_tile_storage()
+        self._tile_listeners = list[Callable[[pg.Rect], None]]()
+
+        # Baked chunks, from the least to the most recently drawn. Chunks which changed are dropped, and baked again.
+        # Chunks without tiles have no surface, and aren't kept.
+        self._chunk_surfaces = OrderedDict[tuple[int, int], pg.Surface]()
+        self._baked_settings: Optional[tuple[int, int, bool]] = None
 
-    def load_tilset_from_file(self, file: Path | str, tilesize: int):
-        tilset_image = pg.image.load(file).convert_alpha()
+    def add_tile_listener(self, listener: Callable[[pg.Rect], None]):
+        """
+        Register `listener` to be called with the region (in tile coordinates) of every change to the tiles.
+        """
+        self._tile_listeners.append(listener)
 
-        msk = pg.Mask((tilesize, tilesize))
-        msk.fill()
+    def remove_tile_listener(self, listener: Callable[[pg.Rect], None]):
+        if listener in self._tile_listeners:
+            self._tile_listeners.remove(listener)
 
-        for px in range(0, tilset_image.width, tilesize):
-            for py in range(0, tilset_image.height, tilesize):
-                tile_coords = px // tilesize, py // tilesize
+    def load_tilset_from_file(self, file: Path | str, tilesize: int, cache_dir: Optional[Path | str] = None):
+        """
+        Add the non empty tiles of a tileset image, named after their coordinates on it (see `load_tileset`).
+        """
+        self.tileset.update(load_tileset(file, tilesize, cache_dir))
 
-                tile_rect = pg.Rect((px, py), (tilesize, tilesize))
+    def save_tiles(self, file: Path | str):
+        """
+        Write every tile into a tilemap file, which can later be streamed with `stream_tiles_from`.
+        """
+        write_tilemap_file(file, self._tiles)
 
-                current_tile = pg.Surface((tilesize, tilesize), pg.SRCALPHA)
-                current_tile.blit(tilset_image, (0, 0), tile_rect)
+    def stream_tiles_from(self, file: Path | str, max_loaded_chunks: int = 1024):
+        """
+        Replace the tiles of the tilemap with the ones streamed from a tilemap file (see `StreamedTileStorage`).
+        """
+        storage = StreamedTileStorage(file, max_loaded_chunks)
+        chunk_size = storage.chunk_size
 
-                if msk.overlap(pg.mask.from_surface(current_tile), (0, 0)):
-                    self.tileset[tile_coords] = current_tile
+        previous_chunks = list(self._tiles.iter_occupied_chunks(chunk_size))
+        self._tiles.close()
+        self._tiles = storage
+
+        self.invalidate_chunks()
+        for chunk_x, chunk_y in previous_chunks:
+            self._on_tiles_changed(pg.Rect(chunk_x * chunk_size, chunk_y * chunk_size, chunk_size, chunk_size))
+
+    def _get_tile_region(self, world_center: Coordinate, half_size: tuple[float, float]) -> pg.Rect:
+        """
+        Return the region of the tiles within `stream_radius` tiles of a world space area.
+        """
+        tile_size, radius = self.tile_size, self.stream_radius
+
+        left = int((world_center[0] - half_size[0]) // tile_size) - radius
+        top = int((world_center[1] - half_size[1]) // tile_size) - radius
+        right = int((world_center[0] + half_size[0]) // tile_size) + radius + 1
+        bottom = int((world_center[1] + half_size[1]) // tile_size) + radius + 1
+
+        return pg.Rect(left, top, right - left, bottom - top)
+
+    def update(self):
+        camera_area = self.camera.area
+        self._tiles.request_region(self._get_tile_region(camera_area.center, (camera_area.w / 2, camera_area.h / 2)))
+
+        for interest in self.stream_interests:
+            if not interest.is_destroyed:
+                self._tiles.request_region(self._get_tile_region(interest.position, (0, 0)))
+
+        for region in self._tiles.poll():
+            self._on_tiles_changed(region)
+
+    def on_destroy(self):
+        self._tiles.close()
+
+    def _on_tiles_changed(self, region: pg.Rect):
+        chunk_size, chunk_surfaces = self.chunk_size, self._chunk_surfaces
+
+        for chunk_y in range(region.top // chunk_size, (region.bottom - 1) // chunk_size + 1):
+            for chunk_x in range(region.left // chunk_size, (region.right - 1) // chunk_size + 1):
+                chunk_surfaces.pop((chunk_x, chunk_y), None)
+
+        for listener in self._tile_listeners:
+            listener(region)
 
     def set_tile(self, coords: Coordinate, tile_name: TilenameType | None = None):
         int_coords = _coords_as_int_tuple(coords)
 
-        if tile_name is None:
-            if int_coords in self._tiles:
-                self._tiles.pop(int_coords)
-        else:
-            self._tiles[int_coords] = tile_name
+        if self._tiles.set(int_coords, tile_name):
+            self._on_tiles_changed(pg.Rect(int_coords, (1, 1)))
+
+    def fill_region(self, region: pg.Rect, tile_name: TilenameType | None = None):
+        """
+        Set (or clear, when `tile_name` is `None`) every tile in `region`, given in tile coordinates.
+        """
+        if region.width > 0 and region.height > 0:
+            self._tiles.fill_region(region, tile_name)
+            self._on_tiles_changed(region)
+
+    def set_tiles(self, topleft: Coordinate, indices: Any):
+        """
+        Set the tiles of a whole region at once, from a 2D array (rows first) of palette indices, starting at `topleft`.
+        Index 0 clears a tile, and the indices of tile names are given by `get_palette_index`.
+        """
+        rows = len(indices)
+        columns = len(indices[0]) if rows else 0
+
+        if rows and columns:
+            int_coords = _coords_as_int_tuple(topleft)
+
+            self._tiles.set_tiles(int_coords, indices)
+            self._on_tiles_changed(pg.Rect(int_coords, (columns, rows)))
+
+    def get_palette_index(self, tile_name: TilenameType | None) -> int:
+        return self._tiles.get_palette_index(tile_name)
 
     def clear_tile(self, coords: Coordinate):
         self.set_tile(coords, None)
 
     def has_tile_at(self, coords: Coordinate) -> bool:
-        return _coords_as_int_tuple(coords) in self._tiles
+        return self._tiles.get(_coords_as_int_tuple(coords)) is not None
 
     def get_tile_at(self, coords: Coordinate) -> TilenameType | None:
         coords_tup = _coords_as_int_tuple(coords)
-        return self._tiles.get(coords_tup, None)
+        return self._tiles.get(coords_tup)
+
+    def iter_tiles(self) -> Iterator[tuple[tuple[int, int], TilenameType]]:
+        """
+        Yields the coordinates and name of every tile set on the tilemap.
+        """
+        yield from self._tiles.iter_tiles()
+
+    def iter_tiles_in_region(self, region: pg.Rect) -> Iterator[tuple[tuple[int, int], TilenameType]]:
+        """
+        Yields the coordinates and name of every tile set in `region` (in tile coordinates), row by row.
+        """
+        yield from self._tiles.iter_region(region)
+
+    def count_tiles_in_region(self, region: pg.Rect) -> int:
+        return self._tiles.count_region(region)
+
+    def iter_occupied_chunks(self, chunk_size: int) -> Iterator[tuple[int, int]]:
+        """
+        Yields the coordinates of every chunk of `chunk_size`x`chunk_size` tiles with any tile in it.
+        """
+        yield from self._tiles.iter_occupied_chunks(chunk_size)
 
     def world_coords_of_tile(self, coords: Coordinate):
         """
@@ -88,31 +216,72 @@ class TilemapRenderer(Component):
                 )
                 self.tileset[tile_name] = pg.transform.scale(surface, (self.tile_size, self.tile_size))
 
+    def invalidate_chunks(self):
+        """
+        Re-bake every chunk before it's drawn again, e.g after surfaces of the tileset were modified.
+        """
+        self._chunk_surfaces.clear()
+
+    def _bake_chunk(self, chunk: tuple[int, int]) -> Optional[pg.Surface]:
+        chunk_size, tile_size = self.chunk_size, self.tile_size
+        first_x, first_y = chunk[0] * chunk_size, chunk[1] * chunk_size
+
+        chunk_surface: Optional[pg.Surface] = None
+
+        for (x, y), tile_image_name in self._tiles.iter_region(pg.Rect(first_x, first_y, chunk_size, chunk_size)):
+            if chunk_surface is None:
+                chunk_surface = pg.Surface((chunk_size * tile_size, chunk_size * tile_size), pg.SRCALPHA)
+
+            tile_image = self.tileset[tile_image_name]
+            tile_pos = (x - first_x) * tile_size, (y - first_y) * tile_size
+
+            # The chunk starts out transparent, so taking the max copies per pixel alpha as is
+            # instead of blending it twice (into the chunk, and then into the frame).
+            if tile_image.get_flags() & pg.SRCALPHA:
+                chunk_surface.blit(tile_image, tile_pos, special_flags=pg.BLEND_RGBA_MAX)
+            else:
+                chunk_surface.blit(tile_image, tile_pos)
+
+            if self.draw_grid:
+                pg.draw.rect(chunk_surface, "black", pg.Rect(tile_pos, tile_image.size), 1)
+
+        return chunk_surface
+
     def render(self):
+        settings = (self.tile_size, self.chunk_size, self.draw_grid)
+        if settings != self._baked_settings:
+            self.invalidate_chunks()
+            self._baked_settings = settings
+
         camera = self.game.camera
-        visible_world_area = camera.area
-        topleft, bottomright = (
-            visible_world_area.topleft,
-            visible_world_area.bottomright,
-        )
+        visible_world_area = camera.get_layer_area(self.layer)
+        chunk_world_size = self.chunk_size * self.tile_size
 
-        topleft_tile_x, topleft_tile_y = (
-            int(topleft[0] // self.tile_size),
-            int(topleft[1] // self.tile_size),
+        first_chunk_x, first_chunk_y = (
+            int(visible_world_area.left // chunk_world_size),
+            int(visible_world_area.top // chunk_world_size),
         )
-        bottomright_tile_x, bottomright_tile_y = (
-            int((bottomright[0] + self.tile_size - 1) // self.tile_size),
-            int((bottomright[1] + self.tile_size - 1) // self.tile_size),
+        last_chunk_x, last_chunk_y = (
+            int((visible_world_area.right - 1) // chunk_world_size),
+            int((visible_world_area.bottom - 1) // chunk_world_size),
         )
 
-        for y in range(topleft_tile_y, bottomright_tile_y):
-            for x in range(topleft_tile_x, bottomright_tile_x):
-                if tile_image_name := self._tiles.get((x, y), None):
-                    tile_image = self.tileset[tile_image_name]
+        chunk_surfaces = self._chunk_surfaces
+
+        for chunk_y in range(first_chunk_y, last_chunk_y + 1):
+            for chunk_x in range(first_chunk_x, last_chunk_x + 1):
+                chunk = chunk_x, chunk_y
+                chunk_surface = chunk_surfaces.get(chunk, None)
+
+                if chunk_surface is not None:
+                    chunk_surfaces.move_to_end(chunk)
+                else:
+                    chunk_surface = self._bake_chunk(chunk)
+                    if chunk_surface is None:
+                        continue
 
-                    tile_world_pos = self.world_coords_of_tile((x, y))
-                    camera.blit(tile_image, tile_world_pos, layer=self.layer)
+                    chunk_surfaces[chunk] = chunk_surface
+                    if len(chunk_surfaces) > self.max_baked_chunks:
+                        chunk_surfaces.popitem(last=False)
 
-                    if self.draw_grid:
-                        tile_rect = pg.Rect(tile_world_pos, (tile_image.size))
-                        camera.draw_rect(tile_rect, "black", 1, layer=self.layer)
+                camera.blit(chunk_surface, (chunk_x * chunk_world_size, chunk_y * chunk_world_size), layer=self.layer)
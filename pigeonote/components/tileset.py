@@ -0,0 +1,154 @@
+import hashlib
+import io
+import json
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Optional
+
+import pygame as pg
+
+from pigeonote.utils import np
+
+# magic, version, tile size, atlas columns, atlas rows, index length (in bytes).
+_ATLAS_HEADER = struct.Struct("<4sHHIII")
+_ATLAS_MAGIC = b"PNTA"
+_ATLAS_VERSION = 1
+
+# Same as the default threshold of `pg.mask.from_surface`.
+_ALPHA_THRESHOLD = 127
+
+
+def _find_solid_tiles(sheet: pg.Surface, tilesize: int) -> list[tuple[int, int]]:
+    """
+    Return the coordinates of the tiles of `sheet` which have at least one pixel more opaque than the threshold.
+    """
+    columns, rows = math.ceil(sheet.width / tilesize), math.ceil(sheet.height / tilesize)
+
+    if np is None:
+        sheet_mask = pg.mask.from_surface(sheet, _ALPHA_THRESHOLD)
+        tile_mask = pg.Mask((tilesize, tilesize), fill=True)
+
+        return [
+            (x, y)
+            for x in range(columns)
+            for y in range(rows)
+            if sheet_mask.overlap(tile_mask, (x * tilesize, y * tilesize)) is not None
+        ]
+
+    # Pad the alpha to whole tiles, and then take the most opaque pixel of every tile at once.
+    alpha = np.zeros((columns * tilesize, rows * tilesize), dtype=np.uint8)
+    alpha[: sheet.width, : sheet.height] = pg.surfarray.pixels_alpha(sheet)
+
+    solid = alpha.reshape(columns, tilesize, rows, tilesize).max(axis=(1, 3)) > _ALPHA_THRESHOLD
+    xs, ys = np.nonzero(solid)
+
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+def _get_tile(sheet: pg.Surface, rect: pg.Rect) -> pg.Surface:
+    if sheet.get_rect().contains(rect):
+        return sheet.subsurface(rect)
+
+    # Tiles cut by the edge of the sheet are padded with transparent pixels.
+    tile = pg.Surface(rect.size, pg.SRCALPHA)
+    tile.blit(sheet, (0, 0), rect)
+    return tile
+
+
+def slice_tileset(sheet: pg.Surface, tilesize: int) -> dict[tuple[int, int], pg.Surface]:
+    """
+    Cut `sheet` into `tilesize`x`tilesize` tiles, keyed by their coordinates on the sheet, skipping empty tiles.
+
+    The tiles are subsurfaces of the sheet, so they share its pixels.
+    """
+    return {
+        (x, y): _get_tile(sheet, pg.Rect(x * tilesize, y * tilesize, tilesize, tilesize))
+        for x, y in _find_solid_tiles(sheet, tilesize)
+    }
+
+
+def _write_atlas(path: Path, tiles: dict[tuple[int, int], pg.Surface], tilesize: int):
+    """
+    Pack `tiles` into a single atlas, and write its raw pixels along with the coordinates of every tile.
+    """
+    columns = max(1, math.ceil(math.sqrt(len(tiles))))
+    rows = math.ceil(len(tiles) / columns)
+
+    atlas = pg.Surface((columns * tilesize, rows * tilesize), pg.SRCALPHA)
+    atlas.fblits(
+        [(tile, ((i % columns) * tilesize, (i // columns) * tilesize)) for i, tile in enumerate(tiles.values())]
+    )
+
+    index = json.dumps(list(tiles)).encode("utf-8")
+    temporary_path = Path(f"{path}.tmp")
+
+    with open(temporary_path, "wb") as file:
+        file.write(_ATLAS_HEADER.pack(_ATLAS_MAGIC, _ATLAS_VERSION, tilesize, columns, rows, len(index)))
+        file.write(index)
+        file.write(pg.image.tobytes(atlas, "RGBA"))
+
+    os.replace(temporary_path, path)
+
+
+def _read_atlas(path: Path, tilesize: int) -> Optional[dict[tuple[int, int], pg.Surface]]:
+    """
+    Read the tiles of a baked atlas, or return `None` if the atlas is missing or unreadable.
+    """
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+
+    if len(data) < _ATLAS_HEADER.size:
+        return None
+
+    magic, version, atlas_tilesize, columns, rows, index_length = _ATLAS_HEADER.unpack_from(data)
+    if magic != _ATLAS_MAGIC or version != _ATLAS_VERSION or atlas_tilesize != tilesize:
+        return None
+
+    pixels_offset = _ATLAS_HEADER.size + index_length
+    size = columns * tilesize, rows * tilesize
+
+    if len(data) != pixels_offset + size[0] * size[1] * 4:
+        return None
+
+    index = json.loads(data[_ATLAS_HEADER.size : pixels_offset].decode("utf-8"))
+    if not index:
+        return {}
+
+    atlas = pg.image.frombytes(data[pixels_offset:], size, "RGBA").convert_alpha()
+
+    return {
+        (x, y): atlas.subsurface(((i % columns) * tilesize, (i // columns) * tilesize, tilesize, tilesize))
+        for i, (x, y) in enumerate(index)
+    }
+
+
+def load_tileset(
+    file: Path | str, tilesize: int, cache_dir: Optional[Path | str] = None
+) -> dict[tuple[int, int], pg.Surface]:
+    """
+    Load a tileset image and slice it with `slice_tileset`.
+
+    When `cache_dir` is given, the non empty tiles are baked into an atlas in it, keyed by the hash of the file and
+    the tile size, so loading the same tileset again reads the atlas instead of decoding and slicing the image.
+    """
+    data = Path(file).read_bytes()
+
+    if cache_dir is None:
+        return slice_tileset(pg.image.load(io.BytesIO(data), str(file)).convert_alpha(), tilesize)
+
+    atlas_path = Path(cache_dir) / f"{hashlib.sha1(data).hexdigest()}-{tilesize}.atlas"
+
+    tiles = _read_atlas(atlas_path, tilesize)
+    if tiles is not None:
+        return tiles
+
+    tiles = slice_tileset(pg.image.load(io.BytesIO(data), str(file)).convert_alpha(), tilesize)
+
+    atlas_path.parent.mkdir(parents=True, exist_ok=True)
+    _write_atlas(atlas_path, tiles, tilesize)
+
+    return tiles
@@ -1,4 +1,5 @@
 from .component import Component
+from .component_event import ComponentEvent
 from .entity import Entity
 from .service import Service
-from .physics import Collider, Physics
\ No newline at end of file
+from .physics import BodyType, Collider, Physics, Ray, RaycastHit, ALL_LAYERS, MAX_COLLISION_LAYERS
\ No newline at end of file
@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class ComponentEvent(Enum):
+    """
+    Events components listen to by defining a method with the name of the event.
+    Entities resolve their listeners once, when components are created or destroyed.
+    """
+
+    COLLISION_ENTER = "on_collision_enter"
+    COLLISION_EXIT = "on_collision_exit"
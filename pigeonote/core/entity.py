@@ -1,5 +1,5 @@
-from typing import TYPE_CHECKING, Iterator, Optional, TypeVar
-from pigeonote.core import Component
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, TypeVar
+from pigeonote.core import Component, ComponentEvent
 from pigeonote.types import Coordinate, get_coords_as_vector2
 
 if TYPE_CHECKING:
@@ -18,11 +18,19 @@ class Entity:
 
         self._position = get_coords_as_vector2(position)
         self._rotation = 0
+        self._position_listeners = list[Callable[[], None]]()
+
+        # The position the listeners were last notified about, to notice changes made to the position in place.
+        self._notified_position = self._position.x, self._position.y
 
         self._components = list[Component]()
         self._components_destroyed = list[Component]()
         self._next_component_id = 0
 
+        # The components defining a handler for each event, kept up to date as components come and go.
+        self._event_listeners = {event: list[Component]() for event in ComponentEvent}
+        self._event_listeners_callbacks = list[Callable[[], None]]()
+
         self._game = game
         self._is_destroyed = False
 
@@ -40,6 +48,11 @@ class Entity:
 
     @property
     def position(self):
+        """
+        Assigning a new position (e.g `entity.position += (1, 0)`) lets the colliders of the entity know right away
+        that it moved. Changes made in place (e.g `entity.position.x += 1`) are only noticed once per frame,
+        after components are updated (see `internal_notify_moved_in_place`).
+        """
         return self._position
 
     @property
@@ -49,6 +62,72 @@ class Entity:
     @position.setter
     def position(self, new_topleft: Coordinate):
         self._position = get_coords_as_vector2(new_topleft)
+        self._notified_position = self._position.x, self._position.y
+
+        for listener in self._position_listeners:
+            listener()
+
+    def internal_notify_moved_in_place(self):
+        """
+        Notify the position listeners if the position was changed in place since they were last notified.
+        """
+        if not self._position_listeners:
+            return
+
+        position = self._position
+        if (position.x, position.y) != self._notified_position:
+            self._notified_position = position.x, position.y
+
+            for listener in self._position_listeners:
+                listener()
+
+    def add_position_listener(self, listener: Callable[[], None]):
+        """
+        Register `listener` to be called every time the position of this entity is set.
+        """
+        self._position_listeners.append(listener)
+
+    def remove_position_listener(self, listener: Callable[[], None]):
+        if listener in self._position_listeners:
+            self._position_listeners.remove(listener)
+
+    def get_event_listeners(self, event: ComponentEvent) -> list[Component]:
+        """
+        Return the components of this entity which listen to `event`.
+
+        Note
+        ----
+        The returned list is shared, don't modify it.
+        """
+        return self._event_listeners[event]
+
+    def add_event_listeners_callback(self, callback: Callable[[], None]):
+        """
+        Register `callback` to be called every time the listeners of any event on this entity change.
+        """
+        self._event_listeners_callbacks.append(callback)
+
+    def remove_event_listeners_callback(self, callback: Callable[[], None]):
+        if callback in self._event_listeners_callbacks:
+            self._event_listeners_callbacks.remove(callback)
+
+    def _update_event_listeners(self, component: Component, is_listening: bool):
+        changed = False
+
+        # The lists are replaced rather than modified, so components can be created or destroyed
+        # by a handler while the listeners of its event are being iterated.
+        for event, listeners in self._event_listeners.items():
+            if is_listening and callable(getattr(component, event.value, None)):
+                self._event_listeners[event] = [*listeners, component]
+                changed = True
+
+            elif not is_listening and component in listeners:
+                self._event_listeners[event] = [c for c in listeners if c is not component]
+                changed = True
+
+        if changed:
+            for callback in self._event_listeners_callbacks:
+                callback()
 
     @property
     def rotation(self):
@@ -94,10 +173,12 @@ class Entity:
         self._next_component_id += 1
 
         self._components.append(created_component_insance)
+        self._update_event_listeners(created_component_insance, is_listening=True)
         return created_component_insance
 
     def destroy_component(self, component: Component):
         self._components_destroyed.append(component)
+        self._update_event_listeners(component, is_listening=False)
 
     def get_components(self) -> Iterator[Component]:
         """
@@ -144,6 +225,8 @@ class Entity:
         # Clear possibly lingering references and set destroyed flag to True.
         self._components.clear()
         self._components_destroyed.clear()
+        self._event_listeners = {event: list[Component]() for event in ComponentEvent}
+
         self._is_destroyed = True
 
         self._game.destroy(self)
@@ -1,2 +1,4 @@
-from .collider import Collider
+from .body_type import BodyType
+from .queries import Ray, RaycastHit
+from .collider import Collider, ALL_LAYERS, MAX_COLLISION_LAYERS
 from .physics import Physics
@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+class BodyType(Enum):
+    STATIC = 0
+    """
+    Never expected to move, e.g walls. Static colliders are never tested against each other.
+    """
+
+    KINEMATIC = 1
+    """
+    Moved by game code, e.g moving platforms. Like dynamic colliders, it falls asleep after it hasn't moved for a while.
+    """
+
+    DYNAMIC = 2
+    """
+    Moves around, and falls asleep after it hasn't moved for a while.
+    """
@@ -1,77 +1,232 @@
 from abc import ABCMeta, abstractmethod
+from typing import TYPE_CHECKING, Hashable, Optional
 
 from pygame import Rect, Vector2
 
-from pigeonote.core import Component
+from pigeonote.core import Component, ComponentEvent
+from pigeonote.core.physics.body_type import BodyType
+from pigeonote.core.physics.queries import RaycastHit, circle_overlaps_rect, expand_rect, intersect_ray_rect
+from pigeonote.types import AnyRect, Coordinate, get_coords_as_vector2
+
+if TYPE_CHECKING:
+    from pigeonote import Entity
+
+MAX_COLLISION_LAYERS = 32
+ALL_LAYERS = (1 << MAX_COLLISION_LAYERS) - 1
 
 
 class Collider(Component, metaclass=ABCMeta):
-    offset: Vector2 = Vector2(0, 0)
+    # Compound colliders are made of many parts, which are placed in the physics broadphase separately.
+    is_compound = False
+
+    # Whether the collider is exactly its bounds, so overlaps with it can be decided from the bounds alone.
+    is_aabb = False
+
+    _offset: Vector2 = Vector2(0, 0)
+
+    _body_type: BodyType = BodyType.DYNAMIC
+    _layer: int = 0
+    _mask: int = ALL_LAYERS
+
+    def __init__(self, component_id: int, parent: "Entity") -> None:
+        super().__init__(component_id, parent)
+
+        # World space bounds, recomputed only after the entity moves or the shape of the collider changes.
+        self._bounds: Rect | None = None
+        self._bounds_dirty = True
+
+        self.entity.add_position_listener(self.mark_bounds_dirty)
+        self.entity.add_event_listeners_callback(self._on_event_listeners_changed)
 
     @property
-    def collider_position(self):
-        return self.position + self.offset
+    def offset(self):
+        """
+        Offset of the collider from the position of its entity.
+        This is a copy, so assign a new offset to change it.
+        """
+        return self._offset.copy()
+
+    @offset.setter
+    def offset(self, new_offset: Coordinate):
+        self._offset = get_coords_as_vector2(new_offset)
+        self.mark_bounds_dirty()
 
-    def _get_components_with_enter_trigger(self):
-        return [c for c in self.entity.get_components() if c is not self and hasattr(c, "on_collision_enter")]
+    @property
+    def collider_position(self):
+        return self.position + self._offset
 
-    def _get_components_with_exit_trigger(self):
-        return [c for c in self.entity.get_components() if c is not self and hasattr(c, "on_collision_exit")]
+    @property
+    def body_type(self):
+        return self._body_type
 
-    def _fire_on_collision_enter(self, components: list[Component], others: list["Collider"]):
-        for c in components:
-            for o in others:
-                getattr(c, "on_collision_enter")(o)
+    @body_type.setter
+    def body_type(self, new_body_type: BodyType):
+        self._body_type = new_body_type
 
-    def _fire_on_collision_exit(self, components: list[Component], others: list["Collider"]):
-        for c in components:
-            for o in others:
-                getattr(c, "on_collision_exit")(o)
+        # The physics decides whether a collider is awake when it moves, so treat it as if it did.
+        self.mark_bounds_dirty()
 
-    def init(self):
-        from pigeonote.core.physics import Physics
+    @property
+    def layer(self):
+        """
+        The index of the collision layer this collider is on, between 0 and `MAX_COLLISION_LAYERS - 1`.
+        """
+        return self._layer
 
-        self._PHYSICS = Physics.get_instance()
-        self._PHYSICS.internal_add_collider(self)
+    @layer.setter
+    def layer(self, new_layer: int):
+        if not 0 <= new_layer < MAX_COLLISION_LAYERS:
+            raise ValueError(f"Collision layer must be between 0 and {MAX_COLLISION_LAYERS - 1}, got {new_layer}.")
 
-        self._current_collisions = set[Collider]()
+        self._layer = new_layer
+        self.mark_bounds_dirty()
 
-    def update(self):
-        components_registered_for_enter = self._get_components_with_enter_trigger()
-        components_registered_for_exit = self._get_components_with_exit_trigger()
+    @property
+    def mask(self):
+        """
+        Bitmask of the layers this collider collides with, e.g `(1 << WALLS) | (1 << PLAYERS)`.
+        """
+        return self._mask
 
-        if not components_registered_for_enter and not components_registered_for_exit:
-            return
+    @mask.setter
+    def mask(self, new_mask: int):
+        self._mask = new_mask & ALL_LAYERS
+        self.mark_bounds_dirty()
 
-        frame_collisions = set(self._PHYSICS.internal_check_collisions(self))
+    @property
+    def is_sleeping(self):
+        return self._is_init and self._PHYSICS.internal_is_collider_sleeping(self)
+
+    def wake_up(self):
+        self.mark_bounds_dirty()
+
+    def _compute_bounds(self) -> Rect | None:
+        """
+        Return the world space bounding rectangle of this collider.
+        `None` means the collider isn't bounded, and it will be checked against every query.
+        """
+        return None
+
+    def get_bounds(self) -> Rect | None:
+        """
+        Return the cached world space bounds of this collider, used by the physics broadphase.
+
+        Note
+        ----
+        The returned rect is shared, don't modify it.
+        """
+        if self._bounds_dirty:
+            self._bounds = self._compute_bounds()
+            self._bounds_dirty = False
+
+        return self._bounds
+
+    def get_broadphase_parts(self) -> dict[Hashable, Rect]:
+        """
+        Return the world space bounds of every part of a compound collider, keyed by a stable part key.
+        """
+        return {}
+
+    def internal_pop_changed_parts(self) -> dict[Hashable, Optional[Rect]]:
+        """
+        Return the parts of a compound collider which changed since the last call, with `None` for removed parts.
+        """
+        return {}
+
+    def mark_bounds_dirty(self):
+        """
+        Invalidate the cached bounds of this collider, and notify the physics that they have changed.
+        """
+        self._bounds_dirty = True
+
+        if self._is_init:
+            self._PHYSICS.internal_mark_collider_dirty(self)
+
+    def _on_event_listeners_changed(self):
+        if self._is_init:
+            self._PHYSICS.internal_update_collider_listening(self)
 
-        exited_colliders = list[Collider]()
+    def init(self):
+        from pigeonote.core.physics import Physics
 
-        for other in self._current_collisions:
-            if other not in frame_collisions:
-                exited_colliders.append(other)
+        self._PHYSICS = Physics.get_instance()
+        self._PHYSICS.internal_add_collider(self)
 
-        self._fire_on_collision_exit(components=components_registered_for_exit, others=exited_colliders)
+    def internal_has_collision_listeners(self):
+        entity = self.entity
 
-        for removed_collider in exited_colliders:
-            self._current_collisions.remove(removed_collider)
+        for event in (ComponentEvent.COLLISION_ENTER, ComponentEvent.COLLISION_EXIT):
+            for component in entity.get_event_listeners(event):
+                if component is not self:
+                    return True
 
-        entered_colliders = list[Collider]()
+        return False
 
-        for other in frame_collisions:
-            if other not in self._current_collisions:
-                self._current_collisions.add(other)
-                entered_colliders.append(other)
+    def internal_fire_collision_events(self, entered: list["Collider"], exited: list["Collider"]):
+        """
+        Called by the physics once per frame, with every collider this collider started and stopped touching.
+        """
+        if exited:
+            for component in self.entity.get_event_listeners(ComponentEvent.COLLISION_EXIT):
+                if component is not self:
+                    for other in exited:
+                        component.on_collision_exit(other)
 
-        self._fire_on_collision_enter(components_registered_for_enter, others=entered_colliders)
+        if entered:
+            for component in self.entity.get_event_listeners(ComponentEvent.COLLISION_ENTER):
+                if component is not self:
+                    for other in entered:
+                        component.on_collision_enter(other)
 
     def on_destroy(self):
-        self._PHYSICS.internal_remove_collider(self)
+        self.entity.remove_position_listener(self.mark_bounds_dirty)
+        self.entity.remove_event_listeners_callback(self._on_event_listeners_changed)
+
+        if self._is_init:
+            self._PHYSICS.internal_remove_collider(self)
 
     @abstractmethod
     def check_rect_overlap(self, rect: Rect):
         pass
 
-    # @abstractmethod
-    # def check_circle_overlap(self):
-    #     pass
+    # The queries below treat the collider as its bounds. Colliders with a finer shape should override them.
+
+    def check_point_overlap(self, point: Vector2) -> bool:
+        bounds = self.get_bounds()
+        return bounds is not None and bounds.collidepoint(point)
+
+    def check_circle_overlap(self, center: Vector2, radius: float) -> bool:
+        bounds = self.get_bounds()
+        return bounds is not None and circle_overlaps_rect(center, radius, bounds)
+
+    def raycast(self, origin: Vector2, direction: Vector2, max_distance: float) -> Optional[RaycastHit]:
+        """
+        Return where a ray starting at `origin` along the normalized `direction` first hits this collider,
+        if it does so within `max_distance`.
+        """
+        bounds = self.get_bounds()
+        if bounds is None:
+            return None
+
+        return self._raycast_rect(origin, direction, bounds, max_distance)
+
+    def sweep_rect(self, rect: AnyRect, direction: Vector2, max_distance: float) -> Optional[RaycastHit]:
+        """
+        Return where `rect`, moving along the normalized `direction`, first touches this collider,
+        if it does so within `max_distance`.
+        """
+        bounds = self.get_bounds()
+        if bounds is None:
+            return None
+
+        return self._raycast_rect(Vector2(rect.center), direction, expand_rect(bounds, rect.size), max_distance)
+
+    def _raycast_rect(
+        self, origin: Vector2, direction: Vector2, rect: AnyRect, max_distance: float
+    ) -> Optional[RaycastHit]:
+        intersection = intersect_ray_rect(origin, direction, rect, max_distance)
+        if intersection is None:
+            return None
+
+        distance, normal = intersection
+        return RaycastHit(collider=self, point=origin + direction * distance, normal=normal, distance=distance)
@@ -0,0 +1,157 @@
+from array import array
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from pygame import FRect
+
+from pigeonote.types import AnyRect
+
+if TYPE_CHECKING:
+    from pigeonote.core.physics import Collider
+
+
+class ColliderHistory:
+    """
+    A ring buffer of the bounds every tracked collider had during each of the last `length` physics ticks.
+
+    Each tick is a row of flat arrays, with a slot per collider, so memory only depends on `length`
+    and the number of colliders alive at once. Recording a tick copies the previous row and then
+    only overwrites the slots of colliders which moved.
+    """
+
+    def __init__(self, length: int, capacity: int = 64) -> None:
+        if length < 1:
+            raise ValueError(f"History length must be at least 1 tick (got {length}).")
+
+        self._length = length
+        self._capacity = capacity
+
+        self._row_ticks = array("q", [-1]) * length
+        self._last_row = -1
+
+        # Row `r`, slot `s` has its bounds at `_bounds[(r * capacity + s) * 4:][:4]`, and the ID
+        # of the collider which was in the slot at `_ids[r * capacity + s]` (-1 for an empty slot).
+        self._bounds = array("d", [0.0]) * (length * capacity * 4)
+        self._ids = array("q", [-1]) * (length * capacity)
+
+        self._slots = dict["Collider", int]()
+        self._slot_colliders = list[Optional["Collider"]]()
+        self._slot_ids = list[int]()
+
+        # Slots of removed colliders are only reused once they were cleared in a recorded tick.
+        self._released_slots = list[int]()
+        self._free_slots = list[int]()
+
+    @property
+    def length(self):
+        return self._length
+
+    def __contains__(self, collider: "Collider"):
+        return collider in self._slots
+
+    def has_tick(self, tick: int) -> bool:
+        return tick >= 0 and self._row_ticks[tick % self._length] == tick
+
+    def oldest_tick(self) -> Optional[int]:
+        recorded = [tick for tick in self._row_ticks if tick >= 0]
+        return min(recorded) if recorded else None
+
+    def _grow(self):
+        old_capacity, capacity = self._capacity, self._capacity * 2
+
+        bounds = array("d", [0.0]) * (self._length * capacity * 4)
+        ids = array("q", [-1]) * (self._length * capacity)
+
+        for row in range(self._length):
+            bounds[row * capacity * 4 : (row * capacity + old_capacity) * 4] = self._bounds[
+                row * old_capacity * 4 : (row + 1) * old_capacity * 4
+            ]
+            ids[row * capacity : row * capacity + old_capacity] = self._ids[
+                row * old_capacity : (row + 1) * old_capacity
+            ]
+
+        self._bounds, self._ids, self._capacity = bounds, ids, capacity
+
+    def _allocate_slot(self, collider: "Collider", collider_id: int) -> int:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._slot_colliders[slot] = collider
+            self._slot_ids[slot] = collider_id
+
+        else:
+            slot = len(self._slot_colliders)
+            if slot == self._capacity:
+                self._grow()
+
+            self._slot_colliders.append(collider)
+            self._slot_ids.append(collider_id)
+
+        self._slots[collider] = slot
+        return slot
+
+    def remove(self, collider: "Collider"):
+        slot = self._slots.pop(collider, None)
+        if slot is None:
+            return
+
+        self._slot_colliders[slot] = None
+        self._slot_ids[slot] = -1
+        self._released_slots.append(slot)
+
+    def record(self, tick: int, moved: Iterable[tuple["Collider", int, AnyRect]]):
+        """
+        Record the bounds of every tracked collider at `tick`, given the colliders which moved since the previous tick
+        along with their IDs and new bounds. Colliders seen for the first time start being tracked.
+        """
+        row = tick % self._length
+        capacity = self._capacity
+
+        if self._last_row >= 0 and self._last_row != row:
+            last = self._last_row * capacity
+            self._bounds[row * capacity * 4 : (row + 1) * capacity * 4] = self._bounds[last * 4 : (last + capacity) * 4]
+            self._ids[row * capacity : (row + 1) * capacity] = self._ids[last : last + capacity]
+
+        for slot in self._released_slots:
+            self._ids[row * capacity + slot] = -1
+
+        self._free_slots.extend(self._released_slots)
+        self._released_slots.clear()
+
+        slots, ids, all_bounds = self._slots, self._ids, self._bounds
+
+        for collider, collider_id, bounds in moved:
+            slot = slots.get(collider, None)
+            if slot is None:
+                slot = self._allocate_slot(collider, collider_id)
+
+                # Growing changes the layout of every row.
+                capacity, ids, all_bounds = self._capacity, self._ids, self._bounds
+
+            index = row * capacity + slot
+            ids[index] = collider_id
+
+            index *= 4
+            all_bounds[index] = bounds.left
+            all_bounds[index + 1] = bounds.top
+            all_bounds[index + 2] = bounds.width
+            all_bounds[index + 3] = bounds.height
+
+        self._row_ticks[row] = tick
+        self._last_row = row
+
+    def iter_bounds(self, tick: int) -> Iterator[tuple["Collider", FRect]]:
+        """
+        Yield every collider which was tracked at `tick` and still exists, along with its bounds back then.
+        """
+        if not self.has_tick(tick):
+            raise LookupError(f"Tick {tick} isn't in the collider history.")
+
+        start = (tick % self._length) * self._capacity
+        ids, bounds = self._ids, self._bounds
+
+        for slot, collider in enumerate(self._slot_colliders):
+            # A different ID means the collider from back then was since removed, and its slot reused.
+            if collider is None or ids[start + slot] != self._slot_ids[slot]:
+                continue
+
+            index = (start + slot) * 4
+            yield collider, FRect(bounds[index], bounds[index + 1], bounds[index + 2], bounds[index + 3])
@@ -1,35 +1,816 @@
-from pigeonote.core.physics import Collider
-from pygame import Rect
+import math
+from collections import defaultdict
+from typing import TYPE_CHECKING, Hashable, Iterable, Iterator, Optional
 
+from pigeonote.core.service import Service
+from pigeonote.core.physics import ALL_LAYERS, MAX_COLLISION_LAYERS, BodyType, Collider
+from pigeonote.core.physics.history import ColliderHistory
+from pigeonote.core.physics.queries import Ray, RaycastHit, intersect_ray_rect
+from pigeonote.core.physics.vectorized import VectorizedAABBs
+from pigeonote.types import AnyRect, Coordinate, get_coords_as_vector2
+from pygame import FRect, Rect, Vector2
 
-class Physics:
+if TYPE_CHECKING:
+    from pigeonote import Game
+
+CellRange = tuple[int, int, int, int]
+ContactPair = tuple[Collider, Collider]
+
+
+class Physics(Service):
     _instance: "Physics" = None
 
     @staticmethod
     def get_instance() -> "Physics":
         if Physics._instance is None:
-            Physics._instance = Physics()
+            from pigeonote import Game
+
+            Game.get_instance().create_service(Physics, name="physics")
 
         return Physics._instance
 
-    def __init__(self) -> None:
+    def __init__(self, name: str, game: "Game") -> None:
+        super().__init__(name, game)
+
+        assert Physics._instance is None
+        Physics._instance = self
+
+        self._cell_size = 64
+
+        # Dynamic and kinematic colliders which didn't move for this many physics steps fall asleep.
+        self.sleep_after_steps = 30
+
+        # Row `i` is the bitmask of the layers which layer `i` collides with. Always kept symmetric.
+        self._collision_matrix = [ALL_LAYERS] * MAX_COLLISION_LAYERS
+
         self._colliders = set[Collider]()
 
+        # Every collider gets an increasing ID, so each pair of colliders has a single canonical order.
+        self._collider_ids = dict[Collider, int]()
+        self._next_collider_id = 0
+
+        # Broadphase: a spatial hash of uniform cells, each holding the colliders whose bounds touch it.
+        # Colliders without bounds are kept aside, and are candidates for every query.
+        self._cells = defaultdict[tuple[int, int], set[Collider]](set)
+        self._collider_cells = dict[Collider, CellRange]()
+        self._unbounded_colliders = set[Collider]()
+        self._dirty_colliders = set[Collider]()
+
+        # Compound colliders (e.g. tilemaps) are bucketed part by part. A cell holds a compound collider
+        # for as long as any of its parts touches the cell, so the parts touching each cell are counted.
+        self._compound_colliders = set[Collider]()
+        self._compound_part_ranges = dict[Collider, dict[Hashable, CellRange]]()
+        self._compound_cell_refs = dict[Collider, dict[tuple[int, int], int]]()
+
+        # Cells in which compound colliders changed since the last step.
+        self._changed_cells = set[tuple[int, int]]()
+
+        # When enabled, overlaps between bounded colliders are found with numpy instead of the spatial hash.
+        self._vectorized: Optional[VectorizedAABBs] = None
+
+        # Colliders which moved since the last physics step. Colliders which neither moved nor are
+        # awake are "resting", and pairs of resting colliders are never tested.
+        self._moved_colliders = set[Collider]()
+        self._awake_colliders = set[Collider]()
+        self._last_moved_step = dict[Collider, int]()
+        self._step = 0
+
+        # Colliders on entities with components listening to their collision events.
+        self._listening_colliders = set[Collider]()
+
+        # The pairs of colliders which touched during the last physics step, out of the pairs with a listener.
+        self._contacts = set[ContactPair]()
+
+        # The bounds of colliders during the last ticks, for lag-compensated queries (see `rewind_query`).
+        # Only kept once `history_ticks` is set, e.g by a hosting `GameServer`.
+        self._history: Optional[ColliderHistory] = None
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    @cell_size.setter
+    def cell_size(self, new_cell_size: int):
+        self._cell_size = new_cell_size
+
+        # Every bucket is now wrong, so rebuild the hash from scratch on the next query.
+        self._cells.clear()
+        self._collider_cells.clear()
+        self._compound_part_ranges.clear()
+        self._compound_cell_refs.clear()
+        self._dirty_colliders.update(self._colliders)
+
+    @property
+    def vectorized(self):
+        """
+        Whether overlaps between bounded colliders are found with the vectorized (numpy) backend.
+        It pays off in scenes with thousands of moving colliders, and requires numpy.
+        """
+        return self._vectorized is not None
+
+    @vectorized.setter
+    def vectorized(self, enabled: bool):
+        if enabled == self.vectorized:
+            return
+
+        if not enabled:
+            self._vectorized = None
+            return
+
+        self._flush_dirty_colliders()
+        self._vectorized = VectorizedAABBs()
+
+        for collider in self._collider_cells:
+            self._vectorized.set(collider, collider.get_bounds(), self._collider_ids[collider])
+
+    @property
+    def tick(self):
+        """
+        The number of physics steps so far. Each step records the bounds of colliders under this tick.
+        """
+        return self._step
+
+    @property
+    def history_ticks(self):
+        """
+        How many past ticks `rewind_query` can look back at, or 0 when no history is kept.
+        """
+        return self._history.length if self._history is not None else 0
+
+    @history_ticks.setter
+    def history_ticks(self, ticks: int):
+        if ticks == self.history_ticks:
+            return
+
+        self._history = ColliderHistory(ticks) if ticks > 0 else None
+
+        # The new history starts out with every collider as it is now.
+        if self._history is not None:
+            self._record_history(self._colliders)
+
+    @property
+    def contacts(self) -> set[ContactPair]:
+        """
+        The pairs of colliders touching each other as of the last physics step, out of the pairs where at least one
+        collider is on an entity listening to its collision events (`on_collision_enter` or `on_collision_exit`).
+        Pairs nobody listens to are never tested, so use `check_rect_overlap` to find what touches any collider.
+        """
+        return self._contacts.copy()
+
+    def set_layers_collision(self, layer_a: int, layer_b: int, collide: bool):
+        """
+        Set whether colliders on `layer_a` and colliders on `layer_b` collide with each other.
+        """
+        if collide:
+            self._collision_matrix[layer_a] |= 1 << layer_b
+            self._collision_matrix[layer_b] |= 1 << layer_a
+        else:
+            self._collision_matrix[layer_a] &= ~(1 << layer_b)
+            self._collision_matrix[layer_b] &= ~(1 << layer_a)
+
+        # Contacts of resting colliders are carried over between steps, so they all have to be re-tested.
+        self._moved_colliders.update(self._colliders)
+
+    def do_layers_collide(self, layer_a: int, layer_b: int) -> bool:
+        return bool(self._collision_matrix[layer_a] & (1 << layer_b))
+
+    def _get_collision_mask(self, collider: Collider) -> int:
+        """
+        Return the bitmask of the layers `collider` may collide with, according to both its mask and the collision matrix.
+        """
+        return self._collision_matrix[collider.layer] & collider.mask
+
+    def _get_cell_range(self, rect: Rect) -> CellRange:
+        cell_size = self._cell_size
+
+        # `right` and `bottom` are exclusive, so a rect which ends exactly on a cell edge doesn't touch the next cell.
+        return (
+            int(rect.left // cell_size),
+            int(rect.top // cell_size),
+            int((rect.right - 1) // cell_size),
+            int((rect.bottom - 1) // cell_size),
+        )
+
+    def _insert_into_cells(self, collider: Collider, cell_range: CellRange):
+        x0, y0, x1, y1 = cell_range
+
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                self._cells[(cx, cy)].add(collider)
+
+    def _remove_from_cells(self, collider: Collider, cell_range: CellRange):
+        x0, y0, x1, y1 = cell_range
+
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                cell = self._cells[(cx, cy)]
+                cell.discard(collider)
+
+                if not cell:
+                    del self._cells[(cx, cy)]
+
+    def _rebucket_compound(self, collider: Collider):
+        if collider in self._compound_part_ranges:
+            changed_parts = collider.internal_pop_changed_parts()
+        else:
+            collider.internal_pop_changed_parts()
+            changed_parts = collider.get_broadphase_parts()
+
+        part_ranges = self._compound_part_ranges.setdefault(collider, {})
+        cell_refs = self._compound_cell_refs.setdefault(collider, {})
+
+        for part_key, part_rect in changed_parts.items():
+            previous_range = part_ranges.pop(part_key, None)
+            if previous_range is not None:
+                x0, y0, x1, y1 = previous_range
+
+                for cy in range(y0, y1 + 1):
+                    for cx in range(x0, x1 + 1):
+                        self._changed_cells.add((cx, cy))
+                        cell_refs[(cx, cy)] -= 1
+
+                        if cell_refs[(cx, cy)] == 0:
+                            del cell_refs[(cx, cy)]
+                            self._remove_from_cells(collider, (cx, cy, cx, cy))
+
+            if part_rect is not None:
+                new_range = part_ranges[part_key] = self._get_cell_range(part_rect)
+                x0, y0, x1, y1 = new_range
+
+                for cy in range(y0, y1 + 1):
+                    for cx in range(x0, x1 + 1):
+                        self._changed_cells.add((cx, cy))
+                        cell_refs[(cx, cy)] = cell_refs.get((cx, cy), 0) + 1
+                        self._cells[(cx, cy)].add(collider)
+
+    def _rebucket(self, collider: Collider):
+        if collider.is_compound:
+            self._compound_colliders.add(collider)
+            self._rebucket_compound(collider)
+            return
+
+        bounds = collider.get_bounds()
+        previous_range = self._collider_cells.get(collider, None)
+
+        if bounds is None:
+            if previous_range is not None:
+                self._remove_from_cells(collider, previous_range)
+                self._collider_cells.pop(collider)
+
+            self._unbounded_colliders.add(collider)
+
+            if self._vectorized is not None:
+                self._vectorized.remove(collider)
+
+            return
+
+        self._unbounded_colliders.discard(collider)
+        new_range = self._get_cell_range(bounds)
+
+        if self._vectorized is not None:
+            self._vectorized.set(collider, bounds, self._collider_ids[collider])
+
+        # Moving inside the same cells doesn't require touching the hash at all.
+        if new_range == previous_range:
+            return
+
+        if previous_range is not None:
+            self._remove_from_cells(collider, previous_range)
+
+        self._insert_into_cells(collider, new_range)
+        self._collider_cells[collider] = new_range
+
+    def _flush_dirty_colliders(self):
+        if not self._dirty_colliders:
+            return
+
+        for collider in self._dirty_colliders:
+            self._rebucket(collider)
+
+        self._dirty_colliders.clear()
+
+    def _get_candidates(self, rect: Rect) -> set[Collider]:
+        self._flush_dirty_colliders()
+
+        x0, y0, x1, y1 = self._get_cell_range(rect)
+
+        # When the query covers more cells than there are colliders, scanning every collider is cheaper.
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._colliders):
+            return self._colliders
+
+        candidates = set(self._unbounded_colliders)
+        cells = self._cells
+
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                cell = cells.get((cx, cy), None)
+
+                if cell:
+                    candidates.update(cell)
+
+        return candidates
+
+    def _get_partner_candidates(self, rect: AnyRect) -> set[Collider]:
+        """
+        Return the unbounded colliders, and the compound colliders with parts in the cells `rect` touches.
+        """
+        candidates = set(self._unbounded_colliders)
+        if not self._compound_colliders:
+            return candidates
+
+        x0, y0, x1, y1 = self._get_cell_range(rect)
+        cells = [(cx, cy) for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1)]
+
+        for compound in self._compound_colliders:
+            cell_refs = self._compound_cell_refs.get(compound, {})
+
+            if any(cell in cell_refs for cell in cells):
+                candidates.add(compound)
+
+        return candidates
+
     def internal_add_collider(self, collider: Collider):
         self._colliders.add(collider)
+        self._dirty_colliders.add(collider)
+        self._moved_colliders.add(collider)
+
+        self._collider_ids[collider] = self._next_collider_id
+        self._next_collider_id += 1
+
+        if collider.internal_has_collision_listeners():
+            self._listening_colliders.add(collider)
 
     def internal_remove_collider(self, collider: Collider):
         self._colliders.remove(collider)
+        self._dirty_colliders.discard(collider)
+        self._unbounded_colliders.discard(collider)
+        self._collider_ids.pop(collider)
+        self._listening_colliders.discard(collider)
+
+        self._compound_colliders.discard(collider)
+        self._compound_part_ranges.pop(collider, None)
+
+        if self._vectorized is not None:
+            self._vectorized.remove(collider)
+
+        if self._history is not None:
+            self._history.remove(collider)
+
+        for cell in self._compound_cell_refs.pop(collider, {}):
+            self._remove_from_cells(collider, (*cell, *cell))
+
+        self._moved_colliders.discard(collider)
+        self._awake_colliders.discard(collider)
+        self._last_moved_step.pop(collider, None)
+
+        cell_range = self._collider_cells.pop(collider, None)
+        if cell_range is not None:
+            self._remove_from_cells(collider, cell_range)
+
+    def internal_mark_collider_dirty(self, collider: Collider):
+        if collider in self._colliders:
+            self._dirty_colliders.add(collider)
+            self._moved_colliders.add(collider)
+
+    def internal_update_collider_listening(self, collider: Collider):
+        if collider not in self._colliders:
+            return
+
+        if not collider.internal_has_collision_listeners():
+            self._listening_colliders.discard(collider)
+
+        elif collider not in self._listening_colliders:
+            self._listening_colliders.add(collider)
+
+            # Contacts the collider already has were never recorded, so have them found (and entered) again.
+            self._moved_colliders.add(collider)
+
+    def internal_is_collider_sleeping(self, collider: Collider):
+        return (
+            collider.body_type is not BodyType.STATIC
+            and collider in self._colliders
+            and collider not in self._awake_colliders
+            and collider not in self._moved_colliders
+        )
 
     def internal_check_collisions(self, collider: Collider) -> list[Collider]:
-        collisions = []
-        rect = Rect(collider.collider_position, collider.size)
+        rect = collider.get_bounds()
+        if rect is None:
+            return []
+
+        collision_mask = self._get_collision_mask(collider)
+        layer_bit = 1 << collider.layer
+
+        if self._vectorized is not None:
+            self._flush_dirty_colliders()
+
+            # Only colliders whose bounds overlap are left for the exact test below.
+            candidates = self._get_partner_candidates(rect)
+            candidates.update(self._vectorized.query_rect(rect, collision_mask, layer_bit))
+        else:
+            candidates = self._get_candidates(rect)
+
+        return [
+            other
+            for other in candidates
+            if other is not collider
+            and collision_mask & (1 << other.layer)
+            and other.mask & layer_bit
+            and other.check_rect_overlap(rect)
+        ]
+
+    def check_rect_overlap(self, rect: Rect, layer_mask: int = ALL_LAYERS) -> list[Collider]:
+        """
+        Return every collider overlapping `rect`, out of the colliders on the layers in `layer_mask`.
+        """
+        if self._vectorized is not None:
+            self._flush_dirty_colliders()
+
+            candidates = self._get_partner_candidates(rect)
+            candidates.update(self._vectorized.query_rect(rect, layer_mask))
+        else:
+            candidates = self._get_candidates(rect)
+
+        return [c for c in candidates if layer_mask & (1 << c.layer) and c.check_rect_overlap(rect)]
+
+    def point_query(self, point: Coordinate, layer_mask: int = ALL_LAYERS) -> list[Collider]:
+        """
+        Return every collider containing `point`, out of the colliders on the layers in `layer_mask`.
+        """
+        point = get_coords_as_vector2(point)
+        candidates = self._get_candidates(FRect(point, (1, 1)))
+
+        return [c for c in candidates if layer_mask & (1 << c.layer) and c.check_point_overlap(point)]
+
+    def circle_query(self, center: Coordinate, radius: float, layer_mask: int = ALL_LAYERS) -> list[Collider]:
+        """
+        Return every collider overlapping the circle, out of the colliders on the layers in `layer_mask`.
+        """
+        center = get_coords_as_vector2(center)
+        candidates = self._get_candidates(FRect(center.x - radius, center.y - radius, radius * 2, radius * 2))
+
+        return [c for c in candidates if layer_mask & (1 << c.layer) and c.check_circle_overlap(center, radius)]
+
+    def _iter_ray_cells(self, origin: Vector2, direction: Vector2, max_distance: float) -> Iterator[tuple[int, int, float]]:
+        """
+        Yield the broadphase cells a ray passes through in order, along with the distance at which it leaves each of them.
+        """
+        cell_size = self._cell_size
+        cell_x, cell_y = int(origin.x // cell_size), int(origin.y // cell_size)
+
+        step_x = 1 if direction.x > 0 else -1
+        step_y = 1 if direction.y > 0 else -1
+
+        if direction.x != 0:
+            next_x = (cell_x + 1) * cell_size if step_x > 0 else cell_x * cell_size
+            t_max_x, t_delta_x = (next_x - origin.x) / direction.x, cell_size / abs(direction.x)
+        else:
+            t_max_x = t_delta_x = math.inf
+
+        if direction.y != 0:
+            next_y = (cell_y + 1) * cell_size if step_y > 0 else cell_y * cell_size
+            t_max_y, t_delta_y = (next_y - origin.y) / direction.y, cell_size / abs(direction.y)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        distance = 0.0
+        while distance <= max_distance:
+            exit_distance = min(t_max_x, t_max_y)
+            yield cell_x, cell_y, exit_distance
+
+            distance = exit_distance
+            if t_max_x < t_max_y:
+                t_max_x += t_delta_x
+                cell_x += step_x
+            else:
+                t_max_y += t_delta_y
+                cell_y += step_y
+
+    def raycast(
+        self,
+        origin: Coordinate,
+        direction: Coordinate,
+        max_distance: float = 1000,
+        layer_mask: int = ALL_LAYERS,
+        ignore: Optional[Collider] = None,
+    ) -> Optional[RaycastHit]:
+        """
+        Return the first collider hit by a ray, out of the colliders on the layers in `layer_mask`.
+        `ignore` is skipped, which is useful when casting from inside a collider.
+        """
+        origin = get_coords_as_vector2(origin)
+        direction = get_coords_as_vector2(direction)
+
+        if direction.length_squared() == 0:
+            raise ValueError("Can't raycast with a zero direction.")
+
+        direction.normalize_ip()
+        self._flush_dirty_colliders()
+
+        def should_test(collider: Collider):
+            return collider is not ignore and layer_mask & (1 << collider.layer)
+
+        closest_hit: Optional[RaycastHit] = None
+
+        def test(collider: Collider):
+            nonlocal closest_hit, max_distance
+
+            hit = collider.raycast(origin, direction, max_distance)
+            if hit is not None and (closest_hit is None or hit.distance < closest_hit.distance):
+                closest_hit = hit
+                max_distance = hit.distance
+
+        for collider in self._unbounded_colliders:
+            if should_test(collider):
+                test(collider)
+
+        # A long ray through a sparse scene crosses more cells than there are colliders to test.
+        cells_crossed = (abs(direction.x) + abs(direction.y)) * max_distance / self._cell_size + 2
+        if cells_crossed > len(self._colliders):
+            for collider in self._colliders - self._unbounded_colliders:
+                if should_test(collider):
+                    test(collider)
+
+            return closest_hit
+
+        tested = set[Collider]()
+
+        for cell_x, cell_y, exit_distance in self._iter_ray_cells(origin, direction, max_distance):
+            for collider in self._cells.get((cell_x, cell_y), ()):
+                if collider not in tested:
+                    tested.add(collider)
+
+                    if should_test(collider):
+                        test(collider)
+
+            # Anything in the next cells is further away than what was already hit.
+            if closest_hit is not None and closest_hit.distance <= exit_distance:
+                break
+
+        return closest_hit
+
+    def sweep_rect(
+        self,
+        rect: AnyRect,
+        displacement: Coordinate,
+        layer_mask: int = ALL_LAYERS,
+        ignore: Optional[Collider] = None,
+    ) -> Optional[RaycastHit]:
+        """
+        Move `rect` by `displacement` and return the first collider it touches on its way, out of the colliders
+        on the layers in `layer_mask`. Unlike testing the end position, fast movers can't tunnel through thin colliders.
+        """
+        displacement = get_coords_as_vector2(displacement)
+        max_distance = displacement.length()
+        direction = displacement / max_distance if max_distance > 0 else Vector2(0, 0)
+
+        swept_area = FRect(rect).union(FRect(rect).move(displacement))
+
+        closest_hit: Optional[RaycastHit] = None
+
+        for collider in self._get_candidates(swept_area):
+            if collider is ignore or not layer_mask & (1 << collider.layer):
+                continue
+
+            hit = collider.sweep_rect(rect, direction, max_distance)
+            if hit is not None and (closest_hit is None or hit.distance < closest_hit.distance):
+                closest_hit = hit
+                max_distance = hit.distance
+
+        return closest_hit
+
+    def rewind_query(
+        self,
+        tick: int,
+        rect_or_ray: AnyRect | Ray,
+        layer_mask: int = ALL_LAYERS,
+        ignore: Optional[Collider] = None,
+    ) -> list[Collider] | Optional[RaycastHit]:
+        """
+        Run a query against the colliders as they were at a past `tick`, e.g. to check a shot on the server
+        against where the shooting client saw its targets.
+
+        A rect returns every collider overlapping it (like `check_rect_overlap`), and a `Ray` returns the first hit
+        (like `raycast`). Colliders are tested by their bounds back then, except for compound and unbounded colliders
+        (e.g. tilemaps), which are tested as they are now.
+
+        Note
+        ----
+        Ticks are the physics steps of this game (see `tick`), and the physics steps once per frame. Nothing maps
+        the network to ticks, so the caller has to find the tick the client saw, e.g `tick - round(latency * fps)`.
+        This is only exact when each server tick is a single frame, i.e when the server runs at a fixed frame rate.
+        """
+        if self._history is None:
+            raise RuntimeError("Can't rewind, since no collider history is kept (`history_ticks` is 0).")
+
+        if not self._history.has_tick(tick):
+            raise LookupError(
+                f"Tick {tick} isn't in the collider history (ticks {self._history.oldest_tick()} to {self._step})."
+            )
+
+        def should_test(collider: Collider):
+            return collider is not ignore and layer_mask & (1 << collider.layer)
+
+        # These aren't in the history, so they are tested as they are now.
+        untracked = [c for c in self._compound_colliders | self._unbounded_colliders if should_test(c)]
+
+        if not isinstance(rect_or_ray, Ray):
+            rect = rect_or_ray
+            hits = [c for c, bounds in self._history.iter_bounds(tick) if should_test(c) and bounds.colliderect(rect)]
+            hits.extend(c for c in untracked if c.check_rect_overlap(rect))
+            return hits
+
+        origin = get_coords_as_vector2(rect_or_ray.origin)
+        direction = get_coords_as_vector2(rect_or_ray.direction)
+        max_distance = rect_or_ray.max_distance
+
+        if direction.length_squared() == 0:
+            raise ValueError("Can't raycast with a zero direction.")
+
+        direction.normalize_ip()
+        closest_hit: Optional[RaycastHit] = None
+
+        for collider, bounds in self._history.iter_bounds(tick):
+            if not should_test(collider):
+                continue
+
+            intersection = intersect_ray_rect(origin, direction, bounds, max_distance)
+            if intersection is not None:
+                distance, normal = intersection
+                closest_hit = RaycastHit(collider, origin + direction * distance, normal, distance)
+                max_distance = distance
+
+        for collider in untracked:
+            hit = collider.raycast(origin, direction, max_distance)
+            if hit is not None and (closest_hit is None or hit.distance < closest_hit.distance):
+                closest_hit = hit
+                max_distance = hit.distance
+
+        return closest_hit
+
+    def _record_history(self, moved: Iterable[Collider]):
+        recorded = list[tuple[Collider, int, Rect]]()
+
+        for collider in moved:
+            bounds = None if collider.is_compound else collider.get_bounds()
+
+            if bounds is None:
+                self._history.remove(collider)
+            else:
+                recorded.append((collider, self._collider_ids[collider], bounds))
+
+        self._history.record(self._step, recorded)
+
+    def _update_sleeping_colliders(self):
+        self._step += 1
+
+        for collider in self._moved_colliders:
+            self._last_moved_step[collider] = self._step
+
+            if collider.body_type is not BodyType.STATIC:
+                self._awake_colliders.add(collider)
+            else:
+                self._awake_colliders.discard(collider)
+
+        # Only colliders which aren't static are ever awake.
+        falling_asleep = [
+            c for c in self._awake_colliders if self._step - self._last_moved_step[c] >= self.sleep_after_steps
+        ]
+        self._awake_colliders.difference_update(falling_asleep)
+
+    def _generate_contacts(self) -> set[ContactPair]:
+        self._flush_dirty_colliders()
+
+        collider_ids = self._collider_ids
+        listening = self._listening_colliders
+        contacts = set[ContactPair]()
+
+        listening_layers = 0
+        for c in listening:
+            listening_layers |= 1 << c.layer
+
+        active = self._awake_colliders | self._moved_colliders
+        partner_tested = self._unbounded_colliders | self._compound_colliders
+
+        # Unbounded and compound colliders are tested from the side of the bounded collider they're paired with.
+        # So when an unbounded collider moves, every bounded collider has to be tested against it,
+        # and when parts of a compound collider change, every bounded collider around these parts.
+        if active.isdisjoint(self._unbounded_colliders):
+            tested = active - partner_tested
+
+            for cell in self._changed_cells:
+                tested.update(c for c in self._cells.get(cell, ()) if c not in partner_tested)
+        else:
+            tested = self._colliders - partner_tested
+
+        # Pairs of resting colliders can't have changed since the last step, so they're kept as is.
+        for pair in self._contacts:
+            first, second = pair
+            if first not in tested and second not in tested and first in self._colliders and second in self._colliders:
+                contacts.add(pair)
+
+        vectorized = self._vectorized
+        if vectorized is not None:
+            touching, to_test = vectorized.find_pairs(list(tested), list(listening), self._collision_matrix)
+            contacts.update(touching)
+
+            for first, second in to_test:
+                if second.is_aabb and not first.is_aabb:
+                    overlap = first.check_rect_overlap(second.get_bounds())
+                else:
+                    overlap = second.check_rect_overlap(first.get_bounds())
+
+                if overlap:
+                    contacts.add((first, second))
+
+            # Only pairs with unbounded and compound colliders are left to find.
+            if not partner_tested:
+                return contacts
+
+        for collider in tested:
+            collider_id = collider_ids[collider]
+            collider_listens = collider in listening
+            collision_mask = self._get_collision_mask(collider)
+            layer_bit = 1 << collider.layer
+            is_static = collider.body_type is BodyType.STATIC
+
+            # When nothing on the layers this collider collides with listens, there's no one to notify about any of its pairs.
+            if not collision_mask or (not collider_listens and not collision_mask & listening_layers):
+                continue
+
+            rect = collider.get_bounds()
+
+            if vectorized is not None:
+                candidates = self._get_partner_candidates(rect)
+            else:
+                candidates = self._get_candidates(rect)
+
+            for other in candidates:
+                if other is collider:
+                    continue
+
+                if not collision_mask & (1 << other.layer) or not other.mask & layer_bit:
+                    continue
+
+                # Static colliders never touch each other, e.g walls placed against a tilemap.
+                if is_static and other.body_type is BodyType.STATIC:
+                    continue
+
+                # A pair of tested colliders is tested once, from the side of the collider with the lower ID.
+                if other in tested and collider_ids[other] < collider_id:
+                    continue
+
+                # Nobody would be notified about this pair, so don't bother testing it.
+                if not collider_listens and other not in listening:
+                    continue
+
+                if other.check_rect_overlap(rect):
+                    if collider_id < collider_ids[other]:
+                        contacts.add((collider, other))
+                    else:
+                        contacts.add((other, collider))
+
+        return contacts
+
+    def _dispatch_contact_events(self, entered: set[ContactPair], exited: set[ContactPair]):
+        entered_by_collider = defaultdict[Collider, list[Collider]](list)
+        exited_by_collider = defaultdict[Collider, list[Collider]](list)
+
+        for first, second in entered:
+            entered_by_collider[first].append(second)
+            entered_by_collider[second].append(first)
+
+        for first, second in exited:
+            exited_by_collider[first].append(second)
+            exited_by_collider[second].append(first)
+
+        for collider in entered_by_collider.keys() | exited_by_collider.keys():
+            # Colliders destroyed since the last step still show up in exited pairs, but only the survivors are notified.
+            if collider.is_destroyed or collider not in self._listening_colliders:
+                continue
+
+            collider.internal_fire_collision_events(
+                entered=entered_by_collider.get(collider, []),
+                exited=exited_by_collider.get(collider, []),
+            )
+
+    def update(self):
+        """
+        Runs a single collision detection pass for the whole scene, and notifies colliders
+        about every contact which started or ended since the previous pass.
+        """
+        self._update_sleeping_colliders()
+        contacts = self._generate_contacts()
+
+        if self._history is not None:
+            self._record_history(self._moved_colliders)
 
-        for other in self._colliders:
-            if other is not collider and other.check_rect_overlap(rect):
-                collisions.append(other)
+        self._moved_colliders.clear()
+        self._changed_cells.clear()
 
-        return collisions
+        entered = contacts - self._contacts
+        exited = self._contacts - contacts
+        self._contacts = contacts
 
-    def check_rect_overlap(self, rect: Rect) -> list[Collider]:
-        return [c for c in self._colliders if c.check_rect_overlap(rect)]
+        if entered or exited:
+            self._dispatch_contact_events(entered, exited)
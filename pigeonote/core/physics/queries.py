@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from pygame import FRect, Vector2
+
+from pigeonote.types import AnyRect
+
+if TYPE_CHECKING:
+    from pigeonote.core.physics import Collider
+
+
+@dataclass
+class RaycastHit:
+    collider: "Collider"
+    point: Vector2  # For sweeps, this is the center of the swept rect at the moment of impact.
+    normal: Vector2
+    distance: float
+
+
+@dataclass
+class Ray:
+    origin: Vector2
+    direction: Vector2
+    max_distance: float = 1000
+
+
+def intersect_ray_rect(
+    origin: Vector2, direction: Vector2, rect: AnyRect, max_distance: float
+) -> Optional[tuple[float, Vector2]]:
+    """
+    Intersect a ray with a rect using the slab method.
+
+    `direction` must be normalized (or zero, in which case only containment of `origin` is checked).
+    Returns the distance along the ray to the entry point, and the normal of the side which was hit.
+    A ray starting inside the rect hits it at distance 0 with a zero normal.
+    """
+    t_near, t_far = 0.0, max_distance
+    normal = Vector2(0, 0)
+
+    for axis, low, high in ((0, rect.left, rect.right), (1, rect.top, rect.bottom)):
+        o, d = origin[axis], direction[axis]
+
+        if d == 0:
+            if o < low or o > high:
+                return None
+
+            continue
+
+        t1, t2 = (low - o) / d, (high - o) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+
+        if t1 > t_near:
+            t_near = t1
+            normal = Vector2(0, 0)
+            normal[axis] = -1 if d > 0 else 1
+
+        t_far = min(t_far, t2)
+        if t_near > t_far:
+            return None
+
+    return t_near, normal
+
+
+def circle_overlaps_rect(center: Vector2, radius: float, rect: AnyRect) -> bool:
+    closest_x = min(max(center.x, rect.left), rect.right)
+    closest_y = min(max(center.y, rect.top), rect.bottom)
+
+    dx, dy = center.x - closest_x, center.y - closest_y
+    return dx * dx + dy * dy <= radius * radius
+
+
+def expand_rect(rect: AnyRect, size: tuple[float, float]) -> FRect:
+    """
+    Return the Minkowski sum of `rect` and a rect of `size` centered on the origin.
+    """
+    width, height = size
+    return FRect(rect.left - width / 2, rect.top - height / 2, rect.width + width, rect.height + height)
@@ -0,0 +1,220 @@
+from typing import TYPE_CHECKING, Sequence
+
+from pygame import Rect
+
+from pigeonote.core.physics.body_type import BodyType
+from pigeonote.types import AnyRect
+from pigeonote.utils import np, require_numpy
+
+if TYPE_CHECKING:
+    from pigeonote.core.physics import Collider
+
+
+class VectorizedAABBs:
+    """
+    Keeps the bounds of bounded colliders in contiguous numpy arrays, so overlaps between all of them
+    can be found with a handful of array expressions instead of a Python loop per pair.
+
+    Slots are kept dense: removing a collider moves the last collider into its slot.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        require_numpy("the vectorized physics backend")
+
+        self._colliders = list["Collider"]()
+        self._slots = dict["Collider", int]()
+
+        self._left = np.zeros(capacity, dtype=np.float64)
+        self._top = np.zeros(capacity, dtype=np.float64)
+        self._right = np.zeros(capacity, dtype=np.float64)
+        self._bottom = np.zeros(capacity, dtype=np.float64)
+        self._layer = np.zeros(capacity, dtype=np.uint64)
+        self._mask = np.zeros(capacity, dtype=np.uint64)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._is_aabb = np.zeros(capacity, dtype=np.bool_)
+        self._is_static = np.zeros(capacity, dtype=np.bool_)
+
+    def __len__(self):
+        return len(self._colliders)
+
+    def __contains__(self, collider: "Collider"):
+        return collider in self._slots
+
+    def _grow(self):
+        capacity = len(self._left) * 2
+
+        for name in ("_left", "_top", "_right", "_bottom", "_layer", "_mask", "_ids", "_is_aabb", "_is_static"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def set(self, collider: "Collider", bounds: Rect, collider_id: int):
+        slot = self._slots.get(collider, None)
+
+        if slot is None:
+            if len(self._colliders) == len(self._left):
+                self._grow()
+
+            slot = len(self._colliders)
+            self._slots[collider] = slot
+            self._colliders.append(collider)
+
+        self._left[slot] = bounds.left
+        self._top[slot] = bounds.top
+        self._right[slot] = bounds.right
+        self._bottom[slot] = bounds.bottom
+        self._layer[slot] = collider.layer
+        self._mask[slot] = collider.mask
+        self._ids[slot] = collider_id
+        self._is_aabb[slot] = collider.is_aabb
+        self._is_static[slot] = collider.body_type is BodyType.STATIC
+
+    def remove(self, collider: "Collider"):
+        slot = self._slots.pop(collider, None)
+        if slot is None:
+            return
+
+        last_slot = len(self._colliders) - 1
+        last_collider = self._colliders.pop()
+
+        if slot != last_slot:
+            for array in (
+                self._left,
+                self._top,
+                self._right,
+                self._bottom,
+                self._layer,
+                self._mask,
+                self._ids,
+                self._is_aabb,
+                self._is_static,
+            ):
+                array[slot] = array[last_slot]
+
+            self._colliders[slot] = last_collider
+            self._slots[last_collider] = slot
+
+    def _overlaps(self, a, b):
+        """
+        Same as `Rect.colliderect` between the bounds in slots `a` and `b`: rects with no area never overlap.
+        """
+        left, top, right, bottom = self._left, self._top, self._right, self._bottom
+
+        return (
+            (left[a] < right[b])
+            & (left[b] < right[a])
+            & (top[a] < bottom[b])
+            & (top[b] < bottom[a])
+            & (left[a] < right[a])
+            & (top[a] < bottom[a])
+            & (left[b] < right[b])
+            & (top[b] < bottom[b])
+        )
+
+    def query_rect(self, rect: AnyRect, layer_mask: int, layer_bit: int = 0) -> list["Collider"]:
+        """
+        Return the colliders on the layers in `layer_mask` whose bounds overlap `rect`.
+        When `layer_bit` is given, colliders whose mask excludes it are skipped as well.
+        """
+        count = len(self._colliders)
+        if count == 0 or rect.width <= 0 or rect.height <= 0:
+            return []
+
+        left, top, right, bottom = self._left[:count], self._top[:count], self._right[:count], self._bottom[:count]
+        layers, masks = self._layer[:count], self._mask[:count]
+
+        hits = (
+            (left < rect.right)
+            & (rect.left < right)
+            & (top < rect.bottom)
+            & (rect.top < bottom)
+            & (left < right)
+            & (top < bottom)
+            & (((np.uint64(layer_mask) >> layers) & np.uint64(1)) == 1)
+        )
+
+        if layer_bit:
+            hits &= (masks & np.uint64(layer_bit)) != 0
+
+        colliders = self._colliders
+        return [colliders[slot] for slot in np.flatnonzero(hits).tolist()]
+
+    def find_pairs(
+        self,
+        tested: Sequence["Collider"],
+        listening: Sequence["Collider"],
+        collision_matrix: Sequence[int],
+    ) -> tuple[list[tuple["Collider", "Collider"]], list[tuple["Collider", "Collider"]]]:
+        """
+        Find every pair of overlapping colliders, where at least one collider is in `tested` and one is in `listening`,
+        and whose layers collide according to both the collision matrix and their masks. Pairs of static colliders
+        are skipped.
+
+        Returns the pairs which are known to touch, ordered by collider ID, and the pairs whose bounds overlap
+        but which still need an exact test, because one of their colliders isn't just its bounds.
+        """
+        count = len(self._colliders)
+        if count < 2:
+            return [], []
+
+        slots = self._slots
+
+        is_tested = np.zeros(count, dtype=np.bool_)
+        is_tested[[slots[c] for c in tested if c in slots]] = True
+
+        is_listening = np.zeros(count, dtype=np.bool_)
+        is_listening[[slots[c] for c in listening if c in slots]] = True
+
+        # Sweep and prune along the axis where the colliders are more spread out, so fewer candidates are generated.
+        if np.ptp(self._left[:count]) >= np.ptp(self._top[:count]):
+            low, high = self._left[:count], self._right[:count]
+        else:
+            low, high = self._top[:count], self._bottom[:count]
+
+        order = np.argsort(low, kind="stable")
+        sorted_low, sorted_high = low[order], high[order]
+
+        # Every collider is paired with the colliders after it in the sorted order, which start before it ends.
+        ends = np.searchsorted(sorted_low, sorted_high, side="left")
+        counts = np.maximum(ends - np.arange(count) - 1, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return [], []
+
+        first_sorted = np.repeat(np.arange(count), counts)
+        pair_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        second_sorted = first_sorted + (np.arange(total) - pair_starts) + 1
+
+        a, b = order[first_sorted], order[second_sorted]
+
+        keep = (
+            (is_tested[a] | is_tested[b])
+            & (is_listening[a] | is_listening[b])
+            & ~(self._is_static[a] & self._is_static[b])
+        )
+        a, b = a[keep], b[keep]
+
+        matrix = np.array(collision_matrix, dtype=np.uint64)
+        layer_a, layer_b = self._layer[a], self._layer[b]
+        one = np.uint64(1)
+
+        keep = (
+            (((matrix[layer_a.astype(np.intp)] >> layer_b) & one) == one)
+            & (((self._mask[a] >> layer_b) & one) == one)
+            & (((self._mask[b] >> layer_a) & one) == one)
+            & self._overlaps(a, b)
+        )
+        a, b = a[keep], b[keep]
+
+        # Order every pair by collider ID, the same way the physics does.
+        swap = self._ids[a] > self._ids[b]
+        a, b = np.where(swap, b, a), np.where(swap, a, b)
+
+        exact = self._is_aabb[a] & self._is_aabb[b]
+        colliders = self._colliders
+
+        touching = [(colliders[i], colliders[j]) for i, j in zip(a[exact].tolist(), b[exact].tolist())]
+        to_test = [(colliders[i], colliders[j]) for i, j in zip(a[~exact].tolist(), b[~exact].tolist())]
+
+        return touching, to_test
@@ -0,0 +1,67 @@
+from typing import Hashable
+
+from pygame import Rect
+
+
+class DirtyRectTracker:
+    """
+    Finds the areas of a frame which changed since the previous one, by comparing the draws of both frames.
+
+    Every draw is given by a key, which is equal for draws of the same pixels at the same place in the draw order,
+    and its bounds. Draws whose key is only in one of the frames were either added, removed or reordered,
+    so both their old and new bounds are dirty.
+    When too many areas changed, the whole frame is considered dirty instead.
+    """
+
+    def __init__(self, size: tuple[int, int], max_rects: int = 32, max_coverage: float = 0.5) -> None:
+        self.max_rects = max_rects
+        self.max_coverage = max_coverage
+
+        self._frame_rect = Rect((0, 0), size)
+        self._previous_draws = dict[Hashable, Rect]()
+        self._draws = dict[Hashable, Rect]()
+
+        self._marked = list[Rect]()
+        self._is_all_dirty = True
+
+    def add_draw(self, key: Hashable, bounds: Rect):
+        self._draws[key] = bounds
+
+    def mark(self, rect: Rect):
+        """
+        Consider an area dirty in the current frame, whatever was drawn on it.
+        """
+        self._marked.append(rect)
+
+    def mark_all(self):
+        self._is_all_dirty = True
+
+    def finish_frame(self) -> list[Rect]:
+        """
+        Return the areas which changed since the last frame, and start the next frame.
+        """
+        previous_draws, draws = self._previous_draws, self._draws
+
+        changed = self._marked
+        changed.extend(bounds for key, bounds in draws.items() if key not in previous_draws)
+        changed.extend(bounds for key, bounds in previous_draws.items() if key not in draws)
+
+        self._previous_draws, self._draws = draws, previous_draws
+        self._draws.clear()
+        self._marked = list[Rect]()
+
+        frame_rect = self._frame_rect
+
+        # Positions of draws aren't always whole pixels, so an extra pixel is taken on every side.
+        dirty_rects = [frame_rect.clip(rect.inflate(2, 2)) for rect in changed]
+        dirty_rects = [rect for rect in dirty_rects if rect.width and rect.height]
+
+        if (
+            self._is_all_dirty
+            or len(dirty_rects) > self.max_rects
+            or sum(rect.width * rect.height for rect in dirty_rects) > frame_rect.width * frame_rect.height * self.max_coverage
+        ):
+            self._is_all_dirty = False
+            return [frame_rect.copy()]
+
+        return dirty_rects
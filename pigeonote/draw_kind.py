@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class DrawKind(Enum):
+    BLITS = 0  # A run of consecutive blits, drawn with a single call.
+    LINE = 1
+    RECT = 2
+    CIRCLE = 3
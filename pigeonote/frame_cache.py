@@ -0,0 +1,84 @@
+from typing import Iterable, Optional
+
+import pygame as pg
+
+from pigeonote.rotation_cache import RotationCache
+
+FrameKey = tuple[pg.Surface, tuple[int, int, int, int]]
+
+
+def get_grid_frame_rects(sheet_size: tuple[int, int], frame_size: tuple[int, int]) -> list[pg.Rect]:
+    """
+    Return the rects of the whole frames of `frame_size` on a sheet, from left to right and then from top to bottom.
+    """
+    frame_width, frame_height = frame_size
+    if frame_width <= 0 or frame_height <= 0:
+        raise ValueError(f"Frames must have a positive size (got {tuple(frame_size)}).")
+
+    return [
+        pg.Rect(x, y, frame_width, frame_height)
+        for y in range(0, sheet_size[1] - frame_height + 1, frame_height)
+        for x in range(0, sheet_size[0] - frame_width + 1, frame_width)
+    ]
+
+
+class FrameCache:
+    """
+    The frames of sprite sheets, keyed by their sheet and rect, and shared by every renderer using them.
+
+    Frames are subsurfaces of their sheet, so they share its pixels instead of copying them, and renderers drawing
+    the same frame share its rotations as well. Frames are reference counted: a frame is dropped from the cache,
+    along with its rotations, once every renderer which acquired it released it.
+    """
+
+    def __init__(self, rotation_cache: Optional[RotationCache] = None) -> None:
+        self._rotation_cache = rotation_cache
+
+        self._frames = dict[FrameKey, pg.Surface]()
+        self._reference_counts = dict[FrameKey, int]()
+
+    def __len__(self):
+        return len(self._frames)
+
+    def get_reference_count(self, sheet: pg.Surface, rect: pg.Rect | tuple[int, int, int, int]) -> int:
+        return self._reference_counts.get((sheet, tuple(rect)), 0)
+
+    def acquire(self, sheet: pg.Surface, rects: Iterable[pg.Rect | tuple[int, int, int, int]]) -> list[pg.Surface]:
+        """
+        Return the frames of `sheet` in `rects`, keeping them cached until they're released.
+        """
+        frames = list[pg.Surface]()
+
+        for rect in rects:
+            key = sheet, tuple(rect)
+
+            frame = self._frames.get(key, None)
+            if frame is None:
+                frame = self._frames[key] = sheet.subsurface(rect)
+                self._reference_counts[key] = 0
+
+            self._reference_counts[key] += 1
+            frames.append(frame)
+
+        return frames
+
+    def release(self, sheet: pg.Surface, rects: Iterable[pg.Rect | tuple[int, int, int, int]]):
+        """
+        Release frames acquired with `acquire`, dropping the ones nothing uses anymore.
+        """
+        for rect in rects:
+            key = sheet, tuple(rect)
+
+            reference_count = self._reference_counts.get(key, 0)
+            if reference_count <= 0:
+                raise LookupError(f"The frame {tuple(rect)} of sheet {sheet} was released more than it was acquired.")
+
+            if reference_count > 1:
+                self._reference_counts[key] = reference_count - 1
+                continue
+
+            del self._reference_counts[key]
+            frame = self._frames.pop(key)
+
+            if self._rotation_cache is not None:
+                self._rotation_cache.forget(frame)
@@ -1,9 +1,13 @@
 import uuid
+from functools import partial
 from typing import Literal, Optional, TypeVar, overload
 
 import pygame as pg
 
-from pigeonote import Camera2D, Entity, MouseButton, Service
+from pigeonote import Camera2D, Entity, FrameCache, MouseButton, RotationCache, Service
+from pigeonote.camera import _QueuedFrame
+from pigeonote.presenters import Presenter, ScalePresenter
+from pigeonote.render_thread import RenderThread
 
 from .types import Coordinate
 
@@ -20,7 +24,9 @@ class Game:
 
         return Game.instance
 
-    def __init__(self, display: Optional[pg.Surface] = None, target_fps: int = 60) -> None:
+    def __init__(
+        self, display: Optional[pg.Surface] = None, target_fps: int = 60, presenter: Optional[Presenter] = None
+    ) -> None:
         self._is_actual_display = False
         if not display:
             pg.init()
@@ -35,6 +41,17 @@ class Game:
         camera_view_area = pg.Rect((0, 0), (16 * 25, 9 * 25))
         camera_view_area.center = (0, 0)
         self._camera2d = Camera2D(area=camera_view_area)
+        self._rotation_cache = RotationCache()
+        self._frame_cache = FrameCache(self._rotation_cache)
+
+        # The areas of the display which were updated in the last frame, or `None` for the whole display.
+        self._use_dirty_rects = False
+        self._updated_display_rects: Optional[list[pg.Rect]] = None
+
+        # In pipelined mode, frames are rendered on this thread while the next frame is simulated,
+        # and then presented from the main thread, along with the next frame.
+        self._render_thread: Optional[RenderThread] = None
+        self._rendering_frame: Optional[_QueuedFrame] = None
 
         self._entities = list[Entity]()
         self._services = list[Service]()
@@ -54,10 +71,82 @@ class Game:
         assert self.instance is None
         Game.instance = self
 
+        self._presenter = presenter or ScalePresenter()
+        self._presenter.attach(self)
+
     @property
     def camera(self):
         return self._camera2d
 
+    @property
+    def rotation_cache(self):
+        """
+        The rotations of surfaces, shared by every renderer.
+        """
+        return self._rotation_cache
+
+    @property
+    def frame_cache(self):
+        """
+        The frames of sprite sheets, shared by every animated renderer.
+        """
+        return self._frame_cache
+
+    @property
+    def display(self) -> Optional[pg.Surface]:
+        """
+        The display surface, or `None` when the presenter draws to the window without one (see `RendererPresenter`).
+        """
+        return self._display
+
+    @property
+    def owns_display(self):
+        """
+        Whether the display is the window the game opened itself (rather than a surface it was given).
+        """
+        return self._is_actual_display
+
+    def internal_set_display(self, display: Optional[pg.Surface]):
+        self._display = display
+
+    def internal_set_camera(self, camera: Camera2D):
+        self._finish_rendering()
+        self._camera2d = camera
+
+    @property
+    def presenter(self):
+        """
+        How rendered frames are put on the display (see `pigeonote.presenters`).
+        """
+        return self._presenter
+
+    @presenter.setter
+    def presenter(self, presenter: Presenter):
+        if self._render_thread is not None and not presenter.supports_render_thread:
+            raise RuntimeError(f"{type(presenter).__name__} can't be used by a pipelined game.")
+
+        self._finish_rendering()
+        self._presenter.detach(self)
+        self._presenter = presenter
+        self._presenter.attach(self)
+
+        self._camera2d.mark_dirty()
+
+    @property
+    def use_dirty_rects(self):
+        """
+        Whether only the areas of the camera surface which changed in each frame are scaled onto the display,
+        and then updated on the screen. This saves a lot of work in mostly static scenes, like menus.
+        """
+        return self._use_dirty_rects
+
+    @use_dirty_rects.setter
+    def use_dirty_rects(self, use_dirty_rects: bool):
+        self._finish_rendering()
+        self._use_dirty_rects = use_dirty_rects
+        self._camera2d.track_dirty_rects = use_dirty_rects
+        self._camera2d.mark_dirty()
+
     @property
     def dt(self):
         return self._dt
@@ -73,11 +162,10 @@ class Game:
 
     @property
     def mouse_screen_position(self):
-        mouse_pos_x, mouse_pos_y = pg.mouse.get_pos()
-        camera_width, camera_height = self._camera2d.area.size
-        display_width, display_height = pg.display.get_surface().size
-        scale_x, scale_y = (camera_width / display_width, camera_height / display_height)
-        return pg.Vector2(mouse_pos_x * scale_x, mouse_pos_y * scale_y)
+        frame_size = self._camera2d.area.size
+        display_size = self._display.get_size() if self._display is not None else frame_size
+
+        return self._presenter.display_to_frame_position(pg.mouse.get_pos(), frame_size, display_size)
 
     @property
     def mouse_world_position(self):
@@ -156,17 +244,67 @@ class Game:
 
         pg.quit()
 
+    @property
+    def pipelined(self):
+        """
+        Whether each frame is rendered on a render thread, while the next frame is simulated.
+
+        Draws are queued as usual, and then handed to the render thread along with one of two camera surfaces,
+        while the next frame is queued onto the other one. The display is only used from the main thread,
+        so each frame is put on the screen at the end of the next one, once it's rendered, and shows up a frame later.
+        Surfaces must not be modified in place while they may still be drawn by the render thread,
+        i.e until the end of the next frame.
+        """
+        return self._render_thread is not None
+
+    @pipelined.setter
+    def pipelined(self, pipelined: bool):
+        if pipelined and self._render_thread is None:
+            if not self._presenter.supports_render_thread:
+                raise RuntimeError(f"{type(self._presenter).__name__} can't be used by a pipelined game.")
+
+            self._render_thread = RenderThread()
+
+        elif not pipelined and self._render_thread is not None:
+            self._finish_rendering()
+
+            render_thread, self._render_thread = self._render_thread, None
+            render_thread.stop()
+
+    def _finish_rendering(self):
+        """
+        Wait for the render thread to finish the frame it's on, and present it, before changing anything it uses.
+        """
+        if self._render_thread is None:
+            return
+
+        self._render_thread.wait()
+
+        if self._rendering_frame is not None:
+            frame, self._rendering_frame = self._rendering_frame, None
+
+            self._camera2d.internal_show_frame(frame)
+            self._present()
+            self._update_display()
+
     def game_loop(self):
         self._running = True
         while self._running:
             self.process()
 
-            if self._is_actual_display:
+            if self._render_thread is None:
+                self._update_display()
+
+        self._finish_rendering()
+
+    def _update_display(self):
+        if self._is_actual_display:
+            if self._updated_display_rects is None:
                 pg.display.flip()
+            elif self._updated_display_rects:
+                pg.display.update(self._updated_display_rects)
 
     def process(self):
-        self._display.fill("black")
-
         self.camera.clean_surface()
 
         self._keys_down.clear()
@@ -200,14 +338,27 @@ class Game:
                     self._mouse_btns_pressed.remove(mouse_button)
 
         self.update()
-        self._camera2d.render_frame()
 
-        current_frame_surface = self._camera2d.get_rendered_surface()
-        pg.transform.scale(current_frame_surface, self._display.get_size(), dest_surface=self._display)
+        if self._render_thread is None:
+            self._camera2d.render_frame()
+            self._present()
+
+        else:
+            # The previous frame must be on screen before its surface and command buffers are queued onto again.
+            self._finish_rendering()
+
+            self._rendering_frame = self._camera2d.internal_take_frame(True)
+            self._render_thread.submit(partial(self._camera2d.internal_render_frame, self._rendering_frame))
 
         self._dt = self._clock.tick(self._target_fps) / 1000
         return True
 
+    def _present(self):
+        dirty_rects = self._camera2d.dirty_rects if self._use_dirty_rects else None
+
+        frame = self._camera2d.get_rendered_surface() if self._presenter.uses_frame else None
+        self._updated_display_rects = self._presenter.present(frame, self._display, dirty_rects)
+
     def initialize(self):
         for service in self._services:
             service.initialize()
@@ -219,6 +370,7 @@ class Game:
         Steps through the life cycle of entities/components.
 
         1. Update every component of each entity. This is usually where any logic is being processed.
+           Entities whose position was changed in place then let their colliders know they moved.
         2. Update every service.
         3. After all the game logic was updated in component/service.update(), we call another `render`
            method in which components can actually draw/render anything onto the screen.
@@ -227,6 +379,9 @@ class Game:
             for component in entity.get_components():
                 component.component_update()
 
+        for entity in self._entities:
+            entity.internal_notify_moved_in_place()
+
         for service in self._services:
             service.service_update()
 
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from io import BytesIO
 from typing import Any, Callable, Optional
 
-from pigeonote import Entity, Service
+from pigeonote import Entity, Physics, Service
 from pigeonote.network import (
     DatagramFormatter,
     DatagramType,
@@ -41,6 +41,10 @@ class GameServer(Service):
         self.formatter = DatagramFormatter()
         self.prefab_factories = dict[str, Callable[[], Entity]]()
 
+        # How many ticks of collider history are kept while hosting, for lag-compensated hit checks
+        # (see `Physics.rewind_query`). Ticks are physics steps, one per frame, so 60 ticks are a second at 60 FPS.
+        self.history_ticks = 60
+
         self._server: TCPServer = None
         self._outgoing_datagrams = list[OutgoingDatagram]()
 
@@ -87,6 +91,9 @@ class GameServer(Service):
         self._server = TCPServer((self.host_ip, self.port))
         print(f"[SERVER] hosting server on address {self.host_ip}:{self.port}")
 
+        physics = Physics.get_instance()
+        physics.history_ticks = max(physics.history_ticks, self.history_ticks)
+
     def update(self):
         if not self._server:
             return
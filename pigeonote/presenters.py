@@ -0,0 +1,338 @@
+import abc
+from typing import TYPE_CHECKING, Optional
+
+import pygame as pg
+from pygame import Rect, Surface, Vector2
+
+from pigeonote.camera import Camera2D
+
+if TYPE_CHECKING:
+    from pygame._sdl2.video import Window
+
+    from pigeonote import Game
+    from pigeonote.renderer_camera import RendererCamera2D
+
+
+class Presenter(abc.ABC):
+    """
+    Puts the frames rendered by the camera on the display.
+    """
+
+    # Whether `present` needs the rendered frame. Reading it back is expensive for cameras which don't render on the CPU.
+    uses_frame = True
+
+    # Whether frames can be rendered on the render thread of a pipelined game (see `Game.pipelined`),
+    # while the next frame is drawn. Presenters whose camera renders straight onto the display can't.
+    supports_render_thread = True
+
+    def attach(self, game: "Game"):
+        """
+        Called when the presenter starts being used by `game`.
+        """
+        pass
+
+    def detach(self, game: "Game"):
+        """
+        Called when the presenter stops being used by `game`.
+        """
+        pass
+
+    @abc.abstractmethod
+    def present(
+        self, frame: Optional[Surface], display: Optional[Surface], dirty_rects: Optional[list[Rect]]
+    ) -> Optional[list[Rect]]:
+        """
+        Put `frame` on `display`. `dirty_rects` are the areas of `frame` which changed since the last frame,
+        or `None` when they aren't tracked and the whole frame should be presented.
+
+        Returns the areas of the display which were updated, or `None` for the whole display.
+        """
+        pass
+
+    def display_to_frame_position(
+        self, position: tuple[int, int], frame_size: tuple[int, int], display_size: tuple[int, int]
+    ) -> Vector2:
+        """
+        Convert a position on the display (e.g of the mouse) to the matching position on the frame.
+        """
+        return Vector2(position[0] * frame_size[0] / display_size[0], position[1] * frame_size[1] / display_size[1])
+
+
+class ScalePresenter(Presenter):
+    """
+    Stretches the frame over the whole display.
+
+    Only the dirty rects of the frame are scaled when the display is a whole multiple of the frame. Otherwise,
+    a part of the frame isn't scaled to the same pixels as the whole frame is, which would leave seams around it,
+    so the whole frame is scaled instead.
+    """
+
+    def present(self, frame: Surface, display: Surface, dirty_rects: Optional[list[Rect]]) -> Optional[list[Rect]]:
+        if dirty_rects is None or display.width % frame.width or display.height % frame.height:
+            pg.transform.scale(frame, display.get_size(), dest_surface=display)
+            return None
+
+        scale_x, scale_y = display.width // frame.width, display.height // frame.height
+        updated_rects = list[Rect]()
+
+        for dirty_rect in dirty_rects:
+            display_rect = Rect(
+                dirty_rect.left * scale_x,
+                dirty_rect.top * scale_y,
+                dirty_rect.width * scale_x,
+                dirty_rect.height * scale_y,
+            )
+
+            pg.transform.scale(
+                frame.subsurface(dirty_rect), display_rect.size, dest_surface=display.subsurface(display_rect)
+            )
+            updated_rects.append(display_rect)
+
+        return updated_rects
+
+
+class IntegerScalePresenter(Presenter):
+    """
+    Scales the frame by the largest whole factor which fits the display, centered between black bars.
+    Every pixel of the frame becomes a square of exactly `factor`x`factor` pixels.
+    """
+
+    def __init__(self) -> None:
+        self._layout: Optional[tuple[tuple[int, int], tuple[int, int]]] = None
+        self._factor = 1
+        self._frame_rect = Rect(0, 0, 0, 0)
+
+    @property
+    def factor(self):
+        return self._factor
+
+    def detach(self, game: "Game"):
+        self._layout = None
+
+    def display_to_frame_position(
+        self, position: tuple[int, int], frame_size: tuple[int, int], display_size: tuple[int, int]
+    ) -> Vector2:
+        return Vector2(
+            (position[0] - self._frame_rect.left) / self._factor, (position[1] - self._frame_rect.top) / self._factor
+        )
+
+    def _update_layout(self, frame: Surface, display: Surface) -> bool:
+        """
+        Place the frame on the display, and return whether it moved (the bars then have to be cleared again).
+        """
+        layout = frame.get_size(), display.get_size()
+        if layout == self._layout:
+            return False
+
+        self._layout = layout
+        self._factor = max(1, min(display.width // frame.width, display.height // frame.height))
+
+        self._frame_rect = Rect(0, 0, frame.width * self._factor, frame.height * self._factor)
+        self._frame_rect.center = display.get_rect().center
+        self._frame_rect = self._frame_rect.clip(display.get_rect())
+
+        display.fill("black")
+        return True
+
+    def present(self, frame: Surface, display: Surface, dirty_rects: Optional[list[Rect]]) -> Optional[list[Rect]]:
+        has_moved = self._update_layout(frame, display)
+        factor, frame_rect = self._factor, self._frame_rect
+
+        if has_moved or dirty_rects is None:
+            # `transform.scale` straight into the display is the cheapest nearest neighbor scaling pygame has.
+            pg.transform.scale(
+                frame.subsurface(0, 0, frame_rect.width // factor, frame_rect.height // factor),
+                frame_rect.size,
+                dest_surface=display.subsurface(frame_rect),
+            )
+            return None
+
+        updated_rects = list[Rect]()
+
+        for dirty_rect in dirty_rects:
+            display_rect = Rect(
+                frame_rect.left + dirty_rect.left * factor,
+                frame_rect.top + dirty_rect.top * factor,
+                dirty_rect.width * factor,
+                dirty_rect.height * factor,
+            ).clip(frame_rect)
+
+            if display_rect.width and display_rect.height:
+                pg.transform.scale(
+                    frame.subsurface(dirty_rect), display_rect.size, dest_surface=display.subsurface(display_rect)
+                )
+                updated_rects.append(display_rect)
+
+        return updated_rects
+
+
+class NativePresenter(Presenter):
+    """
+    Renders the camera straight onto the display, at its native resolution, so there's nothing left to present.
+    The camera area grows (or shrinks) to the size of the display, around its center.
+    """
+
+    supports_render_thread = False
+
+    def __init__(self) -> None:
+        self._camera_size: Optional[tuple[int, int]] = None
+
+    def attach(self, game: "Game"):
+        self._camera_size = game.camera.area.size
+        game.camera.resize(game.display.get_size(), surface=game.display)
+
+    def detach(self, game: "Game"):
+        if self._camera_size is not None:
+            game.camera.resize(self._camera_size)
+
+    def present(self, frame: Surface, display: Surface, dirty_rects: Optional[list[Rect]]) -> Optional[list[Rect]]:
+        return dirty_rects
+
+    def display_to_frame_position(
+        self, position: tuple[int, int], frame_size: tuple[int, int], display_size: tuple[int, int]
+    ) -> Vector2:
+        return Vector2(position)
+
+
+class ScaledDisplayPresenter(Presenter):
+    """
+    Opens the display at the resolution of the camera with `pygame.SCALED`, so SDL scales the window for us
+    (on the GPU, when there is one), and renders the camera straight onto it.
+    """
+
+    supports_render_thread = False
+
+    def __init__(self) -> None:
+        self._display_size: Optional[tuple[int, int]] = None
+
+    def attach(self, game: "Game"):
+        if not game.owns_display:
+            raise RuntimeError("A SCALED display can only be used when the game creates its own display.")
+
+        self._display_size = game.display.get_size()
+
+        display = pg.display.set_mode(game.camera.area.size, pg.SCALED)
+        game.internal_set_display(display)
+        game.camera.resize(display.get_size(), surface=display)
+
+    def detach(self, game: "Game"):
+        if self._display_size is None:
+            return
+
+        camera_size = game.camera.area.size
+
+        display = pg.display.set_mode(self._display_size)
+        game.internal_set_display(display)
+        game.camera.resize(camera_size)
+
+    def present(self, frame: Surface, display: Surface, dirty_rects: Optional[list[Rect]]) -> Optional[list[Rect]]:
+        return dirty_rects
+
+    def display_to_frame_position(
+        self, position: tuple[int, int], frame_size: tuple[int, int], display_size: tuple[int, int]
+    ) -> Vector2:
+        return Vector2(position)
+
+
+class NullPresenter(Presenter):
+    """
+    Never presents anything, e.g for servers or for measuring the game without the cost of presenting frames.
+    """
+
+    def present(self, frame: Surface, display: Surface, dirty_rects: Optional[list[Rect]]) -> Optional[list[Rect]]:
+        return []
+
+
+class RendererPresenter(Presenter):
+    """
+    Draws with SDL's render API: the game's window is reopened with a `Renderer`, and the camera is replaced
+    by a `RendererCamera2D`, which uploads every surface to a texture once and then only copies textures around.
+
+    Pass `accelerated=0` for SDL's software renderer (e.g to run headless), or `1` to require a GPU.
+    With `integer_scale`, frames are scaled by whole factors only, centered between black bars.
+    """
+
+    uses_frame = False
+
+    # SDL renderers may only be used from the thread which created them.
+    supports_render_thread = False
+
+    def __init__(self, accelerated: int = -1, vsync: bool = False, integer_scale: bool = False) -> None:
+        self.accelerated = accelerated
+        self.vsync = vsync
+        self.integer_scale = integer_scale
+
+        self._window: Optional["Window"] = None
+        self._camera: Optional["RendererCamera2D"] = None
+        self._destination: Optional[Rect] = None
+
+    def attach(self, game: "Game"):
+        # Lazy import, since the renderer camera needs `pygame._sdl2`.
+        from pygame._sdl2.video import Renderer, Window
+
+        from pigeonote.renderer_camera import RendererCamera2D
+
+        if not game.owns_display:
+            raise RuntimeError("A renderer can only be used when the game creates its own display.")
+
+        # SDL can't render to the window of the display surface, so it's replaced by a window of the same size.
+        size, title = game.display.get_size(), pg.display.get_caption()[0]
+        pg.display.quit()
+        pg.display.init()
+
+        self._window = Window(title, size)
+        renderer = Renderer(self._window, accelerated=self.accelerated, vsync=self.vsync)
+
+        self._camera = RendererCamera2D(renderer, area=game.camera.area)
+        self._camera.internal_copy_settings(game.camera)
+
+        game.internal_set_display(None)
+        game.internal_set_camera(self._camera)
+
+    def detach(self, game: "Game"):
+        if self._window is None:
+            return
+
+        size, title = self._window.size, self._window.title
+        self._window.destroy()
+        self._window = self._camera = None
+
+        display = pg.display.set_mode(size)
+        pg.display.set_caption(title)
+
+        camera = Camera2D(area=game.camera.area)
+        camera.internal_copy_settings(game.camera)
+
+        game.internal_set_display(display)
+        game.internal_set_camera(camera)
+
+    def _get_destination(self, frame_size: tuple[int, int]) -> Rect:
+        window_rect = Rect((0, 0), self._window.size)
+
+        if not self.integer_scale:
+            return window_rect
+
+        factor = max(1, min(window_rect.width // frame_size[0], window_rect.height // frame_size[1]))
+        destination = Rect(0, 0, frame_size[0] * factor, frame_size[1] * factor)
+        destination.center = window_rect.center
+
+        return destination
+
+    def present(
+        self, frame: Optional[Surface], display: Optional[Surface], dirty_rects: Optional[list[Rect]]
+    ) -> Optional[list[Rect]]:
+        self._destination = self._get_destination(self._camera.area.size)
+        self._camera.present(self._destination)
+
+        # The renderer already showed the frame, so there's nothing left for the display to update.
+        return []
+
+    def display_to_frame_position(
+        self, position: tuple[int, int], frame_size: tuple[int, int], display_size: tuple[int, int]
+    ) -> Vector2:
+        destination = self._destination or self._get_destination(frame_size)
+
+        return Vector2(
+            (position[0] - destination.left) * frame_size[0] / destination.width,
+            (position[1] - destination.top) * frame_size[1] / destination.height,
+        )
@@ -0,0 +1,96 @@
+import math
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+import pygame as pg
+
+from pigeonote.types import Color, get_color_as_hashable
+
+
+class PrimitiveCache:
+    """
+    Bounded LRU caches of rasterized primitives (circles, rounded rectangles and filled squares), keyed by their shape,
+    size, color and outline width.
+
+    The camera draws these primitives by blitting their cached surface, which is batched with the blits around it,
+    instead of rasterizing them again on every frame. At most `max_size` circles, `max_rects` rounded rectangles
+    and `max_filled` filled squares are kept. Each kind is kept apart, so rectangles whose size keeps changing
+    (e.g animated panels) never push circles or squares out.
+    """
+
+    def __init__(self, max_size: int = 512, max_rects: int = 64, max_filled: int = 64) -> None:
+        self.max_size = max_size
+        self.max_rects = max_rects
+        self.max_filled = max_filled
+
+        self._circles = OrderedDict[Hashable, pg.Surface]()
+        self._rects = OrderedDict[Hashable, pg.Surface]()
+        self._filled = OrderedDict[Hashable, pg.Surface]()
+
+    def __len__(self):
+        return len(self._circles) + len(self._rects) + len(self._filled)
+
+    @staticmethod
+    def _get(surfaces: OrderedDict[Hashable, pg.Surface], key: Hashable) -> Optional[pg.Surface]:
+        surface = surfaces.get(key, None)
+        if surface is not None:
+            surfaces.move_to_end(key)
+
+        return surface
+
+    @staticmethod
+    def _add(surfaces: OrderedDict[Hashable, pg.Surface], key: Hashable, surface: pg.Surface, max_size: int):
+        surfaces[key] = surface
+
+        if len(surfaces) > max_size:
+            surfaces.popitem(last=False)
+
+    def get_circle(self, radius: float, color: Color, width: int = 0) -> pg.Surface:
+        """
+        Return a surface with the circle drawn by `pg.draw.circle` on its center pixel.
+        Blitting it with its center pixel on the truncated center of a circle draws the same pixels as `pg.draw.circle`,
+        as long as the color is opaque (translucent pixels would be blended, rather than written as they are).
+        """
+        key = radius, get_color_as_hashable(color), width
+        surface = self._get(self._circles, key)
+
+        if surface is None:
+            center = max(0, math.ceil(radius))
+            surface = pg.Surface((center * 2 + 1, center * 2 + 1), pg.SRCALPHA)
+            pg.draw.circle(surface, color, (center, center), radius, width=width)
+            self._add(self._circles, key, surface, self.max_size)
+
+        return surface
+
+    def get_rect(self, size: tuple[int, int], color: Color, width: int = 0, border_radius: int = -1) -> pg.Surface:
+        """
+        Return a surface of `size` with the rectangle drawn by `pg.draw.rect` over all of it.
+        """
+        key = tuple(size), get_color_as_hashable(color), width, border_radius
+        surface = self._get(self._rects, key)
+
+        if surface is None:
+            surface = pg.Surface(size, pg.SRCALPHA)
+            pg.draw.rect(surface, color, surface.get_rect(), width=width, border_radius=border_radius)
+            self._add(self._rects, key, surface, self.max_rects)
+
+        return surface
+
+    def get_filled(self, size: tuple[int, int], color: Color) -> pg.Surface:
+        """
+        Return a surface of `size` filled with `color`, without per-pixel alpha (e.g for `SquareRenderer`).
+        """
+        key = tuple(size), get_color_as_hashable(color)
+        surface = self._get(self._filled, key)
+
+        if surface is None:
+            surface = pg.Surface(size)
+            surface.fill(color)
+            self._add(self._filled, key, surface, self.max_filled)
+
+        return surface
+
+    def clear(self):
+        self._circles.clear()
+        self._rects.clear()
+        self._filled.clear()
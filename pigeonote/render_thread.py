@@ -0,0 +1,67 @@
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+
+class RenderThread:
+    """
+    Runs jobs one at a time on a background thread, e.g rendering a frame while the next one is simulated.
+    Pygame releases the GIL while it blits, so that work overlaps with the Python code of the next frame.
+
+    An exception raised by a job is raised again on the calling thread by the next `wait` or `submit`.
+    """
+
+    def __init__(self, name: str = "pigeonote-render") -> None:
+        self._jobs = queue.SimpleQueue[Optional[Callable[[], Any]]]()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._error: Optional[BaseException] = None
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def is_busy(self):
+        return not self._idle.is_set()
+
+    def submit(self, job: Callable[[], Any]):
+        """
+        Run `job` on the thread, once the previous job is done.
+        """
+        self.wait()
+
+        self._idle.clear()
+        self._jobs.put(job)
+
+    def wait(self):
+        """
+        Block until the current job (if any) is done.
+        """
+        self._idle.wait()
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def stop(self):
+        """
+        Finish the current job, and end the thread.
+        """
+        try:
+            self.wait()
+        finally:
+            self._jobs.put(None)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+
+            try:
+                job()
+            except BaseException as error:
+                self._error = error
+            finally:
+                self._idle.set()
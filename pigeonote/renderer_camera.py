@@ -0,0 +1,181 @@
+import math
+import weakref
+from typing import Optional
+
+from pygame import FRect, Rect, Surface
+from pygame._sdl2.video import Renderer, Texture
+
+from pigeonote.camera import Camera2D, _QueuedFrame
+from pigeonote.command_buffer import CommandBuffer
+from pigeonote.draw_kind import DrawKind
+from pigeonote.static_layer import StaticLayerCache, StaticLayerFrame
+from pigeonote.types import Color, get_color_as_hashable
+
+
+class RendererCamera2D(Camera2D):
+    """
+    A camera which draws with SDL's render API (`pygame._sdl2.video`) instead of rasterizing into a surface.
+
+    Every surface is uploaded to a texture the first time it's drawn, and then drawn with a texture copy,
+    which the GPU does (or SDL's software renderer, when there's no GPU). Surfaces modified in place must be
+    uploaded again with `invalidate_texture`. Circles and rounded rectangles, which SDL can't draw, are drawn
+    as textures of the surfaces of the primitive cache, so they're blended, even when their color is translucent.
+
+    Frames are rendered into a texture of the size of the camera area, which `present` then copies to the window.
+    """
+
+    def __init__(self, renderer: Renderer, area: Optional[Rect | FRect] = None) -> None:
+        super().__init__(area)
+
+        self._renderer = renderer
+        self._frame = Texture(renderer, self._area.size, target=True)
+
+        # Textures live as long as the surfaces they were uploaded from.
+        self._textures = weakref.WeakKeyDictionary[Surface, Texture]()
+        self._static_textures = dict[StaticLayerCache, tuple[int, Texture]]()
+
+    @property
+    def renderer(self):
+        return self._renderer
+
+    @property
+    def frame_texture(self):
+        """
+        The texture frames are rendered into.
+        """
+        return self._frame
+
+    def get_texture(self, surface: Surface) -> Texture:
+        texture = self._textures.get(surface, None)
+
+        if texture is None:
+            texture = self._textures[surface] = Texture.from_surface(self._renderer, surface)
+
+        return texture
+
+    def invalidate_texture(self, surface: Surface):
+        """
+        Upload `surface` again the next time it's drawn, after it was modified in place.
+        """
+        self._textures.pop(surface, None)
+
+    def resize(self, size: tuple[int, int], surface: Optional[Surface] = None):
+        if surface is not None:
+            raise ValueError(f"{type(self).__name__} renders into a texture, not onto a surface.")
+
+        super().resize(size)
+        self._frame = Texture(self._renderer, self._area.size, target=True)
+
+    def clean_surface(self):
+        renderer = self._renderer
+
+        renderer.target = self._frame
+        renderer.draw_color = "black"
+        renderer.clear()
+
+    def get_rendered_surface(self):
+        """
+        Read the last rendered frame back from the renderer. This is slow, so it's only meant for screenshots and tests.
+        """
+        renderer = self._renderer
+        previous_target = renderer.target
+
+        renderer.target = self._frame
+        surface = renderer.to_surface()
+        renderer.target = previous_target
+
+        return surface
+
+    def present(self, destination: Optional[Rect] = None):
+        """
+        Copy the rendered frame onto the window (into `destination`, or stretched over all of it), and show it.
+        """
+        renderer = self._renderer
+
+        renderer.target = None
+        renderer.draw_color = "black"
+        renderer.clear()
+
+        self._frame.draw(dstrect=destination)
+        renderer.present()
+
+    def fill(self, color: Color, area: Rect | FRect):
+        screen_rect = self.world_rect_to_screen_rect(area)
+
+        self._renderer.target = self._frame
+        self._renderer.draw_color = color
+        self._renderer.fill_rect(screen_rect)
+
+        if self._dirty_rect_tracker is not None:
+            key = "fill", get_color_as_hashable(color), tuple(screen_rect)
+            self._queued_frame.draws.append((key, Rect(screen_rect)))
+
+    def draw_rect_outline(self, rect: Rect | FRect, color: Color = "green", outline_width: int = 1):
+        screen_rect = self.world_rect_to_screen_rect(rect)
+
+        self._renderer.target = self._frame
+        self._draw_rect(color, screen_rect, outline_width)
+
+        if self._dirty_rect_tracker is not None:
+            key = "outline", get_color_as_hashable(color), tuple(screen_rect), outline_width
+            self._queued_frame.draws.append((key, Rect(screen_rect)))
+
+    def _draw_rect(self, color: Color, rect: Rect | FRect, width: int):
+        renderer = self._renderer
+        renderer.draw_color = color
+
+        if width <= 0:
+            renderer.fill_rect(rect)
+            return
+
+        # SDL only draws outlines of a single pixel, so thicker outlines are drawn one pixel further in at a time.
+        for inset in range(min(width, math.ceil(min(rect.width, rect.height) / 2))):
+            renderer.draw_rect(rect.inflate(-inset * 2, -inset * 2))
+
+    def _draw_layer(self, command_buffer: CommandBuffer, static_frame: Optional[StaticLayerFrame], frame: _QueuedFrame):
+        renderer = self._renderer
+        renderer.target = self._frame
+
+        # Static layers are still cached in a surface, which is only uploaded again when it was redrawn.
+        if static_frame is not None:
+            cache = static_frame.cache
+            surface = cache.update(command_buffer, static_frame)
+            if surface is None:
+                return
+
+            build_count, texture = self._static_textures.get(cache, (-1, None))
+            if build_count != cache.build_count:
+                texture = Texture.from_surface(renderer, surface)
+                self._static_textures[cache] = cache.build_count, texture
+
+            texture.draw(dstrect=static_frame.screen_position)
+            return
+
+        get_texture = self.get_texture
+
+        for kind, args in command_buffer.iter_commands():
+            if kind is DrawKind.BLITS:
+                for surface, screen_position in args:
+                    get_texture(surface).draw(dstrect=screen_position)
+
+            elif kind is DrawKind.LINE:
+                color, start, end = args
+                renderer.draw_color = color
+                renderer.draw_line(start, end)
+
+            elif kind is DrawKind.RECT:
+                color, rect, width, border_radius = args
+
+                if border_radius > 0:
+                    rect = Rect(rect)
+                    get_texture(self._primitive_cache.get_rect(rect.size, color, width, border_radius)).draw(
+                        dstrect=rect.topleft
+                    )
+                else:
+                    self._draw_rect(color, rect, width)
+
+            elif kind is DrawKind.CIRCLE:
+                color, center, radius, width = args
+                surface = self._primitive_cache.get_circle(radius, color, width)
+                offset = surface.width // 2
+                get_texture(surface).draw(dstrect=(int(center[0]) - offset, int(center[1]) - offset))
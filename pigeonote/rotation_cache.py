@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from typing import Optional
+
+import pygame as pg
+
+
+class RotationCache:
+    """
+    A bounded LRU cache of rotated surfaces, keyed by the source surface and its angle quantized to `angle_step`.
+
+    Renderers drawing the same surface share its rotations, so many sprites spinning at once only rotate
+    each surface once per step. Surfaces with a rotation sheet (see `bake` and `add_sheet`) always use
+    the frames of their sheet instead.
+
+    Angles are in degrees, counter-clockwise like `pg.transform.rotate`.
+    """
+
+    def __init__(self, max_size: int = 2048, angle_step: float = 1.0) -> None:
+        self.max_size = max_size
+
+        self._rotated = OrderedDict[tuple[pg.Surface, int], pg.Surface]()
+        self._sheets = dict[pg.Surface, list[pg.Surface]]()
+
+        self._steps = 360
+        self.angle_step = angle_step
+
+    @property
+    def angle_step(self):
+        return 360 / self._steps
+
+    @angle_step.setter
+    def angle_step(self, angle_step: float):
+        if not 0 < angle_step <= 360:
+            raise ValueError(f"The angle step must be between 0 and 360 degrees (got {angle_step}).")
+
+        self._steps = max(1, round(360 / angle_step))
+
+        # Rotations are keyed by their step, so the ones of the previous step size don't apply anymore.
+        self._rotated.clear()
+
+    def __len__(self):
+        return len(self._rotated)
+
+    def get(self, surface: pg.Surface, angle: float) -> pg.Surface:
+        """
+        Return `surface` rotated by `angle`, rounded to the closest step (or frame of its rotation sheet).
+        """
+        sheet = self._sheets.get(surface, None)
+        if sheet is not None:
+            return sheet[round(angle * len(sheet) / 360) % len(sheet)]
+
+        step = round(angle * self._steps / 360) % self._steps
+        if step == 0:
+            return surface
+
+        key = surface, step
+        rotated = self._rotated.get(key, None)
+
+        if rotated is None:
+            rotated = pg.transform.rotate(surface, step * 360 / self._steps)
+            self._rotated[key] = rotated
+
+            if len(self._rotated) > self.max_size:
+                self._rotated.popitem(last=False)
+
+        else:
+            self._rotated.move_to_end(key)
+
+        return rotated
+
+    def bake(self, surface: pg.Surface, frame_count: Optional[int] = None):
+        """
+        Rotate `surface` to every step up front (or into `frame_count` evenly spaced frames), into a rotation sheet
+        which is never evicted.
+        """
+        frame_count = frame_count or self._steps
+        frames = [surface] + [pg.transform.rotate(surface, i * 360 / frame_count) for i in range(1, frame_count)]
+
+        self._sheets[surface] = frames
+
+    def add_sheet(self, surface: pg.Surface, sheet: pg.Surface, frame_count: int):
+        """
+        Use a pre-rendered rotation sheet for `surface`: `frame_count` frames of equal width laid out from left
+        to right, where frame `i` is `surface` rotated by `i * 360 / frame_count` degrees.
+        """
+        if frame_count < 1 or sheet.width % frame_count:
+            raise ValueError(f"A sheet {sheet.width} pixels wide can't be split into {frame_count} frames.")
+
+        frame_width = sheet.width // frame_count
+        self._sheets[surface] = [
+            sheet.subsurface((i * frame_width, 0, frame_width, sheet.height)) for i in range(frame_count)
+        ]
+
+    def forget(self, surface: pg.Surface):
+        """
+        Drop the rotations and rotation sheet of `surface`, e.g after drawing on it.
+        """
+        self._sheets.pop(surface, None)
+
+        for key in [key for key in self._rotated if key[0] is surface]:
+            del self._rotated[key]
+
+    def clear(self):
+        self._rotated.clear()
+        self._sheets.clear()
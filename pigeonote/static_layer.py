@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import pygame as pg
+from pygame import Rect, Surface
+
+from pigeonote.command_buffer import CommandBuffer
+
+
+class StaticLayerCache:
+    """
+    The surface a static layer is drawn into. Only used while rendering frames (on the render thread of
+    a pipelined game), while the `StaticLayer` it belongs to is only used while queueing them.
+    """
+
+    def __init__(self) -> None:
+        self._surface: Optional[Surface] = None
+        self._baked_commands: Optional[list[tuple[Any, Any]]] = None
+        self._baked_invalidation_count = 0
+        self._build_count = 0
+
+    @property
+    def build_count(self):
+        """
+        How many times the cache was drawn.
+        """
+        return self._build_count
+
+    def update(self, command_buffer: CommandBuffer, frame: "StaticLayerFrame") -> Optional[Surface]:
+        """
+        Rebuild the cache if different commands were queued since it was built, or if the layer was invalidated,
+        and return it (or `None` when nothing is drawn on the layer).
+        """
+        commands = command_buffer.snapshot()
+
+        if commands != self._baked_commands or frame.invalidation_count != self._baked_invalidation_count:
+            if self._surface is None or self._surface.get_size() != frame.size:
+                self._surface = Surface(frame.size, pg.SRCALPHA)
+
+            self._surface.fill((0, 0, 0, 0))
+            command_buffer.execute(self._surface)
+            self._baked_commands = commands
+            self._baked_invalidation_count = frame.invalidation_count
+            self._build_count += 1
+
+        return self._surface if commands else None
+
+
+@dataclass
+class StaticLayerFrame:
+    """
+    How a static layer is drawn in a single frame, captured when the frame is handed over to be rendered.
+    """
+
+    cache: StaticLayerCache
+    screen_position: tuple[int, int]
+    size: tuple[int, int]
+    invalidation_count: int
+
+
+class StaticLayer:
+    """
+    The cached output of a camera layer whose contents rarely change.
+
+    The layer is drawn into a surface `margin` pixels larger than the camera area on every side, anchored in world space.
+    Draws on the layer are queued relative to that anchor, so as long as the camera stays within the margin, the same
+    contents queue the same commands, and the cached surface is reused instead of drawing them again.
+    """
+
+    def __init__(self, margin: int) -> None:
+        self.margin = margin
+
+        self._origin = 0, 0
+        self._size: Optional[tuple[int, int]] = None
+        self._is_anchored = False
+
+        # Invalidations are counted and handed to the cache with every frame, rather than dropping what it baked,
+        # so the cache is never touched while queueing a frame.
+        self._invalidation_count = 0
+        self._cache = StaticLayerCache()
+
+    @property
+    def origin(self):
+        """
+        The world space position of the topleft of the cache.
+        """
+        return self._origin
+
+    @property
+    def build_count(self):
+        """
+        How many times the cache was drawn, as of the last rendered frame.
+        """
+        return self._cache.build_count
+
+    def invalidate(self):
+        """
+        Rebuild the cache on the next frame, e.g after a surface drawn on the layer was modified.
+        """
+        self._invalidation_count += 1
+
+    def _get_size(self, area: Rect) -> tuple[int, int]:
+        return area.width + self.margin * 2, area.height + self.margin * 2
+
+    def anchor(self, area: Rect) -> tuple[int, int, int, int]:
+        """
+        Return the world space origin and the size of the cache for the current frame.
+        The cache is moved the first time in a frame that the camera is found beyond its margin.
+        """
+        width, height = self._get_size(area)
+
+        if not self._is_anchored:
+            self._is_anchored = True
+
+            origin_x, origin_y = self._origin
+            if (
+                self._size != (width, height)
+                or area.left < origin_x
+                or area.top < origin_y
+                or area.right > origin_x + width
+                or area.bottom > origin_y + height
+            ):
+                self._origin = int(area.left) - self.margin, int(area.top) - self.margin
+                self._size = width, height
+                self.invalidate()
+
+        return self._origin[0], self._origin[1], width, height
+
+    def capture(self, area: Rect) -> StaticLayerFrame:
+        """
+        Return how the layer is drawn in the frame whose draws were just queued, for the camera `area` of that frame.
+        """
+        return StaticLayerFrame(
+            self._cache, self.get_screen_position(area), self._get_size(area), self._invalidation_count
+        )
+
+    def release(self):
+        """
+        Let the cache move again, once all the draws of a frame were queued.
+        """
+        self._is_anchored = False
+
+    def get_screen_position(self, area: Rect) -> tuple[int, int]:
+        """
+        Where the cache is drawn on the camera surface.
+        """
+        return self._origin[0] - area.left, self._origin[1] - area.top
@@ -22,3 +22,24 @@ def get_coords_as_tuple(coord: Coordinate) -> tuple[int | float, int | float]:
 
     assert isinstance(coord, tuple)
     return coord
+
+
+def is_color_opaque(color: Color) -> bool:
+    """
+    Whether `color` has no transparency. Colors given as mapped pixel values (ints) are never considered opaque,
+    since their alpha depends on the surface they're drawn on.
+    """
+    if isinstance(color, int):
+        return False
+
+    if isinstance(color, tuple) and len(color) == 3:
+        return True
+
+    return PyGameColor(color).a == 255
+
+
+def get_color_as_hashable(color: Color) -> int | str | tuple[int, ...]:
+    if isinstance(color, PyGameColor):
+        return tuple(color)
+
+    return color
@@ -0,0 +1,12 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency (`pip install pigeonote[numpy]`), see `require_numpy`.
+    np = None
+
+
+def require_numpy(feature: str):
+    """
+    Raise a `RuntimeError` when numpy isn't installed, saying that `feature` (e.g "particle systems") needs it.
+    """
+    if np is None:
+        raise RuntimeError(f"numpy is required for {feature} (`pip install numpy`).")
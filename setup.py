@@ -8,4 +8,5 @@ if __name__ == "__main__":
         author="Emanuel Lvovsky",
         packages=find_packages(include="pigeonote.*"),
         install_requires=["pygame-ce>=2.5.0"],
+        extras_require={"numpy": ["numpy"]},
     )
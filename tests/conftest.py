@@ -0,0 +1,95 @@
+import os
+from typing import Callable
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pytest
+
+import pigeonote as pn
+from pigeonote.components import RectCollider
+
+
+class ContactRecorder(pn.Component):
+    def py_init(self):
+        self.events = list[tuple[str, str]]()
+
+    def on_collision_enter(self, other: pn.Collider):
+        self.events.append(("enter", other.entity.name))
+
+    def on_collision_exit(self, other: pn.Collider):
+        self.events.append(("exit", other.entity.name))
+
+
+class Drawer(pn.Component):
+    """
+    Runs `draw` with the camera of the game on every frame.
+    """
+
+    def py_init(self):
+        self.draw = lambda camera: None
+
+    def render(self):
+        self.draw(self.camera)
+
+
+@pytest.fixture
+def game():
+    """
+    A headless game, torn down along with its physics after the test, since both are singletons.
+    """
+    game = pn.Game(target_fps=0)
+    yield game
+
+    game.pipelined = False
+    pn.Game.instance = None
+    pn.Physics._instance = None
+
+
+@pytest.fixture
+def physics(game: pn.Game):
+    return pn.Physics.get_instance()
+
+
+@pytest.fixture
+def create_box(game: pn.Game):
+    """
+    Create an entity with a rect collider, which records its contacts when it `listen`s to them.
+    """
+
+    def create(position, name: str, size=(10, 10), listen=False) -> RectCollider:
+        entity = game.create_entity(position, name)
+        collider = entity.create_component(RectCollider)
+        collider.size = size
+
+        if listen:
+            entity.create_component(ContactRecorder)
+
+        return collider
+
+    return create
+
+
+@pytest.fixture
+def get_events():
+    """
+    Return the contact events recorded by a collider created with `create_box(..., listen=True)`.
+    """
+
+    def get(collider: pn.Collider) -> list[tuple[str, str]]:
+        return collider.entity.get_component_by_type(ContactRecorder).events
+
+    return get
+
+
+@pytest.fixture
+def create_drawer(game: pn.Game):
+    """
+    Create an entity which draws with `draw(camera)` on every frame.
+    """
+
+    def create(draw: Callable[[pn.Camera2D], None]) -> Drawer:
+        drawer = game.create_entity((0, 0), "drawer").create_component(Drawer)
+        drawer.draw = draw
+        return drawer
+
+    return create
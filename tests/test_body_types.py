@@ -0,0 +1,51 @@
+import pigeonote as pn
+
+
+def test_static_colliders_never_touch_each_other(game, physics, create_box):
+    a = create_box((0, 0), "a", listen=True)
+    b = create_box((5, 0), "b", listen=True)
+    a.body_type = b.body_type = pn.BodyType.STATIC
+
+    game.update()
+    assert physics.contacts == set()
+
+    b.body_type = pn.BodyType.KINEMATIC
+    game.update()
+    assert physics.contacts == {(a, b)}
+
+
+def test_colliders_fall_asleep_and_wake_up(game, physics, create_box):
+    physics.sleep_after_steps = 3
+
+    dynamic = create_box((0, 0), "dynamic")
+    kinematic = create_box((100, 0), "kinematic")
+    static = create_box((200, 0), "static")
+    kinematic.body_type = pn.BodyType.KINEMATIC
+    static.body_type = pn.BodyType.STATIC
+
+    for _ in range(5):
+        game.update()
+
+    assert dynamic.is_sleeping and kinematic.is_sleeping
+    assert not static.is_sleeping
+
+    dynamic.entity.position = (1, 0)
+    kinematic.entity.position = (101, 0)
+    assert not dynamic.is_sleeping and not kinematic.is_sleeping
+
+    game.update()
+    assert not dynamic.is_sleeping and not kinematic.is_sleeping
+
+
+def test_sleeping_colliders_keep_their_contacts(game, physics, create_box, get_events):
+    physics.sleep_after_steps = 2
+
+    a = create_box((0, 0), "a", listen=True)
+    b = create_box((5, 0), "b")
+
+    for _ in range(5):
+        game.update()
+
+    assert a.is_sleeping and b.is_sleeping
+    assert physics.contacts == {(a, b)}
+    assert get_events(a) == [("enter", "b")]
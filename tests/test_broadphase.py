@@ -0,0 +1,44 @@
+from pygame import Rect
+
+
+def test_candidates_only_come_from_the_cells_a_rect_touches(game, physics, create_box):
+    boxes = {(x, y): create_box((x * 200, y * 200), f"{x}, {y}") for x in range(10) for y in range(10)}
+    game.update()
+
+    assert physics._get_candidates(Rect(-5, -5, 10, 10)) == {boxes[0, 0]}
+    assert physics._get_candidates(Rect(390, 590, 20, 20)) == {boxes[2, 3]}
+    assert physics._get_candidates(Rect(100, 100, 10, 10)) == set()
+
+
+def test_queries_covering_more_cells_than_colliders_scan_every_collider(game, physics, create_box):
+    a = create_box((0, 0), "a")
+    b = create_box((1000, 1000), "b")
+    game.update()
+
+    assert physics._get_candidates(Rect(-500, -500, 2000, 2000)) == {a, b}
+    assert set(physics.check_rect_overlap(Rect(-500, -500, 2000, 2000))) == {a, b}
+
+
+def test_moved_colliders_change_cells(game, physics, create_box):
+    box = create_box((0, 0), "box")
+    others = [create_box((-1000, y * 100), f"other {y}") for y in range(10)]
+    game.update()
+
+    box.entity.position = (500, 500)
+    game.update()
+
+    assert physics.check_rect_overlap(Rect(-5, -5, 10, 10)) == []
+    assert physics.check_rect_overlap(Rect(495, 495, 10, 10)) == [box]
+    assert physics._get_candidates(Rect(-5, -5, 10, 10)) == set()
+    assert physics._get_candidates(Rect(-1005, -5, 10, 10)) == {others[0]}
+
+
+def test_changing_the_cell_size_rebuilds_the_hash(game, physics, create_box):
+    boxes = [create_box((x * 40, 0), f"box {x}", size=(30, 30)) for x in range(10)]
+    game.update()
+
+    physics.cell_size = 16
+    assert physics.check_rect_overlap(Rect(115, -2, 10, 4)) == [boxes[3]]
+
+    for box in boxes:
+        assert physics._collider_cells[box] == physics._get_cell_range(box.get_bounds())
@@ -0,0 +1,37 @@
+from pygame import Rect
+
+
+def test_bounds_are_cached_until_the_collider_changes(game, create_box):
+    box = create_box((0, 0), "box")
+
+    bounds = box.get_bounds()
+    assert bounds == Rect(-5, -5, 10, 10)
+    assert box.get_bounds() is bounds
+
+    box.entity.position = (10, 0)
+    assert box.get_bounds() == Rect(5, -5, 10, 10)
+
+    box.size = (20, 20)
+    assert box.get_bounds() == Rect(0, -10, 20, 20)
+
+    box.offset = (0, 10)
+    assert box.get_bounds() == Rect(0, 0, 20, 20)
+
+
+def test_entity_position_is_the_stored_vector(game):
+    entity = game.create_entity((1, 2), "entity")
+
+    assert entity.position is entity.position
+    assert entity.position == (1, 2)
+
+
+def test_moving_the_position_in_place_moves_the_collider(game, physics, create_box):
+    box = create_box((0, 0), "box")
+    game.update()
+
+    box.entity.position.x += 100
+    game.update()
+
+    assert box.get_bounds() == Rect(95, -5, 10, 10)
+    assert physics.check_rect_overlap(Rect(-5, -5, 10, 10)) == []
+    assert physics.check_rect_overlap(Rect(95, -5, 10, 10)) == [box]
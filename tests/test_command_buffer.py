@@ -0,0 +1,80 @@
+import pygame as pg
+from pygame import Rect, Surface
+
+import pigeonote as pn
+from pigeonote.command_buffer import CommandBuffer
+from pigeonote.draw_kind import DrawKind
+
+
+def create_surface(color, size=(10, 10)) -> Surface:
+    surface = Surface(size)
+    surface.fill(color)
+    return surface
+
+
+def test_consecutive_blits_are_gathered_into_runs():
+    red, blue = create_surface("red"), create_surface("blue")
+    buffer = CommandBuffer()
+
+    buffer.add_blit(red, (0, 0))
+    buffer.add_blit(blue, (5, 0))
+    buffer.add(DrawKind.LINE, ("white", (0, 0), (10, 0)))
+    buffer.add_blit(red, (0, 5))
+
+    assert len(buffer) == 3
+    assert buffer.snapshot() == [
+        (DrawKind.BLITS, ((red, (0, 0)), (blue, (5, 0)))),
+        (DrawKind.LINE, ("white", (0, 0), (10, 0))),
+        (DrawKind.BLITS, ((red, (0, 5)),)),
+    ]
+
+
+def test_commands_are_executed_in_order():
+    target = Surface((20, 20))
+    buffer = CommandBuffer()
+
+    buffer.add_blit(create_surface("red"), (0, 0))
+    buffer.add(DrawKind.RECT, ("green", Rect(5, 0, 10, 10), 0, 0))
+    buffer.add_blit(create_surface("blue"), (10, 0))
+    buffer.execute(target)
+
+    assert target.get_at((2, 2)) == pg.Color("red")
+    assert target.get_at((7, 2)) == pg.Color("green")
+    assert target.get_at((12, 2)) == pg.Color("blue")
+
+
+def test_cleared_buffers_reuse_their_blit_runs():
+    buffer = CommandBuffer()
+    surface = create_surface("red")
+
+    buffer.add_blit(surface, (0, 0))
+    blit_run = buffer.snapshot()[0][1]
+    run = buffer._blit_runs[0]
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert run == []
+    assert buffer._args == [None]
+    assert blit_run == ((surface, (0, 0)),)
+
+    buffer.add_blit(surface, (1, 1))
+    assert buffer._blit_runs == [run]
+    assert run == [(surface, (1, 1))]
+
+
+def test_layers_are_drawn_from_the_lowest_up():
+    camera = pn.Camera2D(Rect(0, 0, 20, 20))
+
+    # Layers are drawn in order whatever order they were first queued in.
+    camera.blit(create_surface("blue"), (0, 0), layer=2)
+    camera.blit(create_surface("red"), (0, 0), layer=0)
+    camera.blit(create_surface("green", (5, 5)), (0, 0), layer=-1)
+    camera.blit(create_surface("white", (5, 5)), (0, 0), layer=5)
+
+    surface = camera.render_frame()
+    assert surface.get_at((2, 2)) == pg.Color("white")
+    assert surface.get_at((7, 7)) == pg.Color("blue")
+    assert [layer for layer, _, _ in camera._render_order] == [-1, 0, 2, 5]
+
+    # The buffers are emptied once rendered.
+    assert all(len(buffer) == 0 for _, buffer, _ in camera._render_order)
@@ -0,0 +1,42 @@
+def test_contacts_enter_stay_and_exit(game, physics, create_box, get_events):
+    a = create_box((0, 0), "a", listen=True)
+    b = create_box((5, 0), "b", listen=True)
+
+    game.update()
+    assert get_events(a) == [("enter", "b")]
+    assert get_events(b) == [("enter", "a")]
+    assert physics.contacts == {(a, b)}
+
+    # Touching colliders stay in contact without entering again, whether they move or not.
+    for position in ((6, 0), (6, 0), (4, 1)):
+        b.entity.position = position
+        game.update()
+
+    assert get_events(a) == [("enter", "b")]
+    assert physics.contacts == {(a, b)}
+
+    b.entity.position = (100, 0)
+    game.update()
+    assert get_events(a) == [("enter", "b"), ("exit", "b")]
+    assert get_events(b) == [("enter", "a"), ("exit", "a")]
+    assert physics.contacts == set()
+
+
+def test_destroyed_collider_exits_its_contacts(game, physics, create_box, get_events):
+    a = create_box((0, 0), "a", listen=True)
+    b = create_box((5, 0), "b")
+
+    game.update()
+    game.destroy(b.entity)
+    game.update()
+
+    assert get_events(a) == [("enter", "b"), ("exit", "b")]
+    assert physics.contacts == set()
+
+
+def test_contacts_only_hold_pairs_with_a_listener(game, physics, create_box):
+    create_box((0, 0), "a")
+    create_box((5, 0), "b")
+
+    game.update()
+    assert physics.contacts == set()
@@ -0,0 +1,45 @@
+from pygame import Rect, Surface
+
+import pigeonote as pn
+
+
+def test_draws_outside_of_the_camera_are_culled():
+    camera = pn.Camera2D(Rect(0, 0, 100, 100))
+    surface = Surface((10, 10))
+
+    camera.blit(surface, (10, 10))
+    camera.blit(surface, (-5, 95))  # Partially visible.
+    camera.blit(surface, (-10, 0))  # Only touches the left edge.
+    camera.blit(surface, (200, 200))
+    camera.draw_line((-50, -10), (150, -10), "red")
+    camera.draw_line((-50, 50), (150, 50), "red")
+    camera.draw_rect(Rect(100, 0, 10, 10), "red")
+    camera.draw_circle((-20, 50), 10, "red")
+    camera.draw_circle((-5, 50), 10, "red")
+
+    # The counters describe the last rendered frame.
+    assert camera.drawn_count == camera.culled_count == 0
+
+    camera.render_frame()
+    assert camera.drawn_count == 4
+    assert camera.culled_count == 5
+    assert sum(len(buffer) for _, buffer, _ in camera._render_order) == 0
+
+    camera.render_frame()
+    assert camera.drawn_count == camera.culled_count == 0
+
+
+def test_culling_follows_the_camera():
+    camera = pn.Camera2D(Rect(0, 0, 100, 100))
+    surface = Surface((10, 10))
+
+    camera.center = (500, 500)
+    camera.blit(surface, (10, 10))
+    camera.blit(surface, (500, 500))
+    camera.render_frame()
+
+    assert (camera.drawn_count, camera.culled_count) == (1, 1)
+    assert camera.is_visible(Rect(500, 500, 1, 1))
+    assert not camera.is_visible(Rect(10, 10, 10, 10))
+    assert camera.is_visible_around((445, 500), 6)
+    assert not camera.is_visible_around((440, 500), 6)
@@ -0,0 +1,62 @@
+import pygame as pg
+from pygame import Rect, Surface
+
+from pigeonote.dirty_rects import DirtyRectTracker
+
+
+def test_tracker_finds_added_removed_and_moved_draws():
+    tracker = DirtyRectTracker((100, 100))
+
+    tracker.add_draw("a", Rect(0, 0, 10, 10))
+    tracker.add_draw("b", Rect(50, 50, 10, 10))
+    assert tracker.finish_frame() == [Rect(0, 0, 100, 100)]
+
+    tracker.add_draw("a", Rect(0, 0, 10, 10))
+    tracker.add_draw("b", Rect(50, 50, 10, 10))
+    assert tracker.finish_frame() == []
+
+    tracker.add_draw("a", Rect(0, 0, 10, 10))
+    tracker.add_draw("c", Rect(20, 20, 10, 10))
+    assert tracker.finish_frame() == [Rect(19, 19, 12, 12), Rect(49, 49, 12, 12)]
+
+    tracker.mark(Rect(80, 80, 5, 5))
+    assert tracker.finish_frame() == [Rect(79, 79, 7, 7), Rect(0, 0, 11, 11), Rect(19, 19, 12, 12)]
+
+
+def test_tracker_marks_the_whole_frame_when_too_much_changed():
+    tracker = DirtyRectTracker((100, 100), max_rects=2)
+    tracker.finish_frame()
+
+    for x in range(3):
+        tracker.add_draw(x, Rect(x * 20, 0, 5, 5))
+
+    assert tracker.finish_frame() == [Rect(0, 0, 100, 100)]
+
+    tracker.add_draw("big", Rect(0, 0, 80, 80))
+    tracker.finish_frame()
+    assert tracker.finish_frame() == [Rect(0, 0, 100, 100)]
+
+
+def test_dirty_rects_follow_the_draw_order(game, create_drawer):
+    red, blue = Surface((10, 10)), Surface((10, 10))
+    red.fill("red")
+    blue.fill("blue")
+
+    surfaces = [red, blue]
+    create_drawer(lambda camera: [camera.blit(surface, (-5, -5)) for surface in surfaces])
+
+    game.use_dirty_rects = True
+    game.process()
+    assert game.camera.dirty_rects == [Rect((0, 0), game.camera.area.size)]
+
+    game.process()
+    assert game.camera.dirty_rects == []
+
+    # The same draws in another order change the pixels they overlap.
+    surfaces.reverse()
+    game.process()
+
+    surface = game.camera.get_rendered_surface()
+    assert surface.get_at((surface.width // 2, surface.height // 2)) == pg.Color("red")
+    assert game.camera.dirty_rects
+    assert any(rect.collidepoint(surface.width // 2, surface.height // 2) for rect in game.camera.dirty_rects)
@@ -0,0 +1,77 @@
+import pigeonote as pn
+
+
+class EnterListener(pn.Component):
+    def py_init(self):
+        self.entered = list[str]()
+
+    def on_collision_enter(self, other: pn.Collider):
+        self.entered.append(other.entity.name)
+
+
+class ExitListener(pn.Component):
+    def on_collision_exit(self, other: pn.Collider):
+        pass
+
+
+class SelfDestroyingListener(pn.Component):
+    def on_collision_enter(self, other: pn.Collider):
+        self.entity.destroy_component(self)
+
+
+def test_listeners_are_registered_per_event(game):
+    entity = game.create_entity((0, 0), "entity")
+    entity.create_component(pn.Component)
+
+    enter = entity.create_component(EnterListener)
+    exit_ = entity.create_component(ExitListener)
+
+    assert entity.get_event_listeners(pn.ComponentEvent.COLLISION_ENTER) == [enter]
+    assert entity.get_event_listeners(pn.ComponentEvent.COLLISION_EXIT) == [exit_]
+
+    entity.destroy_component(enter)
+    assert entity.get_event_listeners(pn.ComponentEvent.COLLISION_ENTER) == []
+    assert entity.get_event_listeners(pn.ComponentEvent.COLLISION_EXIT) == [exit_]
+
+
+def test_callbacks_are_called_when_listeners_change(game):
+    entity = game.create_entity((0, 0), "entity")
+    calls = list[None]()
+    entity.add_event_listeners_callback(lambda: calls.append(None))
+
+    entity.create_component(pn.Component)
+    assert len(calls) == 0
+
+    listener = entity.create_component(EnterListener)
+    assert len(calls) == 1
+
+    entity.destroy_component(listener)
+    assert len(calls) == 2
+
+
+def test_only_colliders_with_listeners_are_tracked(game, physics, create_box):
+    a = create_box((0, 0), "a")
+    b = create_box((5, 0), "b")
+    game.update()
+    assert physics._listening_colliders == set()
+
+    # A collider which starts listening enters the contacts it already had.
+    listener = a.entity.create_component(EnterListener)
+    game.update()
+    assert physics._listening_colliders == {a}
+    assert listener.entered == ["b"]
+
+    a.entity.destroy_component(listener)
+    game.update()
+    assert physics._listening_colliders == set()
+
+
+def test_listeners_can_be_destroyed_while_their_event_is_dispatched(game, physics, create_box):
+    a = create_box((0, 0), "a")
+    a.entity.create_component(SelfDestroyingListener)
+    listener = a.entity.create_component(EnterListener)
+    create_box((5, 0), "b")
+
+    game.update()
+    assert listener.entered == ["b"]
+    assert a.entity.get_event_listeners(pn.ComponentEvent.COLLISION_ENTER) == [listener]
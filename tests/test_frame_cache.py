@@ -0,0 +1,102 @@
+import pytest
+from pygame import Rect, Surface
+
+import pigeonote as pn
+from pigeonote.components import AnimatedSpriteRenderer
+from pigeonote.frame_cache import FrameCache, get_grid_frame_rects
+
+
+def create_sprite(game: pn.Game, sheet: Surface, **settings) -> AnimatedSpriteRenderer:
+    sprite = game.create_entity((0, 0)).create_component(AnimatedSpriteRenderer)
+    sprite.sheet, sprite.frame_size = sheet, (16, 16)
+
+    for name, value in settings.items():
+        setattr(sprite, name, value)
+
+    return sprite
+
+
+def test_frame_cache_counts_references():
+    sheet = Surface((32, 16))
+    rotation_cache = pn.RotationCache()
+    frame_cache = FrameCache(rotation_cache)
+    rects = get_grid_frame_rects(sheet.get_size(), (16, 16))
+
+    first = frame_cache.acquire(sheet, rects)
+    second = frame_cache.acquire(sheet, rects)
+
+    assert len(frame_cache) == 2
+    assert first == second
+    assert first[1].get_offset() == (16, 0)
+    assert frame_cache.get_reference_count(sheet, rects[0]) == 2
+
+    rotation_cache.get(first[0], 90)
+    assert len(rotation_cache) == 1
+
+    frame_cache.release(sheet, rects)
+    assert len(frame_cache) == 2
+    assert len(rotation_cache) == 1
+
+    # The last release drops the frames, along with their rotations.
+    frame_cache.release(sheet, rects)
+    assert len(frame_cache) == 0
+    assert len(rotation_cache) == 0
+
+    with pytest.raises(LookupError):
+        frame_cache.release(sheet, rects[:1])
+
+
+def test_grid_frame_rects():
+    assert get_grid_frame_rects((40, 20), (16, 10)) == [
+        Rect(0, 0, 16, 10),
+        Rect(16, 0, 16, 10),
+        Rect(0, 10, 16, 10),
+        Rect(16, 10, 16, 10),
+    ]
+
+    with pytest.raises(ValueError):
+        get_grid_frame_rects((40, 20), (0, 10))
+
+
+def test_animated_sprites_share_and_release_frames(game):
+    sheet = Surface((64, 16))
+    sprites = [create_sprite(game, sheet) for _ in range(3)]
+
+    game.process()
+    assert len(game.frame_cache) == 4
+    assert game.frame_cache.get_reference_count(sheet, (0, 0, 16, 16)) == 3
+    assert sprites[0].sprite_surface is sprites[1].sprite_surface
+
+    for sprite in sprites:
+        game.destroy(sprite.entity)
+
+    assert len(game.frame_cache) == 0
+
+
+def test_animations_advance_with_time(game):
+    sheet = Surface((48, 16))
+    looping = create_sprite(game, sheet, fps=10)
+    once = create_sprite(game, sheet, fps=10, loop=False)
+
+    # Updating the game (without processing a frame) steps the animations by 0.1 seconds, a frame at 10 fps.
+    indices = list[tuple[int, int]]()
+    for _ in range(4):
+        game.update()
+        indices.append((looping.frame_index, once.frame_index))
+
+    assert indices == [(1, 1), (2, 2), (0, 2), (1, 2)]
+    assert once.is_finished and not looping.is_finished
+    assert looping.sprite_surface.get_offset() == (16, 0)
+
+
+def test_changing_the_sheet_releases_its_frames(game):
+    sheet, other_sheet = Surface((32, 16)), Surface((64, 16))
+    sprite = create_sprite(game, sheet)
+
+    game.update()
+    sprite.sheet = other_sheet
+    game.update()
+
+    assert game.frame_cache.get_reference_count(sheet, (0, 0, 16, 16)) == 0
+    assert game.frame_cache.get_reference_count(other_sheet, (0, 0, 16, 16)) == 1
+    assert sprite.frame_count == 4
@@ -0,0 +1,58 @@
+import pytest
+from pygame import Rect, Vector2
+
+import pigeonote as pn
+
+
+def test_rewind_query_needs_history(game, physics, create_box):
+    create_box((0, 0), "a")
+    game.update()
+
+    assert physics.history_ticks == 0
+    with pytest.raises(RuntimeError):
+        physics.rewind_query(physics.tick, Rect(-5, -5, 10, 10))
+
+
+def test_rewind_query_sees_past_bounds(game, physics, create_box):
+    physics.history_ticks = 10
+
+    a = create_box((0, 0), "a")
+    game.update()
+    past_tick = physics.tick
+
+    a.entity.position = (100, 0)
+    for _ in range(3):
+        game.update()
+
+    assert physics.rewind_query(past_tick, Rect(-2, -2, 4, 4)) == [a]
+    assert physics.rewind_query(physics.tick, Rect(-2, -2, 4, 4)) == []
+    assert physics.rewind_query(physics.tick, Rect(98, -2, 4, 4)) == [a]
+
+    hit = physics.rewind_query(past_tick, pn.Ray(Vector2(-50, 0), Vector2(1, 0)))
+    assert hit.collider is a and hit.distance == pytest.approx(45)
+    assert physics.rewind_query(past_tick, Rect(-2, -2, 4, 4), ignore=a) == []
+
+
+def test_rewind_query_forgets_old_ticks(game, physics, create_box):
+    physics.history_ticks = 5
+    create_box((0, 0), "a")
+
+    game.update()
+    old_tick = physics.tick
+
+    for _ in range(5):
+        game.update()
+
+    with pytest.raises(LookupError):
+        physics.rewind_query(old_tick, Rect(-2, -2, 4, 4))
+
+
+def test_one_tick_is_recorded_per_physics_step(game, physics, create_box):
+    physics.history_ticks = 10
+    create_box((0, 0), "a")
+
+    tick = physics.tick
+    for _ in range(3):
+        game.update()
+
+    assert physics.tick == tick + 3
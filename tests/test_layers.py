@@ -0,0 +1,40 @@
+import pytest
+
+import pigeonote as pn
+
+
+def test_layers_collide_symmetrically(game, physics):
+    physics.set_layers_collision(1, 2, False)
+    assert not physics.do_layers_collide(1, 2)
+    assert not physics.do_layers_collide(2, 1)
+    assert physics.do_layers_collide(1, 1)
+
+    physics.set_layers_collision(2, 1, True)
+    assert physics.do_layers_collide(1, 2)
+
+
+def test_layer_matrix_and_masks_filter_contacts(game, physics, create_box, get_events):
+    a = create_box((0, 0), "a", listen=True)
+    b = create_box((5, 0), "b", listen=True)
+    a.layer, b.layer = 1, 2
+
+    physics.set_layers_collision(1, 2, False)
+    game.update()
+    assert physics.contacts == set()
+
+    physics.set_layers_collision(1, 2, True)
+    game.update()
+    assert physics.contacts == {(a, b)}
+
+    # Both masks have to agree, so masking out the other layer on either side ends the contact.
+    b.mask = pn.ALL_LAYERS & ~(1 << 1)
+    game.update()
+    assert physics.contacts == set()
+    assert get_events(a) == [("enter", "b"), ("exit", "b")]
+
+
+def test_layer_out_of_range(game, create_box):
+    collider = create_box((0, 0), "a")
+
+    with pytest.raises(ValueError):
+        collider.layer = pn.MAX_COLLISION_LAYERS
@@ -0,0 +1,95 @@
+import pygame as pg
+import pytest
+
+pytest.importorskip("numpy")
+
+from pigeonote.components import ParticleSystem
+
+
+def create_particles(game, position=(0, 0), **settings) -> ParticleSystem:
+    """
+    Create a particle system whose particles stand still, unless `settings` say otherwise.
+    Updating the game (without processing a frame) steps the particles by 0.1 seconds.
+    """
+    particles = game.create_entity(position, "particles").create_component(ParticleSystem)
+    particles.speed = (0, 0)
+
+    for name, value in settings.items():
+        setattr(particles, name, value)
+
+    return particles
+
+
+def test_emit_places_particles_at_the_entity(game):
+    particles = create_particles(game, (10, 20), speed=(5, 5), spread=0, direction=90, max_particles=8)
+
+    particles.emit(5)
+    particles.emit(5, (100, 100))
+
+    assert particles.particle_count == 8
+    assert particles._positions[:5].tolist() == [[10, 20]] * 5
+    assert particles._positions[5:8].tolist() == [[100, 100]] * 3
+    assert particles._velocities[:8, 0] == pytest.approx([0] * 8, abs=1e-5)
+    assert particles._velocities[:8, 1] == pytest.approx([5] * 8)
+
+
+def test_particles_move_and_die_of_age(game):
+    particles = create_particles(game, speed=(10, 10), spread=0, lifetime=(0.25, 0.25))
+    particles.emit(3)
+
+    game.update()
+    game.update()
+    assert particles.particle_count == 3
+    assert particles._ages[:3].tolist() == pytest.approx([0.2] * 3)
+    assert particles._positions[:3, 0].tolist() == pytest.approx([2] * 3)
+
+    game.update()
+    assert particles.particle_count == 0
+
+
+def test_dead_particles_are_replaced_by_living_ones(game):
+    particles = create_particles(game)
+    particles.emit(5)
+
+    for index in range(5):
+        particles._positions[index] = (index, 0)
+
+    particles._lifetimes[:5] = (0.05, 1, 0.05, 1, 1)
+    game.update()
+
+    assert particles.particle_count == 3
+    assert particles._positions[:3, 0].tolist() == [3, 1, 4]
+
+
+def test_particles_are_emitted_at_the_emission_rate(game):
+    particles = create_particles(game, emission_rate=25)
+
+    game.update()
+    assert particles.particle_count == 2
+
+    game.update()
+    assert particles.particle_count == 5
+
+
+def test_shrinking_max_particles_drops_particles(game):
+    particles = create_particles(game)
+    particles.emit(10)
+
+    particles.max_particles = 4
+    game.update()
+    assert particles.particle_count == 4
+
+
+def test_particles_are_drawn_in_their_start_color(game):
+    particles = create_particles(game, size=2, start_color="red", lifetime=(10, 10))
+    particles.emit(1)
+
+    game.process()
+    surface = game.camera.get_rendered_surface()
+    center = game.camera.world_position_to_screen_position((0, 0))
+
+    assert surface.get_at((int(center.x), int(center.y))) == pg.Color("red")
+
+    particles.clear()
+    game.process()
+    assert game.camera.get_rendered_surface().get_at((int(center.x), int(center.y))) == pg.Color("black")
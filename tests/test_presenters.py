@@ -0,0 +1,81 @@
+import pygame as pg
+import pytest
+from pygame import Rect, Surface, Vector2
+
+from pigeonote.presenters import IntegerScalePresenter, NativePresenter, NullPresenter, ScalePresenter
+
+
+def create_frame() -> Surface:
+    frame = Surface((10, 10))
+    frame.fill("red")
+    frame.set_at((9, 9), "blue")
+    return frame
+
+
+def test_scale_presenter_scales_only_the_dirty_rects():
+    presenter, frame, display = ScalePresenter(), create_frame(), Surface((20, 30))
+
+    assert presenter.present(frame, display, None) is None
+    assert display.get_at((0, 0)) == pg.Color("red")
+    assert display.get_at((19, 29)) == pg.Color("blue")
+
+    display.fill("black")
+    assert presenter.present(frame, display, [Rect(9, 9, 1, 1)]) == [Rect(18, 27, 2, 3)]
+    assert display.get_at((18, 27)) == pg.Color("blue")
+    assert display.get_at((0, 0)) == pg.Color("black")
+
+    # Displays which aren't a whole multiple of the frame are always scaled as a whole.
+    assert presenter.present(frame, Surface((25, 25)), [Rect(9, 9, 1, 1)]) is None
+
+
+def test_integer_scale_presenter_centers_the_frame_between_bars():
+    presenter, frame, display = IntegerScalePresenter(), create_frame(), Surface((35, 25))
+    display.fill("white")
+
+    assert presenter.present(frame, display, []) is None
+    assert presenter.factor == 2
+    assert display.get_at((6, 2)) == pg.Color("black")
+    assert display.get_at((7, 2)) == pg.Color("red")
+    assert display.get_at((26, 21)) == pg.Color("blue")
+    assert display.get_at((27, 22)) == pg.Color("black")
+
+    assert presenter.present(frame, display, [Rect(9, 9, 1, 1)]) == [Rect(25, 20, 2, 2)]
+    assert presenter.display_to_frame_position((27, 22), frame.get_size(), display.get_size()) == Vector2(10, 10)
+
+
+def test_null_presenter_presents_nothing():
+    display = Surface((20, 20))
+
+    assert NullPresenter().present(create_frame(), display, None) == []
+    assert display.get_at((0, 0)) == pg.Color("black")
+
+
+def test_game_scales_frames_onto_the_display(game, create_drawer):
+    create_drawer(lambda camera: camera.draw_rect(Rect(-200, -112, 10, 10), "red"))
+    game.process()
+
+    assert isinstance(game.presenter, ScalePresenter)
+    assert game.display.get_at((0, 0)) == pg.Color("red")
+    assert game.display.get_at((39, 39)) == pg.Color("red")
+    assert game.display.get_at((40, 40)) == pg.Color("black")
+
+
+def test_native_presenter_renders_onto_the_display(game):
+    camera_size = game.camera.area.size
+
+    game.presenter = NativePresenter()
+    assert game.camera.area.size == game.display.get_size()
+
+    game.process()
+    assert game.camera.get_rendered_surface() is game.display
+
+    game.presenter = ScalePresenter()
+    assert game.camera.area.size == camera_size
+    assert game.camera.get_rendered_surface() is not game.display
+
+
+def test_pipelined_games_need_a_presenter_supporting_the_render_thread(game):
+    game.pipelined = True
+
+    with pytest.raises(RuntimeError):
+        game.presenter = NativePresenter()
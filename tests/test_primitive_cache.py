@@ -0,0 +1,106 @@
+import pygame as pg
+import pytest
+from pygame import Rect
+
+import pigeonote as pn
+from pigeonote.types import is_color_opaque
+
+
+def get_center_color(game: pn.Game):
+    surface = game.camera.get_rendered_surface()
+    return surface.get_at((surface.width // 2, surface.height // 2))
+
+
+def test_color_opacity():
+    assert is_color_opaque((1, 2, 3))
+    assert is_color_opaque("red")
+    assert is_color_opaque((1, 2, 3, 255))
+    assert not is_color_opaque((1, 2, 3, 128))
+    assert not is_color_opaque(pg.Color(1, 2, 3, 0))
+    assert not is_color_opaque(0xFF0000)
+
+
+@pytest.mark.parametrize("primitive", ["circle", "rounded rect"])
+def test_translucent_primitives_are_drawn_like_pygame(game, create_drawer, primitive):
+    translucent = (0, 0, 255, 128)
+
+    def draw(camera: pn.Camera2D):
+        camera.draw_rect(Rect(-20, -20, 40, 40), (255, 0, 0))
+
+        if primitive == "circle":
+            camera.draw_circle((0, 0), 10, translucent, layer=1)
+        else:
+            camera.draw_rect(Rect(-10, -10, 20, 20), translucent, border_radius=4, layer=1)
+
+    create_drawer(draw)
+    game.process()
+
+    # Cached primitives would be blended with what's under them, unlike `pg.draw`, so translucent ones aren't cached.
+    expected = game.camera.get_rendered_surface().subsurface((0, 0, 1, 1)).copy()
+    expected.fill((255, 0, 0))
+    pg.draw.rect(expected, translucent, expected.get_rect())
+
+    assert get_center_color(game) == expected.get_at((0, 0))
+    assert len(game.camera.primitive_cache) == 0
+
+
+def test_opaque_primitives_are_cached(game, create_drawer):
+    def draw(camera: pn.Camera2D):
+        camera.draw_circle((0, 0), 10, "blue")
+        camera.draw_rect(Rect(30, 0, 20, 20), "blue", border_radius=4)
+
+    create_drawer(draw)
+    game.process()
+    game.process()
+
+    assert len(game.camera.primitive_cache) == 2
+    assert get_center_color(game) == pg.Color("blue")
+
+
+@pytest.mark.parametrize("width", [0, 3])
+def test_cached_circles_draw_the_pixels_of_pygame(width):
+    cache = pn.PrimitiveCache()
+    center, radius = (20, 20), 7.5
+
+    expected = pg.Surface((40, 40))
+    pg.draw.circle(expected, "blue", center, radius, width=width)
+
+    surface = cache.get_circle(radius, "blue", width)
+    frame = pg.Surface((40, 40))
+    frame.blit(surface, (center[0] - surface.width // 2, center[1] - surface.height // 2))
+
+    assert pg.image.tobytes(frame, "RGB") == pg.image.tobytes(expected, "RGB")
+
+
+def test_primitive_cache_is_bounded():
+    cache = pn.PrimitiveCache(max_size=4, max_rects=2, max_filled=3)
+
+    for radius in range(10):
+        cache.get_circle(radius, "red")
+
+    for size in range(10):
+        cache.get_rect((size + 1, 8), "red", border_radius=2)
+
+    for size in range(10):
+        cache.get_filled((size + 1, size + 1), "red")
+
+    assert len(cache) == 9
+
+    # Recently used surfaces are kept.
+    circle = cache.get_circle(9, "red")
+    cache.get_circle(20, "red")
+    assert cache.get_circle(9, "red") is circle
+
+
+def test_kinds_of_primitives_are_kept_apart():
+    cache = pn.PrimitiveCache(max_rects=1, max_filled=1)
+    square = cache.get_filled((8, 8), "red")
+
+    # Rects of changing sizes don't push the squares out.
+    for size in range(10):
+        cache.get_rect((size + 1, 8), "red", border_radius=2)
+
+    assert cache.get_filled((8, 8), "red") is square
+
+    cache.clear()
+    assert len(cache) == 0
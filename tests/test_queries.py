@@ -0,0 +1,70 @@
+import pytest
+from pygame import Rect, Vector2
+
+
+def test_point_circle_and_rect_queries(game, physics, create_box):
+    a = create_box((0, 0), "a")
+    b = create_box((50, 0), "b")
+    b.layer = 3
+    game.update()
+
+    assert physics.point_query((2, 2)) == [a]
+    assert physics.point_query((30, 0)) == []
+    assert physics.circle_query((30, 0), 16) == [b]
+    assert set(physics.check_rect_overlap(Rect(-10, -10, 100, 20))) == {a, b}
+    assert physics.check_rect_overlap(Rect(-10, -10, 100, 20), layer_mask=1 << 3) == [b]
+
+
+@pytest.mark.parametrize("max_distance", [100, 10000])
+def test_raycast_returns_the_closest_hit(game, physics, create_box, max_distance):
+    # Long rays test every collider, and short ones walk the broadphase cells (DDA), which must agree.
+    for i in range(20):
+        create_box((i * 200, 500), f"far {i}")
+
+    near = create_box((40, 0), "near")
+    create_box((80, 0), "behind")
+    game.update()
+
+    hit = physics.raycast((0, 0), (1, 0), max_distance)
+    assert hit is not None
+    assert hit.collider is near
+    assert hit.distance == pytest.approx(35)
+    assert hit.point == Vector2(35, 0)
+    assert hit.normal == Vector2(-1, 0)
+
+    assert physics.raycast((0, 0), (1, 0), max_distance, ignore=near).collider.entity.name == "behind"
+    assert physics.raycast((0, 0), (0, -1), max_distance) is None
+    assert physics.raycast((0, 0), (1, 0), 30) is None
+
+
+def test_raycast_crossing_cells_diagonally(game, physics, create_box):
+    physics.cell_size = 16
+    target = create_box((200, 200), "target")
+
+    for i in range(50):
+        create_box((-500 - i * 20, 0), f"filler {i}")
+
+    game.update()
+    hit = physics.raycast((0, 0), (1, 1), 400)
+    assert hit is not None and hit.collider is target
+
+
+def test_raycast_with_zero_direction(game, physics):
+    with pytest.raises(ValueError):
+        physics.raycast((0, 0), (0, 0))
+
+
+def test_sweep_doesnt_tunnel_through_thin_colliders(game, physics, create_box):
+    wall = create_box((100, 0), "wall", size=(2, 100))
+    game.update()
+
+    # The end position is past the wall, and never overlaps it.
+    assert physics.check_rect_overlap(Rect(190, -5, 10, 10)) == []
+
+    hit = physics.sweep_rect(Rect(-5, -5, 10, 10), (200, 0))
+    assert hit is not None
+    assert hit.collider is wall
+    assert hit.distance == pytest.approx(94)
+    assert hit.normal == Vector2(-1, 0)
+
+    assert physics.sweep_rect(Rect(-5, -5, 10, 10), (50, 0)) is None
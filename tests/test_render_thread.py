@@ -0,0 +1,54 @@
+import pygame as pg
+import pytest
+from pygame import Rect
+
+import pigeonote as pn
+from pigeonote.presenters import NativePresenter
+
+
+def test_pipelined_frames_match_serial_frames(game, create_drawer):
+    offset = 0
+
+    def draw(camera: pn.Camera2D):
+        camera.draw_circle((offset, 0), 10, "blue")
+        camera.draw_rect(Rect(-offset, 20, 30, 10), (0, 255, 0, 100))
+        camera.draw_rect(Rect(-100, -100, 40, 40), "red", layer=1)
+
+    create_drawer(draw)
+    game.camera.set_layer_static(1)
+
+    serial_frames = list[bytes]()
+    for offset in range(5):
+        game.process()
+        serial_frames.append(pg.image.tobytes(game.camera.get_rendered_surface(), "RGBA"))
+
+    game.pipelined = True
+    pipelined_frames = list[bytes]()
+
+    # A pipelined frame is only shown once the next one was processed.
+    for offset in range(6):
+        game.process()
+
+        if offset > 0:
+            pipelined_frames.append(pg.image.tobytes(game.camera.get_rendered_surface(), "RGBA"))
+
+    game.pipelined = False
+    assert pipelined_frames == serial_frames
+
+
+def test_turning_pipelining_off_shows_the_last_frame(game, create_drawer):
+    create_drawer(lambda camera: camera.draw_rect(Rect(-5, -5, 10, 10), "red"))
+
+    game.pipelined = True
+    game.process()
+    game.pipelined = False
+
+    surface = game.camera.get_rendered_surface()
+    assert surface.get_at((surface.width // 2, surface.height // 2)) == pg.Color("red")
+
+
+def test_pipelining_needs_a_presenter_supporting_the_render_thread(game):
+    game.presenter = NativePresenter()
+
+    with pytest.raises(RuntimeError):
+        game.pipelined = True
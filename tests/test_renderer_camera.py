@@ -0,0 +1,109 @@
+import pygame as pg
+import pytest
+from pygame import Rect, Surface
+
+import pigeonote as pn
+from pigeonote.presenters import RendererPresenter, ScalePresenter
+from pigeonote.renderer_camera import RendererCamera2D
+
+
+def draw_scene(camera: pn.Camera2D, sprite: Surface):
+    camera.blit(sprite, (-50, -50))
+    camera.draw_rect(Rect(0, 0, 30, 20), "green")
+    camera.draw_rect(Rect(40, 0, 30, 20), "yellow", border_radius=5)
+    camera.draw_circle((-80, 40), 12, "blue")
+    camera.draw_rect(Rect(-150, -80, 40, 30), "white", width=3, layer=1)
+
+
+def get_frame_bytes(game: pn.Game) -> bytes:
+    return pg.image.tobytes(game.camera.get_rendered_surface(), "RGB")
+
+
+@pytest.fixture
+def renderer_game(game):
+    game.presenter = RendererPresenter(accelerated=0)
+    yield game
+
+    game.presenter = ScalePresenter()
+
+
+def test_renderer_camera_replaces_the_camera(game):
+    game.camera.center = (30, 40)
+    game.camera.set_layer_static(2, margin=16)
+
+    game.presenter = RendererPresenter(accelerated=0)
+    camera = game.camera
+
+    assert isinstance(camera, RendererCamera2D)
+    assert camera.center == (30, 40)
+    assert camera.is_layer_static(2)
+    assert game.display is None
+
+    with pytest.raises(ValueError):
+        camera.resize((100, 100), Surface((100, 100)))
+
+    game.presenter = ScalePresenter()
+    assert type(game.camera) is pn.Camera2D
+    assert game.camera.center == (30, 40)
+    assert game.camera.is_layer_static(2)
+    assert game.display is not None
+
+
+def test_renderer_camera_draws_like_the_surface_camera(game, create_drawer):
+    sprite = Surface((20, 20))
+    sprite.fill("red")
+    create_drawer(lambda camera: draw_scene(camera, sprite))
+
+    game.process()
+    expected = get_frame_bytes(game)
+
+    game.presenter = RendererPresenter(accelerated=0)
+    game.process()
+    frame = get_frame_bytes(game)
+    game.presenter = ScalePresenter()
+
+    assert frame == expected
+
+
+def test_textures_are_uploaded_once_until_invalidated(renderer_game, create_drawer):
+    sprite = Surface((20, 20))
+    sprite.fill("red")
+    create_drawer(lambda camera: camera.blit(sprite, (0, 0)))
+
+    renderer_game.process()
+    camera = renderer_game.camera
+    texture = camera.get_texture(sprite)
+
+    renderer_game.process()
+    assert camera.get_texture(sprite) is texture
+
+    # Modified surfaces keep showing their old texture until it's invalidated.
+    sprite.fill("blue")
+    renderer_game.process()
+    assert camera.get_rendered_surface().get_at((210, 122)) == pg.Color("red")
+
+    camera.invalidate_texture(sprite)
+    renderer_game.process()
+    assert camera.get_texture(sprite) is not texture
+    assert camera.get_rendered_surface().get_at((210, 122)) == pg.Color("blue")
+
+
+def test_static_layers_are_uploaded_when_rebuilt(renderer_game, create_drawer):
+    sprite = Surface((20, 20))
+    sprite.fill("red")
+    create_drawer(lambda camera: camera.blit(sprite, (0, 0)))
+
+    camera = renderer_game.camera
+    camera.set_layer_static(0)
+
+    renderer_game.process()
+    renderer_game.process()
+
+    ((cache, (build_count, texture)),) = camera._static_textures.items()
+    assert build_count == 1
+    assert camera.get_rendered_surface().get_at((210, 122)) == pg.Color("red")
+
+    camera.invalidate_layer(0)
+    renderer_game.process()
+    assert camera._static_textures[cache][0] == 2
+    assert camera._static_textures[cache][1] is not texture
@@ -0,0 +1,79 @@
+import pytest
+from pygame import Surface
+
+import pigeonote as pn
+from pigeonote.components import SquareRenderer
+
+
+def test_rotations_are_shared_and_quantized():
+    cache = pn.RotationCache(angle_step=5)
+    surface = Surface((10, 20))
+
+    rotated = cache.get(surface, 90)
+    assert rotated.get_size() == (20, 10)
+    assert cache.get(surface, 91) is rotated
+    assert cache.get(surface, 88) is rotated
+    assert cache.get(surface, 360) is surface
+    assert cache.get(surface, -270) is rotated
+    assert len(cache) == 1
+
+
+def test_least_recently_used_rotations_are_evicted():
+    cache = pn.RotationCache(max_size=2)
+    surface = Surface((10, 10))
+
+    first = cache.get(surface, 10)
+    cache.get(surface, 20)
+    assert cache.get(surface, 10) is first
+
+    cache.get(surface, 30)
+    assert len(cache) == 2
+    assert cache.get(surface, 10) is first
+    assert (surface, 20) not in cache._rotated
+
+
+def test_forget_drops_the_rotations_of_a_surface():
+    cache = pn.RotationCache()
+    surface, other = Surface((10, 10)), Surface((10, 10))
+
+    cache.get(surface, 10)
+    cache.get(surface, 20)
+    cache.bake(surface, 4)
+    baked = cache.get(surface, 90)
+    other_rotated = cache.get(other, 10)
+
+    # The rotation sheet is dropped too, so the surface is rotated again.
+    cache.forget(surface)
+    assert len(cache) == 1
+    assert cache.get(other, 10) is other_rotated
+    assert cache.get(surface, 90) is not baked
+    assert len(cache) == 2
+
+
+def test_rotation_sheets_are_used_instead_of_rotating():
+    cache = pn.RotationCache()
+    surface = Surface((10, 10))
+    sheet = Surface((40, 10))
+
+    cache.add_sheet(surface, sheet, 4)
+    assert cache.get(surface, 95).get_offset() == (10, 0)
+    assert cache.get(surface, 315).get_offset() == (0, 0)
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        cache.add_sheet(surface, sheet, 3)
+
+
+def test_squares_share_surfaces_and_rotations(game):
+    squares = [game.create_entity((i * 40, 0)).create_component(SquareRenderer) for i in range(3)]
+    squares[2].color = "blue"
+
+    for square in squares:
+        square.entity.rotation = 45
+
+    game.process()
+
+    assert squares[0]._surface is squares[1]._surface
+    assert squares[0]._surface is not squares[2]._surface
+    assert squares[0]._surface is game.camera.primitive_cache.get_filled((32, 32), "red")
+    assert len(game.rotation_cache) == 2
@@ -0,0 +1,82 @@
+import pygame as pg
+from pygame import Rect, Surface
+
+import pigeonote as pn
+
+
+def create_camera() -> pn.Camera2D:
+    camera = pn.Camera2D(Rect(0, 0, 100, 100))
+    camera.set_layer_static(0, margin=20)
+    return camera
+
+
+def render(camera: pn.Camera2D, surface: Surface, position=(10, 10)) -> Surface:
+    camera.clean_surface()
+    camera.blit(surface, position)
+    return camera.render_frame()
+
+
+def get_build_count(camera: pn.Camera2D) -> int:
+    return camera._static_layers[0].build_count
+
+
+def test_static_layers_are_only_drawn_once():
+    camera = create_camera()
+    red = Surface((10, 10))
+    red.fill("red")
+
+    assert render(camera, red).get_at((15, 15)) == pg.Color("red")
+    assert render(camera, red).get_at((15, 15)) == pg.Color("red")
+    assert get_build_count(camera) == 1
+
+    # Moving within the margin moves the cache along instead of drawing it again.
+    camera.center = (60, 45)
+    frame = render(camera, red)
+    assert frame.get_at((5, 20)) == pg.Color("red")
+    assert frame.get_at((15, 15)) == pg.Color("black")
+    assert get_build_count(camera) == 1
+
+
+def test_static_layers_are_rebuilt_when_their_commands_change():
+    camera = create_camera()
+    red, blue = Surface((10, 10)), Surface((10, 10))
+    red.fill("red")
+    blue.fill("blue")
+
+    render(camera, red)
+    assert render(camera, blue).get_at((15, 15)) == pg.Color("blue")
+    assert get_build_count(camera) == 2
+
+    assert render(camera, blue, (30, 30)).get_at((35, 35)) == pg.Color("blue")
+    assert get_build_count(camera) == 3
+
+    # A surface modified in place is only drawn again once the layer is invalidated.
+    blue.fill("green")
+    assert render(camera, blue, (30, 30)).get_at((35, 35)) == pg.Color("blue")
+
+    camera.invalidate_layer(0)
+    assert render(camera, blue, (30, 30)).get_at((35, 35)) == pg.Color("green")
+    assert get_build_count(camera) == 4
+
+
+def test_static_layers_are_rebuilt_beyond_their_margin():
+    camera = create_camera()
+    red = Surface((10, 10))
+    red.fill("red")
+
+    render(camera, red)
+    camera.center = (100, 50)
+    assert render(camera, red).get_at((10, 10)) == pg.Color("black")
+    assert get_build_count(camera) == 2
+
+    assert render(camera, red, (60, 10)).get_at((10, 10)) == pg.Color("red")
+
+
+def test_empty_static_layers_draw_nothing():
+    camera = create_camera()
+    red = Surface((10, 10))
+    red.fill("red")
+
+    render(camera, red)
+    camera.clean_surface()
+    assert camera.render_frame().get_at((15, 15)) == pg.Color("black")
@@ -0,0 +1,39 @@
+from pygame import Rect
+
+from pigeonote.components.tile_storage import ChunkedTileStorage, DictTileStorage
+
+
+def fill_storage(storage):
+    storage.set((0, 0), "grass")
+    storage.set((-5, 3), "water")
+    storage.set((70, -70), "stone")
+    storage.fill_region(Rect(10, 10, 20, 5), "dirt")
+    storage.set_tiles((-40, -40), [[storage.get_palette_index("grass"), 0], [0, storage.get_palette_index("water")]])
+    storage.set((11, 11), None)
+
+
+def test_storages_agree():
+    dict_storage, chunked_storage = DictTileStorage(), ChunkedTileStorage(chunk_size=16)
+    fill_storage(dict_storage)
+    fill_storage(chunked_storage)
+
+    assert dict(chunked_storage.iter_tiles()) == dict(dict_storage.iter_tiles())
+
+    for region in (Rect(-50, -50, 200, 200), Rect(5, 5, 10, 10), Rect(-6, 2, 3, 3)):
+        assert list(chunked_storage.iter_region(region)) == list(dict_storage.iter_region(region))
+        assert chunked_storage.count_region(region) == dict_storage.count_region(region)
+
+    for chunk_size in (4, 16, 20):
+        assert sorted(chunked_storage.iter_occupied_chunks(chunk_size)) == sorted(
+            dict_storage.iter_occupied_chunks(chunk_size)
+        )
+
+
+def test_set_reports_changes():
+    storage = ChunkedTileStorage()
+
+    assert storage.set((1, 1), "grass")
+    assert not storage.set((1, 1), "grass")
+    assert storage.set((1, 1), None)
+    assert not storage.set((1, 1), None)
+    assert storage.get((1, 1)) is None
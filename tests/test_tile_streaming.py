@@ -0,0 +1,107 @@
+import time
+
+import pytest
+from pygame import Rect
+
+from pigeonote.components.tile_storage import ChunkedTileStorage
+from pigeonote.components.tile_streaming import StreamedTileStorage, TilemapFile, write_tilemap_file
+
+
+def wait_for_poll(storage: StreamedTileStorage, timeout: float = 5) -> list[Rect]:
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        loaded = storage.poll()
+        if loaded:
+            return loaded
+
+        time.sleep(0.01)
+
+    return []
+
+
+def test_tilemap_file_round_trip(tmp_path):
+    storage = ChunkedTileStorage(chunk_size=16)
+    storage.set((0, 0), "grass")
+    storage.set((-5, 3), "water")
+    storage.set((70, -70), "stone")
+    storage.fill_region(Rect(10, 10, 20, 5), "dirt")
+
+    path = tmp_path / "map.pntm"
+    write_tilemap_file(path, storage)
+
+    tilemap_file = TilemapFile(path)
+    assert tilemap_file.chunk_size == 16
+    assert set(tilemap_file.iter_chunks()) == set(storage.iter_occupied_chunks(16))
+    assert tilemap_file.read_chunk((100, 100)) is None
+    tilemap_file.close()
+
+    streamed = StreamedTileStorage(path)
+    streamed.load_region(Rect(-100, -100, 200, 200))
+    assert dict(streamed.iter_tiles()) == dict(storage.iter_tiles())
+    streamed.close()
+
+
+def test_streamed_chunks_load_in_the_background_and_are_evicted(tmp_path):
+    storage = ChunkedTileStorage(chunk_size=16)
+    for x in range(0, 160, 16):
+        storage.set((x, 0), "grass")
+
+    path = tmp_path / "map.pntm"
+    write_tilemap_file(path, storage)
+
+    streamed = StreamedTileStorage(path, max_loaded_chunks=2)
+    assert streamed.get((0, 0)) is None
+
+    streamed.request_region(Rect(0, 0, 16, 16))
+    assert wait_for_poll(streamed) == [Rect(0, 0, 16, 16)]
+    assert streamed.get((0, 0)) == "grass"
+
+    streamed.load_region(Rect(0, 0, 160, 16))
+    unloaded = streamed.poll()
+
+    # The least recently requested chunks are unloaded, and read as empty again.
+    assert len(unloaded) == 8
+    assert streamed.get((0, 0)) is None
+    assert streamed.get((144, 0)) == "grass"
+    streamed.close()
+
+
+def test_modified_chunks_stay_loaded_until_written(tmp_path):
+    storage = ChunkedTileStorage(chunk_size=16)
+    storage.fill_region(Rect(0, 0, 64, 16), "grass")
+
+    path = tmp_path / "map.pntm"
+    write_tilemap_file(path, storage)
+
+    streamed = StreamedTileStorage(path, max_loaded_chunks=0)
+    streamed.set((0, 0), "water")
+    streamed.fill_region(Rect(32, 0, 4, 4), None)
+
+    assert streamed.poll() == []
+    assert streamed.get((0, 0)) == "water"
+
+    # Writing over the streamed file itself keeps the edits, and lets the modified chunks go.
+    write_tilemap_file(path, streamed)
+    assert len(streamed.poll()) == 2
+    assert streamed.get((0, 0)) is None
+
+    streamed.load_region(Rect(0, 0, 64, 16))
+    assert streamed.get((0, 0)) == "water"
+    assert streamed.get((33, 1)) is None
+    assert streamed.count_region(Rect(0, 0, 64, 16)) == 64 * 16 - 16
+    streamed.close()
+
+
+def test_streamed_storage_is_written_in_its_own_chunks(tmp_path):
+    storage = ChunkedTileStorage(chunk_size=16)
+    storage.set((0, 0), "grass")
+
+    path = tmp_path / "map.pntm"
+    write_tilemap_file(path, storage)
+
+    streamed = StreamedTileStorage(path)
+    with pytest.raises(ValueError):
+        write_tilemap_file(tmp_path / "other.pntm", streamed, chunk_size=8)
+
+    streamed.close()
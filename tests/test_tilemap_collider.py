@@ -0,0 +1,88 @@
+import pytest
+from pygame import Rect, Surface, Vector2
+
+from pigeonote.components import TilemapCollider, TilemapRenderer
+
+
+def create_tilemap(game, tile_size=10, chunk_size=16):
+    entity = game.create_entity((0, 0), "tilemap")
+
+    tilemap = entity.create_component(TilemapRenderer)
+    tilemap.tile_size = tile_size
+    tilemap.tileset = {"wall": Surface((tile_size, tile_size))}
+
+    collider = entity.create_component(TilemapCollider)
+    collider.chunk_size = chunk_size
+
+    return tilemap, collider
+
+
+def test_greedy_meshing_merges_solid_tiles(game, physics):
+    tilemap, collider = create_tilemap(game)
+
+    # A full chunk, an L shape, and two tiles apart.
+    tilemap.fill_region(Rect(0, 0, 16, 16), "wall")
+    tilemap.fill_region(Rect(16, 0, 4, 1), "wall")
+    tilemap.fill_region(Rect(16, 1, 1, 3), "wall")
+    tilemap.set_tile((40, 0), "wall")
+    tilemap.set_tile((42, 0), "wall")
+    game.update()
+
+    parts = collider.get_broadphase_parts()
+    assert parts == {(0, 0): Rect(0, 0, 160, 160), (1, 0): Rect(160, 0, 40, 40), (2, 0): Rect(400, 0, 30, 10)}
+
+    assert collider._chunk_rects[(0, 0)] == [Rect(0, 0, 160, 160)]
+    assert collider._chunk_rects[(1, 0)] == [Rect(160, 0, 40, 10), Rect(160, 10, 10, 30)]
+    assert collider._chunk_rects[(2, 0)] == [Rect(400, 0, 10, 10), Rect(420, 0, 10, 10)]
+
+    assert collider.check_rect_overlap(Rect(165, 15, 2, 2))
+    assert not collider.check_rect_overlap(Rect(175, 15, 2, 2))
+    assert not collider.check_rect_overlap(Rect(411, 0, 8, 8))
+
+    # Clearing a tile only re-merges its own chunk.
+    tilemap.clear_tile((0, 0))
+    parts = collider.get_broadphase_parts()
+    assert parts[(0, 0)] == Rect(0, 0, 160, 160)
+    assert len(collider._chunk_rects[(0, 0)]) == 2
+    assert collider._chunk_rects[(1, 0)] == [Rect(160, 0, 40, 10), Rect(160, 10, 10, 30)]
+
+    tilemap.fill_region(Rect(40, 0, 3, 1), None)
+    assert (2, 0) not in collider.get_broadphase_parts()
+
+
+def test_tilemap_queries(game, physics):
+    tilemap, collider = create_tilemap(game)
+    tilemap.fill_region(Rect(10, 0, 1, 10), "wall")
+    game.update()
+
+    assert physics.point_query((105, 5)) == [collider]
+    assert physics.point_query((95, 5)) == []
+
+    hit = physics.raycast((5, 5), (1, 0))
+    assert hit.collider is collider
+    assert hit.distance == pytest.approx(95)
+    assert hit.normal == Vector2(-1, 0)
+
+    hit = physics.sweep_rect(Rect(0, 0, 10, 10), (200, 0))
+    assert hit.collider is collider
+    assert hit.distance == pytest.approx(90)
+
+    assert physics.raycast((5, 5), (-1, 0), 500) is None
+
+
+def test_colliders_touch_the_tilemap(game, physics, create_box):
+    tilemap, tilemap_collider = create_tilemap(game)
+    tilemap.fill_region(Rect(0, 0, 4, 1), "wall")
+
+    box = create_box((15, 25), "box", listen=True)
+    game.update()
+    assert physics.contacts == set()
+
+    box.entity.position = (15, 10)
+    game.update()
+    assert len(physics.contacts) == 1
+    assert {box, tilemap_collider} == set(next(iter(physics.contacts)))
+
+    tilemap.fill_region(Rect(0, 0, 4, 1), None)
+    game.update()
+    assert physics.contacts == set()
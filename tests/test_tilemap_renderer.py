@@ -0,0 +1,70 @@
+import pygame as pg
+from pygame import Surface
+
+from pigeonote.components import TilemapRenderer
+
+
+def create_tilemap(game) -> TilemapRenderer:
+    tilemap = game.create_entity((0, 0), "tilemap").create_component(TilemapRenderer)
+    tilemap.tile_size, tilemap.chunk_size = 10, 16
+
+    for color in ("red", "blue"):
+        tilemap.tileset[color] = Surface((10, 10))
+        tilemap.tileset[color].fill(color)
+
+    return tilemap
+
+
+def get_world_color(game, position):
+    return game.camera.get_rendered_surface().get_at(game.camera.world_position_to_screen_position(position))
+
+
+def test_chunks_are_baked_once(game):
+    tilemap = create_tilemap(game)
+    tilemap.set_tile((0, 0), "red")
+    tilemap.set_tile((-1, -1), "red")
+
+    game.process()
+    assert get_world_color(game, (5, 5)) == pg.Color("red")
+    assert get_world_color(game, (-5, -5)) == pg.Color("red")
+
+    # Visible chunks without tiles aren't kept.
+    surfaces = dict(tilemap._chunk_surfaces)
+    assert set(surfaces) == {(0, 0), (-1, -1)}
+
+    game.process()
+    assert tilemap._chunk_surfaces == surfaces
+    assert all(tilemap._chunk_surfaces[chunk] is surfaces[chunk] for chunk in surfaces)
+
+
+def test_setting_a_tile_rebakes_its_chunk(game):
+    tilemap = create_tilemap(game)
+    tilemap.set_tile((0, 0), "red")
+    tilemap.set_tile((-1, -1), "red")
+    game.process()
+
+    other_chunk = tilemap._chunk_surfaces[(-1, -1)]
+    tilemap.set_tile((0, 0), "blue")
+    assert (0, 0) not in tilemap._chunk_surfaces
+
+    game.process()
+    assert get_world_color(game, (5, 5)) == pg.Color("blue")
+    assert tilemap._chunk_surfaces[(-1, -1)] is other_chunk
+
+    tilemap.clear_tile((0, 0))
+    game.process()
+    assert get_world_color(game, (5, 5)) == pg.Color("black")
+    assert set(tilemap._chunk_surfaces) == {(-1, -1)}
+
+
+def test_baked_chunks_are_bounded(game):
+    tilemap = create_tilemap(game)
+    tilemap.max_baked_chunks = 1
+    tilemap.set_tile((0, 0), "red")
+    tilemap.set_tile((-1, -1), "blue")
+
+    # The least recently drawn chunk is dropped, and every chunk is still drawn.
+    game.process()
+    assert set(tilemap._chunk_surfaces) == {(0, 0)}
+    assert get_world_color(game, (5, 5)) == pg.Color("red")
+    assert get_world_color(game, (-5, -5)) == pg.Color("blue")
@@ -0,0 +1,69 @@
+import pygame as pg
+import pytest
+
+from pigeonote.components import tileset
+from pigeonote.components.tileset import load_tileset, slice_tileset
+
+
+def create_sheet() -> pg.Surface:
+    """
+    A 25x20 sheet of 10x10 tiles: an opaque tile, one opaque pixel, a faint tile, and a pixel in a cut tile.
+    """
+    sheet = pg.Surface((25, 20), pg.SRCALPHA)
+    sheet.fill((255, 0, 0, 255), (0, 0, 10, 10))
+    sheet.set_at((13, 17), (0, 0, 255, 255))
+    sheet.fill((0, 255, 0, 100), (0, 10, 10, 10))
+    sheet.set_at((21, 2), (255, 255, 255, 255))
+    return sheet
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_slice_tileset_skips_empty_tiles(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(tileset, "np", None)
+
+    sheet = create_sheet()
+    tiles = slice_tileset(sheet, 10)
+
+    assert set(tiles) == {(0, 0), (1, 1), (2, 0)}
+    assert tiles[(0, 0)].get_parent() is sheet
+    assert tiles[(1, 1)].get_offset() == (10, 10)
+
+    # Tiles cut by the edge of the sheet are padded.
+    assert tiles[(2, 0)].get_size() == (10, 10)
+    assert tiles[(2, 0)].get_at((1, 2)) == pg.Color(255, 255, 255, 255)
+    assert tiles[(2, 0)].get_at((9, 9)).a == 0
+
+
+def test_load_tileset_reads_back_the_baked_atlas(game, tmp_path, monkeypatch):
+    path = tmp_path / "tileset.png"
+    pg.image.save(create_sheet(), path)
+
+    cache_dir = tmp_path / "cache"
+    tiles = load_tileset(path, 10, cache_dir)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # The second load doesn't slice the image again.
+    monkeypatch.setattr(tileset, "slice_tileset", None)
+    cached_tiles = load_tileset(path, 10, cache_dir)
+
+    assert set(cached_tiles) == set(tiles)
+    for coords, tile in tiles.items():
+        assert pg.image.tobytes(cached_tiles[coords], "RGBA") == pg.image.tobytes(tile, "RGBA")
+
+
+def test_load_tileset_bakes_the_atlas_again_when_unreadable(game, tmp_path):
+    path = tmp_path / "tileset.png"
+    pg.image.save(create_sheet(), path)
+
+    cache_dir = tmp_path / "cache"
+    load_tileset(path, 10, cache_dir)
+
+    atlas_path = next(cache_dir.iterdir())
+    atlas_path.write_bytes(atlas_path.read_bytes()[:-1])
+
+    assert set(load_tileset(path, 10, cache_dir)) == {(0, 0), (1, 1), (2, 0)}
+    assert tileset._read_atlas(atlas_path, 10) is not None
+
+    # Atlases are only read for the tile size they were baked with.
+    assert tileset._read_atlas(atlas_path, 5) is None
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+import pigeonote as pn
+from pigeonote.components import RectCollider
+
+pytest.importorskip("numpy")
+
+
+class CollisionListener(pn.Component):
+    def on_collision_enter(self, other: pn.Collider):
+        pass
+
+
+def test_vectorized_contacts_enter_and_exit(game, physics, create_box, get_events):
+    physics.vectorized = True
+
+    a = create_box((0, 0), "a", listen=True)
+    b = create_box((5, 0), "b", listen=True)
+
+    game.update()
+    assert physics.contacts == {(a, b)}
+
+    b.entity.position = (100, 0)
+    game.update()
+    assert get_events(a) == [("enter", "b"), ("exit", "b")]
+    assert physics.contacts == set()
+
+
+def test_vectorized_static_colliders_never_touch_each_other(game, physics, create_box):
+    physics.vectorized = True
+
+    a = create_box((0, 0), "a", listen=True)
+    b = create_box((5, 0), "b", listen=True)
+    a.body_type = b.body_type = pn.BodyType.STATIC
+
+    game.update()
+    assert physics.contacts == set()
+
+
+def run_scene(vectorized: bool, steps: int = 5) -> list[set[tuple[str, str]]]:
+    """
+    Move a few hundred colliders around at random, and return the contacts after every step by name.
+    """
+    game = pn.Game(target_fps=0)
+    physics = pn.Physics.get_instance()
+    physics.vectorized = vectorized
+
+    rng = random.Random(42)
+    boxes = list[pn.Collider]()
+
+    for index in range(300):
+        entity = game.create_entity((rng.uniform(0, 800), rng.uniform(0, 800)), str(index))
+        box = entity.create_component(RectCollider)
+        box.size = (rng.randint(4, 30), rng.randint(4, 30))
+        box.layer = rng.randint(0, 2)
+        entity.create_component(CollisionListener)
+        boxes.append(box)
+
+    contacts = list[set[tuple[str, str]]]()
+
+    try:
+        for _ in range(steps):
+            for box in rng.sample(boxes, 100):
+                box.entity.position = (rng.uniform(0, 800), rng.uniform(0, 800))
+
+            for box in rng.sample(boxes, 10):
+                boxes.remove(box)
+                game.destroy(box.entity)
+
+            game.update()
+            contacts.append({tuple(sorted((a.entity.name, b.entity.name))) for a, b in physics.contacts})
+    finally:
+        pn.Game.instance = None
+        pn.Physics._instance = None
+
+    return contacts
+
+
+def test_vectorized_backend_matches_the_spatial_hash():
+    expected = run_scene(vectorized=False)
+
+    assert any(expected)
+    assert run_scene(vectorized=True) == expected